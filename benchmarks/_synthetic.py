@@ -0,0 +1,47 @@
+"""Synthetic match data shared by the benchmark scripts."""
+
+import random
+from typing import Iterator, List, Tuple
+
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.rules import (
+    PLAYER_ONE,
+    PLAYER_TWO,
+    POINT_VALUE_PLAYER_ONE,
+    POINT_VALUE_PLAYER_TWO,
+)
+
+
+def match_points(rng: random.Random, bias: float = 0.5) -> List[int]:
+    """Return the player numbers of one randomly played, complete match."""
+    match = Match("bench", "Player One", "Player Two")
+    points = []
+    while not match.winner:
+        point = PLAYER_ONE if rng.random() < bias else PLAYER_TWO
+        match.record_point(point)
+        points.append(point)
+    return points
+
+
+def synthetic_matches(
+    count: int, seed: int = 7, players: int = 64
+) -> Iterator[Tuple[str, str, str, List[int]]]:
+    """Yield ``(match_id, player_one, player_two, points)`` tuples."""
+    rng = random.Random(seed)
+    for number in range(count):
+        one, two = rng.sample(range(players), 2)
+        yield (
+            f"{number:06d}",
+            f"Person {one}",
+            f"Person {two}",
+            match_points(rng, rng.uniform(0.4, 0.6)),
+        )
+
+
+def write_tournament(path: str, count: int, seed: int = 7) -> None:
+    """Write ``count`` synthetic matches to ``path`` in the text input format."""
+    values = {PLAYER_ONE: POINT_VALUE_PLAYER_ONE, PLAYER_TWO: POINT_VALUE_PLAYER_TWO}
+    with open(path, "w") as f:
+        for match_id, player_one, player_two, points in synthetic_matches(count, seed):
+            f.write(f"Match: {match_id}\n{player_one} vs {player_two}\n")
+            f.write("".join(f"{values[point]}\n" for point in points))
@@ -0,0 +1,77 @@
+"""Compare file ingest with a cold and a warm score cache.
+
+A synthetic tournament file is ingested once to fill the cache, then a copy
+with a fraction of its match blocks changed is ingested again, as a nightly
+re-run over mostly unchanged files would be.
+
+Usage:
+    python benchmarks/bench_cache.py --matches 20000 --changed 0.01
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._synthetic import write_tournament  # noqa: E402
+from tennis_calculator.core.processors.match_processor import (  # noqa: E402
+    MatchProcessor,
+)
+from tennis_calculator.core.scoring.cache import ScoreCache  # noqa: E402
+
+
+def change_blocks(source: str, target: str, fraction: float) -> None:
+    """copies a tournament file, flipping the last point of some matches"""
+    rng = random.Random(3)
+    with open(source) as f:
+        blocks = f.read().split("Match: ")[1:]
+    with open(target, "w") as f:
+        for block in blocks:
+            if rng.random() < fraction:
+                lines = block.rstrip("\n").split("\n")
+                lines[-1] = "1" if lines[-1] == "0" else "0"
+                block = "\n".join(lines) + "\n"
+            f.write("Match: " + block)
+
+
+def timed_ingest(path: str, cache=None) -> float:
+    """returns the seconds taken to ingest a file"""
+    start = time.perf_counter()
+    MatchProcessor(score_cache=cache).process_file(path)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=20000)
+    parser.add_argument("--changed", type=float, default=0.01)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        original = os.path.join(directory, "night1.txt")
+        changed = os.path.join(directory, "night2.txt")
+        write_tournament(original, args.matches)
+        change_blocks(original, changed, args.changed)
+
+        uncached = timed_ingest(changed)
+        cache = ScoreCache(os.path.join(directory, "cache"))
+        cold = timed_ingest(original, cache)
+        cache.save()
+
+        start = time.perf_counter()
+        cache = ScoreCache(cache.path)
+        load = time.perf_counter() - start
+        warm = timed_ingest(changed, cache)
+
+    print(f"no cache:   {uncached:.2f}s")
+    print(f"cold cache: {cold:.2f}s")
+    print(f"warm cache: {warm:.2f}s (+{load:.2f}s loading the cache)")
+    print(cache.describe())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Measure query throughput while points are being recorded.
+
+Query threads answer score and games queries against a tournament while one
+ingest thread records points on its live matches. The script reports the
+query rate on an idle tournament, then the query and ingest rates while both
+run together, and the ingest rate on its own for comparison.
+
+Usage:
+    python benchmarks/bench_concurrency.py --seconds 2 --readers 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tennis_calculator.core.models.match import Match  # noqa: E402
+from tennis_calculator.core.processors.match_processor import (  # noqa: E402
+    MatchProcessor,
+)
+from tennis_calculator.core.processors.query_processor import (  # noqa: E402
+    QueryProcessor,
+)
+from tennis_calculator.core.rules import PLAYER_ONE, PLAYER_TWO  # noqa: E402
+
+
+def new_processor(matches: int) -> MatchProcessor:
+    match_processor = MatchProcessor()
+    for number in range(matches):
+        match_processor.tournament.add_match(
+            Match(f"{number:03d}", f"P{number}a", f"P{number}b")
+        )
+    return match_processor
+
+
+def ingest(match_processor: MatchProcessor, stop: threading.Event, counts: list):
+    """Record points on random live matches until stopped."""
+    tournament = match_processor.tournament
+    rng = random.Random(1)
+    live = list(tournament.matches)
+    points = 0
+    while not stop.is_set():
+        match_id = rng.choice(live)
+        match = tournament.matches[match_id]
+        if match.winner:
+            tournament.add_match(
+                Match(match_id, match.player_one, match.player_two), overwrite=True
+            )
+        tournament.record_match_point(match_id, rng.choice((PLAYER_ONE, PLAYER_TWO)))
+        points += 1
+    counts.append(points)
+
+
+def query(match_processor: MatchProcessor, stop: threading.Event, counts: list):
+    """Answer score and games queries on random matches until stopped."""
+    query_processor = QueryProcessor(match_processor)
+    rng = random.Random(threading.get_ident())
+    live = list(match_processor.tournament.matches)
+    queries = 0
+    while not stop.is_set():
+        number = rng.choice(live)
+        query_processor.handle_query(f"Score Match {number}")
+        query_processor.handle_query(f"Games Player P{int(number)}a")
+        queries += 2
+    counts.append(queries)
+
+
+def run(match_processor: MatchProcessor, readers: int, writer: bool, seconds: float):
+    """Run the threads for a while, returning (queries/s, points/s)."""
+    stop = threading.Event()
+    queries, points = [], []
+    threads = [
+        threading.Thread(target=query, args=(match_processor, stop, queries))
+        for _ in range(readers)
+    ]
+    if writer:
+        threads.append(
+            threading.Thread(target=ingest, args=(match_processor, stop, points))
+        )
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(queries) / seconds, sum(points) / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--matches", type=int, default=200)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    queries, _ = run(new_processor(args.matches), args.readers, False, args.seconds)
+    print(f"queries only:      {queries:,.0f} queries/s")
+    queries, points = run(
+        new_processor(args.matches), args.readers, True, args.seconds
+    )
+    print(f"queries + ingest:  {queries:,.0f} queries/s, {points:,.0f} points/s")
+    _, points = run(new_processor(args.matches), 0, True, args.seconds)
+    print(f"ingest only:       {points:,.0f} points/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Measure the cost of publishing live scores to many subscribers.
+
+Points are recorded on live matches while a score feed fans their scores out
+to subscribed clients, some of which read slowly. The script reports the
+ingest rate without a feed, with a feed and no subscribers, and with the
+subscribers connected, plus how many scores the clients received and how
+many intermediate scores were skipped for slow clients.
+
+Usage:
+    python benchmarks/bench_feed.py --points 200000 --clients 50
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tennis_calculator.core.models.match import Match  # noqa: E402
+from tennis_calculator.core.models.tournament import Tournament  # noqa: E402
+from tennis_calculator.core.rules import PLAYER_ONE, PLAYER_TWO  # noqa: E402
+from tennis_calculator.core.server.feed import FeedClient, ScoreFeed  # noqa: E402
+
+
+def new_tournament(matches: int) -> Tournament:
+    tournament = Tournament()
+    for number in range(matches):
+        tournament.add_match(Match(f"{number:03d}", f"P{number}a", f"P{number}b"))
+    return tournament
+
+
+def ingest(tournament: Tournament, points: int, seed: int = 1) -> float:
+    """Record points on random live matches, returning points per second."""
+    rng = random.Random(seed)
+    live = list(tournament.matches)
+    start = time.perf_counter()
+    for _ in range(points):
+        match_id = rng.choice(live)
+        match = tournament.matches[match_id]
+        if match.winner:
+            tournament.add_match(
+                Match(match_id, match.player_one, match.player_two), overwrite=True
+            )
+        tournament.record_match_point(match_id, rng.choice((PLAYER_ONE, PLAYER_TWO)))
+    return points / (time.perf_counter() - start)
+
+
+def read_events(client: FeedClient, delay: float, counts: list) -> None:
+    try:
+        for _ in client.events():
+            counts.append(1)
+            if delay:
+                time.sleep(delay)
+    except (OSError, ValueError):
+        pass
+
+
+def run_clients(
+    socket_path: str, count: int, matches: int, delay: float, ready, done, results
+) -> None:
+    """Subscribe clients in a separate process and count the scores they read."""
+    clients, readers, counts = [], [], []
+    for number in range(count):
+        client = FeedClient.connect(socket_path)
+        client.subscribe_match(f"{number % matches:03d}")
+        # Every other client reads slower than points arrive
+        reader = threading.Thread(
+            target=read_events, args=(client, delay if number % 2 else 0, counts)
+        )
+        reader.start()
+        clients.append(client)
+        readers.append(reader)
+    time.sleep(0.5)
+    counts.clear()
+    ready.set()
+    done.wait()
+    time.sleep(0.5)
+    results.put(len(counts))
+    for client in clients:
+        client.connection.shutdown(socket.SHUT_RDWR)
+    for client, reader in zip(clients, readers):
+        reader.join()
+        client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=200000)
+    parser.add_argument("--matches", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--slow-delay", type=float, default=0.001)
+    args = parser.parse_args()
+
+    rate = ingest(new_tournament(args.matches), args.points)
+    print(f"no feed:        {rate:,.0f} points/s")
+    with tempfile.TemporaryDirectory() as directory:
+        tournament = new_tournament(args.matches)
+        feed = ScoreFeed(os.path.join(directory, "feed"), tournament)
+        threading.Thread(target=feed.serve_forever, daemon=True).start()
+        print(f"no subscribers: {ingest(tournament, args.points):,.0f} points/s")
+
+        ready, done = multiprocessing.Event(), multiprocessing.Event()
+        results = multiprocessing.Queue()
+        clients = multiprocessing.Process(
+            target=run_clients,
+            args=(
+                feed.socket_path,
+                args.clients,
+                args.matches,
+                args.slow_delay,
+                ready,
+                done,
+                results,
+            ),
+        )
+        clients.start()
+        ready.wait()
+        rate = ingest(tournament, args.points)
+        done.set()
+        delivered = results.get()
+        clients.join()
+        print(
+            f"{args.clients} clients:     {rate:,.0f} points/s, "
+            f"{delivered:,} scores delivered"
+        )
+        feed.shutdown()
+        feed.server_close()
+
+
+if __name__ == "__main__":
+    main()
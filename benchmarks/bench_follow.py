@@ -0,0 +1,91 @@
+"""Measure live scoring of appended points and query latency while following.
+
+A file holding a synthetic tournament is followed from the start, then
+matches are appended a few points at a time. Each poll is followed by a
+save to a sqlite store, and a second connection to the store times score
+and games queries between polls, as a separate query process would.
+
+Usage:
+    python benchmarks/bench_follow.py --matches 2000 --live 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._synthetic import synthetic_matches, write_tournament  # noqa: E402
+from tennis_calculator.core.processors.match_follower import (  # noqa: E402
+    MatchFollower,
+)
+from tennis_calculator.core.processors.query_processor import (  # noqa: E402
+    QueryProcessor,
+)
+from tennis_calculator.core.storage import SqliteStore  # noqa: E402
+
+POINTS_PER_APPEND = 4
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=2000)
+    parser.add_argument("--live", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "live.txt")
+        write_tournament(path, args.matches)
+        store = SqliteStore(os.path.join(directory, "live.db"))
+        reader = SqliteStore(store.path)
+        match_processor = store.load()
+        follower = MatchFollower(match_processor, [path])
+
+        start = time.perf_counter()
+        follower.poll()
+        store.save(match_processor)
+        catch_up = time.perf_counter() - start
+        print(f"catch-up: {args.matches} matches in {catch_up:.2f}s")
+
+        live = synthetic_matches(args.live, seed=11)
+        poll_times, query_times = [], []
+        appended = 0
+        with open(path, "a") as f:
+            for number, (_, player_one, player_two, points) in enumerate(live):
+                match_id = f"live{number}"
+                f.write(f"Match: {match_id}\n{player_one} vs {player_two}\n")
+                for first in range(0, len(points), POINTS_PER_APPEND):
+                    batch = points[first : first + POINTS_PER_APPEND]
+                    f.write("".join(f"{point - 1}\n" for point in batch))
+                    f.flush()
+                    appended += len(batch)
+
+                    start = time.perf_counter()
+                    follower.poll()
+                    store.save(match_processor)
+                    poll_times.append(time.perf_counter() - start)
+
+                    start = time.perf_counter()
+                    query_processor = QueryProcessor(reader.load())
+                    query_processor.handle_query(f"Score Match {match_id}")
+                    query_processor.handle_query(f"Games Player {player_one}")
+                    query_times.append((time.perf_counter() - start) / 2)
+        reader.close()
+        store.close()
+
+    print(
+        f"live: {appended} points in {len(poll_times)} appends, poll and save "
+        f"median {statistics.median(poll_times) * 1e3:.2f} ms"
+    )
+    query_times.sort()
+    print(
+        f"query: median {statistics.median(query_times) * 1e3:.3f} ms, "
+        f"p99 {query_times[int(len(query_times) * 0.99)] * 1e3:.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Load test the HTTP query API and report latency percentiles and throughput.
+
+Without --port the script saves a synthetic tournament to a temporary pickle
+store and starts ``tennis-calculator serve --http`` on it in a subprocess.
+Each client connection is kept alive and sends --pipeline requests at a time
+before reading their responses. Requests alternate between match scores and
+player games; with --batch N every tenth request is a POST /query of N
+score queries instead. Requests name synthetic matches and players, so a
+server given with --port should have processed a tournament written by
+``benchmarks._synthetic.write_tournament`` with the same --matches.
+
+Usage:
+    python benchmarks/bench_http.py --connections 32 --requests 20000
+    python benchmarks/bench_http.py --port 8080 --pipeline 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+from urllib.parse import quote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks._synthetic import synthetic_matches  # noqa: E402
+from tennis_calculator.core.processors.match_processor import (  # noqa: E402
+    MatchProcessor,
+)
+from tennis_calculator.core.scoring.bulk import summarize_match  # noqa: E402
+from tennis_calculator.core.storage.pickle_store import PickleStore  # noqa: E402
+
+
+def save_tournament(path: str, count: int) -> Tuple[List[str], List[str]]:
+    """Save synthetic matches, returning their ids and player names."""
+    match_processor = MatchProcessor()
+    match_ids, players = [], set()
+    for match_id, player_one, player_two, points in synthetic_matches(count):
+        match_processor.tournament.add_match(
+            summarize_match(match_id, player_one, player_two, points).to_match()
+        )
+        match_ids.append(match_id)
+        players.update((player_one, player_two))
+    PickleStore(path).save(match_processor)
+    return match_ids, sorted(players)
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(data: str, port: int) -> subprocess.Popen:
+    """Start a server process and wait until it accepts connections."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "tennis_calculator.cli", "--store", "pickle"]
+        + ["--data", data, "serve", "--http", str(port)],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.05)
+    server.kill()
+    raise SystemExit("HTTP server did not start")
+
+
+def build_requests(
+    count: int, match_ids: List[str], players: List[str], batch: int, seed: int = 3
+) -> List[bytes]:
+    rng = random.Random(seed)
+    requests = []
+    for number in range(count):
+        if batch and number % 10 == 9:
+            queries = [f"Score Match {rng.choice(match_ids)}" for _ in range(batch)]
+            body = json.dumps(queries).encode()
+            head = f"POST /query HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+            requests.append(f"{head}Host: bench\r\n\r\n".encode() + body)
+        elif number % 2:
+            target = f"/players/{quote(rng.choice(players))}/games"
+            requests.append(f"GET {target} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+        else:
+            target = f"/matches/{rng.choice(match_ids)}/score"
+            requests.append(f"GET {target} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+    return requests
+
+
+async def read_status(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    await reader.readexactly(length)
+    return int(head.split(b" ", 2)[1])
+
+
+async def client(
+    port: int, requests: List[bytes], pipeline: int, latencies: List[float]
+) -> int:
+    """Send requests over one connection, returning the number of errors."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    errors = 0
+    for start in range(0, len(requests), pipeline):
+        window = requests[start : start + pipeline]
+        sent = time.perf_counter()
+        writer.write(b"".join(window))
+        for _ in window:
+            errors += await read_status(reader) != 200
+            latencies.append(time.perf_counter() - sent)
+    writer.close()
+    return errors
+
+
+async def load(port: int, requests: List[bytes], connections: int, pipeline: int):
+    latencies: List[float] = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(
+        *(
+            client(port, requests[number::connections], pipeline, latencies)
+            for number in range(connections)
+        )
+    )
+    return time.perf_counter() - start, latencies, sum(errors)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, help="Load an already running server")
+    parser.add_argument("--matches", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--pipeline", type=int, default=1)
+    parser.add_argument("--batch", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        data = os.path.join(directory, "tournament")
+        match_ids, players = save_tournament(data, args.matches)
+        server = None
+        port = args.port
+        if port is None:
+            port = free_port()
+            server = start_server(data, port)
+        try:
+            requests = build_requests(args.requests, match_ids, players, args.batch)
+            elapsed, latencies, errors = asyncio.run(
+                load(port, requests, args.connections, args.pipeline)
+            )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    cuts = statistics.quantiles(latencies, n=100)
+    print(
+        f"{len(latencies)} requests over {args.connections} connections, "
+        f"pipeline {args.pipeline}: {len(latencies) / elapsed:,.0f} req/s, "
+        f"p50 {cuts[49] * 1000:.2f} ms, p99 {cuts[98] * 1000:.2f} ms, "
+        f"{errors} errors"
+    )
+
+
+if __name__ == "__main__":
+    main()
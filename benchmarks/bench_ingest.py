@@ -0,0 +1,64 @@
+"""Compare ingest throughput of the available input paths.
+
+Usage:
+    python benchmarks/bench_ingest.py --matches 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._synthetic import write_tournament  # noqa: E402
+from tennis_calculator.core.parsers.binary_format import (  # noqa: E402
+    convert_text_to_binary,
+)
+from tennis_calculator.core.processors.match_processor import (  # noqa: E402
+    MatchProcessor,
+)
+
+
+def _stream(processor: MatchProcessor, path: str) -> None:
+    with open(path, "r") as f:
+        processor.process_stream(f)
+
+
+def _mmap(processor: MatchProcessor, path: str) -> None:
+    processor.process_file(path)
+
+
+def _binary(processor: MatchProcessor, path: str) -> None:
+    processor.process_file(path + ".tcpb")
+
+
+MODES = {"text stream": _stream, "mmap scanner": _mmap, "binary archive": _binary}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "input.txt")
+        write_tournament(path, args.matches)
+        convert_text_to_binary(path, path + ".tcpb")
+        size = os.path.getsize(path) / 2**20
+        binary_size = os.path.getsize(path + ".tcpb") / 2**20
+        print(
+            f"{args.matches} matches, text {size:.2f} MiB, binary "
+            f"{binary_size:.2f} MiB ({size / binary_size:.1f}x smaller)"
+        )
+        for label, ingest in MODES.items():
+            processor = MatchProcessor()
+            start = time.perf_counter()
+            ingest(processor, path)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<14} {elapsed:>7.3f} s {size / elapsed:>8.1f} text MiB/s")
+
+
+if __name__ == "__main__":
+    main()
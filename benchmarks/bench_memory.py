@@ -0,0 +1,51 @@
+"""Report resident bytes per match for a large synthetic tournament.
+
+Memory is measured once with every match held as objects and again after
+Tournament.compact has moved the completed matches into columnar storage.
+
+Usage:
+    python benchmarks/bench_memory.py --matches 20000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._synthetic import synthetic_matches  # noqa: E402
+from tennis_calculator.core.models.tournament import Tournament  # noqa: E402
+from tennis_calculator.core.parsers.match_parser import MatchParser  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=20000)
+    args = parser.parse_args()
+
+    blocks = []
+    for match_id, player_one, player_two, points in synthetic_matches(args.matches):
+        lines = [f"Match: {match_id}", f"{player_one} vs {player_two}"]
+        blocks.append(lines + [str(point - 1) for point in points])
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tournament = Tournament()
+    for lines in blocks:
+        tournament.add_match(MatchParser.create_match(lines))
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tournament.compact()
+    gc.collect()
+    compacted = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{args.matches} matches: {(after - before) / args.matches:,.0f} bytes/match")
+    print(f"after compact: {(compacted - before) / args.matches:,.0f} bytes/match")
+
+
+if __name__ == "__main__":
+    main()
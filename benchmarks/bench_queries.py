@@ -0,0 +1,89 @@
+"""Compare answering a query script one query at a time with batch answering.
+
+A synthetic tournament is processed, then a script of queries with many
+repeats, as a nightly report issues, is answered by handling and printing
+each query in turn, first without and then with the result cache, and once
+more with QueryProcessor.handle_queries. Results are written to in-memory
+buffers so only query handling is timed.
+
+Usage:
+    python benchmarks/bench_queries.py --matches 2000 --queries 1000000
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._synthetic import synthetic_matches, write_tournament  # noqa: E402
+from tennis_calculator.core.processors.match_processor import (  # noqa: E402
+    MatchProcessor,
+)
+from tennis_calculator.core.processors.query_processor import (  # noqa: E402
+    QueryProcessor,
+)
+
+
+def query_script(matches: int, queries: int, seed: int = 3):
+    """Return score and games queries on random matches and their players."""
+    rng = random.Random(seed)
+    players = sorted(
+        {
+            player
+            for _, player_one, player_two, _ in synthetic_matches(matches)
+            for player in (player_one, player_two)
+        }
+    )
+    script = []
+    for _ in range(queries):
+        if rng.random() < 0.5:
+            script.append(f"Score Match {rng.randrange(matches):06d}")
+        else:
+            script.append(f"Games Player {rng.choice(players)}")
+    return script
+
+
+def one_at_a_time(query_processor: QueryProcessor, script, output) -> None:
+    for query in script:
+        print(query_processor.handle_query(query), file=output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tournament.txt")
+        write_tournament(path, args.matches)
+        match_processor = MatchProcessor()
+        match_processor.process_file(path)
+    query_processor = QueryProcessor(match_processor)
+    script = query_script(args.matches, args.queries)
+
+    uncached, single, batched = io.StringIO(), io.StringIO(), io.StringIO()
+    start = time.perf_counter()
+    one_at_a_time(QueryProcessor(match_processor, cache_entries=0), script, uncached)
+    uncached_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    one_at_a_time(query_processor, script, single)
+    single_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    query_processor.handle_queries(script, batched)
+    batch_seconds = time.perf_counter() - start
+    assert uncached.getvalue() == single.getvalue() == batched.getvalue()
+
+    print(f"uncached:      {args.queries / uncached_seconds:,.0f} queries/s")
+    print(f"one at a time: {args.queries / single_seconds:,.0f} queries/s")
+    print(f"batched:       {args.queries / batch_seconds:,.0f} queries/s")
+    print(query_processor.result_cache.describe())
+
+
+if __name__ == "__main__":
+    main()
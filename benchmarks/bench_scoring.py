@@ -0,0 +1,70 @@
+"""Points per second through MatchParser.create_match versus model dispatch.
+
+Usage:
+    python benchmarks/bench_scoring.py --matches 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._synthetic import synthetic_matches  # noqa: E402
+from tennis_calculator.core.models.match import Match  # noqa: E402
+from tennis_calculator.core.parsers.match_parser import MatchParser  # noqa: E402
+from tennis_calculator.core.scoring.table import TableScorer  # noqa: E402
+
+
+def _model_create_match(lines):
+    """The object-dispatch scoring path create_match used before the table."""
+    match = Match(*MatchParser.parse_match_details(lines))
+    for point in MatchParser.parse_points(lines):
+        try:
+            match.record_point(point)
+        except Exception:
+            break
+    return match
+
+
+def _rate(label, function, blocks, total_points):
+    start = time.perf_counter()
+    for block in blocks:
+        function(block)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {total_points / elapsed:>14,.0f} points/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=2000)
+    args = parser.parse_args()
+
+    blocks, point_lists = [], []
+    for match_id, player_one, player_two, points in synthetic_matches(args.matches):
+        lines = [f"Match: {match_id}", f"{player_one} vs {player_two}"]
+        blocks.append(lines + [str(point - 1) for point in points])
+        point_lists.append(points)
+    total = sum(len(points) for points in point_lists)
+
+    model = _rate("model create_match", _model_create_match, blocks, total)
+    table = _rate("table create_match", MatchParser.create_match, blocks, total)
+
+    def score_only(points):
+        TableScorer().record_points(points)
+
+    def model_only(points):
+        match = Match("bench", "A", "B")
+        for point in points:
+            match.record_point(point)
+
+    model_core = _rate("model scoring only", model_only, point_lists, total)
+    table_core = _rate("table scoring only", score_only, point_lists, total)
+    print(f"create_match speedup: {model / table:.1f}x")
+    print(f"scoring speedup:      {model_core / table_core:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
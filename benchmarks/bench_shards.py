@@ -0,0 +1,54 @@
+"""Measure ingest of many compressed daily shards, sequential and parallel.
+
+Usage:
+    python benchmarks/bench_shards.py --matches 20000 --shards 8 --workers 4
+"""
+
+import argparse
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._synthetic import write_tournament  # noqa: E402
+from tennis_calculator.core.parsers.input_files import expand_inputs  # noqa: E402
+from tennis_calculator.core.processors.match_processor import (  # noqa: E402
+    MatchProcessor,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=20000)
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for shard in range(args.shards):
+            path = os.path.join(tmp, f"day{shard:02d}.txt")
+            write_tournament(path, args.matches // args.shards, seed=shard)
+            with open(path, "rb") as f, gzip.open(path + ".gz", "wb") as out:
+                shutil.copyfileobj(f, out)
+            os.remove(path)
+        paths = expand_inputs([os.path.join(tmp, "*.txt.gz")])
+
+        for workers in sorted({1, args.workers}):
+            start = time.perf_counter()
+            reports = MatchProcessor().process_inputs(paths, workers)
+            elapsed = time.perf_counter() - start
+            matches = sum(report.matches for report in reports)
+            print(
+                f"workers={workers}: {matches} matches in {elapsed:.3f} s "
+                f"({matches / elapsed:,.0f} matches/s)"
+            )
+            for report in reports[:2]:
+                print(f"  {report.describe()}")
+
+
+if __name__ == "__main__":
+    main()
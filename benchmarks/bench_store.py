@@ -0,0 +1,71 @@
+"""Compare save and query cost of the tournament stores.
+
+For each store the script saves a synthetic tournament, then times a fresh
+open plus one score query, a fresh open plus one games query, and adding a
+single match to the saved tournament and saving it again.
+
+Usage:
+    python benchmarks/bench_store.py --matches 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._synthetic import synthetic_matches  # noqa: E402
+from tennis_calculator.core.scoring.bulk import summarize_match  # noqa: E402
+from tennis_calculator.core.storage import STORES, open_store  # noqa: E402
+
+
+def timed(action) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def bench_store(kind: str, path: str, matches) -> None:
+    with open_store(kind, path) as store:
+        match_processor = store.load()
+        for match in matches:
+            match_processor.tournament.add_match(match, overwrite=True)
+        save = timed(lambda: store.save(match_processor))
+
+    def query(action):
+        with open_store(kind, path) as store:
+            action(store.load().tournament)
+
+    score = timed(lambda: query(lambda t: t.get_match(matches[0].match_id)))
+    games = timed(lambda: query(lambda t: t.get_player_games(matches[0].player_one)))
+
+    with open_store(kind, path) as store:
+        match_processor = store.load()
+        match_processor.tournament.add_match(matches[-1], overwrite=True)
+        append = timed(lambda: store.save(match_processor))
+    print(
+        f"{kind:>8}: save {save * 1000:8.1f} ms  score {score * 1000:7.1f} ms  "
+        f"games {games * 1000:7.1f} ms  add one {append * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=20000)
+    args = parser.parse_args()
+
+    matches = [
+        summarize_match(match_id, player_one, player_two, points).to_match()
+        for match_id, player_one, player_two, points in synthetic_matches(
+            args.matches
+        )
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        for kind in sorted(STORES):
+            bench_store(kind, os.path.join(directory, kind), matches)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Compare peak RSS of list-based and streaming ingest as input size grows.
+
+Each measurement runs in a fresh interpreter because ``ru_maxrss`` is a
+high-water mark for the whole process.
+
+Usage:
+    python benchmarks/bench_streaming.py --matches 1000 4000 16000
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._synthetic import write_tournament  # noqa: E402
+
+
+def _ingest(mode: str, path: str) -> None:
+    """Ingest ``path`` with the given mode and print peak RSS in KiB."""
+    from tennis_calculator.core.processors.match_processor import MatchProcessor
+
+    processor = MatchProcessor()
+    # Discard scored matches so only the ingest buffers show up in the peak.
+    processor.tournament.add_match = lambda match, overwrite=False: None
+    start = time.perf_counter()
+    with open(path, "r") as f:
+        if mode == "list":
+            processor.process_matches([line.strip() for line in f if line.strip()])
+        else:
+            processor.process_stream(f)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{peak} {elapsed:.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, nargs="+", default=[1000, 4000, 16000])
+    parser.add_argument(
+        "--worker", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.worker:
+        _ingest(*args.worker)
+        return
+
+    print(
+        f"{'matches':>8} {'MiB':>8} {'list RSS':>10} {'stream RSS':>11} "
+        f"{'list s':>8} {'stream s':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.matches:
+            path = os.path.join(tmp, f"{count}.txt")
+            write_tournament(path, count)
+            size = os.path.getsize(path) / 2**20
+            results = {}
+            for mode in ("list", "stream"):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--worker", mode, path],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout.split()
+                results[mode] = (int(output[0]) / 1024, float(output[1]))
+            print(
+                f"{count:>8} {size:>8.1f} {results['list'][0]:>8.1f}Mi "
+                f"{results['stream'][0]:>9.1f}Mi {results['list'][1]:>8.2f} "
+                f"{results['stream'][1]:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
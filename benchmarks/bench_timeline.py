@@ -0,0 +1,68 @@
+"""Compare score-at-point lookups from checkpoints with full replays.
+
+Long synthetic matches are scored once, then the score after random points
+is rebuilt both from the nearest point history checkpoint and by replaying
+every point from the start of the match.
+
+Usage:
+    python benchmarks/bench_timeline.py --points 100000 --lookups 2000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tennis_calculator.core.rules import PLAYER_ONE, PLAYER_TWO  # noqa: E402
+from tennis_calculator.core.scoring.bulk import summarize_match  # noqa: E402
+from tennis_calculator.core.scoring.table import TableScorer  # noqa: E402
+from tennis_calculator.core.scoring.timeline import score_at  # noqa: E402
+
+
+def deuce_points(count: int, seed: int = 5) -> bytes:
+    """returns points of one endless deuce game, so the match never ends"""
+    rng = random.Random(seed)
+    points = bytearray()
+    while len(points) < count:
+        pair = [PLAYER_ONE, PLAYER_TWO]
+        rng.shuffle(pair)
+        points.extend(pair)
+    return bytes(points[:count])
+
+
+def replayed(match, points: int):
+    """rebuilds the score after some points by replaying from the start"""
+    scorer = TableScorer()
+    scorer.record_points(match.history.points(0, points))
+    return scorer.to_match(match.match_id, match.player_one, match.player_two)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    match = summarize_match("01", "A", "B", list(deuce_points(args.points)))
+    match = match.to_match()
+    rng = random.Random(9)
+    targets = [rng.randint(0, args.points) for _ in range(args.lookups)]
+
+    for name, lookup in (("checkpoint", score_at), ("full replay", replayed)):
+        timings = []
+        for points in targets:
+            start = time.perf_counter()
+            lookup(match, points)
+            timings.append(time.perf_counter() - start)
+        print(
+            f"{name:>11}: median {statistics.median(timings) * 1e6:.1f} us, "
+            f"max {max(timings) * 1e6:.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compare NumPy lockstep batch scoring with the pure-Python table scorer.
+
+Usage:
+    python benchmarks/bench_vectorized.py --matches 2000 20000 50000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._synthetic import synthetic_matches  # noqa: E402
+from tennis_calculator.core.parsers.match_parser import MatchData  # noqa: E402
+from tennis_calculator.core.scoring.vectorized import (  # noqa: E402
+    HAS_NUMPY,
+    score_batch,
+)
+
+
+def _time(matches, use_numpy):
+    gc.collect()
+    start = time.perf_counter()
+    score_batch(matches, use_numpy=use_numpy)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--matches", type=int, nargs="+", default=[2000, 20000, 50000]
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'matches':>8} {'points':>10} {'python s':>9} {'numpy s':>8} "
+        f"{'speedup':>8}"
+    )
+    for count in args.matches:
+        matches = [MatchData(*data) for data in synthetic_matches(count)]
+        points = sum(len(match.points) for match in matches)
+        python_time = _time(matches, use_numpy=False)
+        if not HAS_NUMPY:
+            print(f"{count:>8} {points:>10} {python_time:>9.3f} {'n/a':>8}")
+            continue
+        numpy_time = _time(matches, use_numpy=True)
+        print(
+            f"{count:>8} {points:>10} {python_time:>9.3f} {numpy_time:>8.3f} "
+            f"{python_time / numpy_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,7 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     install_requires=[],
+    extras_require={"numpy": ["numpy>=1.20"]},
     python_requires=">=3.9",
     entry_points={
         "console_scripts": [
@@ -4,69 +4,515 @@
 import sys
 import os
 import argparse
-import pickle
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional
+from tennis_calculator.core.parsers.binary_format import convert_text_to_binary
+from tennis_calculator.core.parsers.input_files import expand_inputs
+from tennis_calculator.core.processors.match_follower import (
+    FOLLOW_INTERVAL,
+    MatchFollower,
+)
 from tennis_calculator.core.processors.match_processor import MatchProcessor
 from tennis_calculator.core.processors.query_processor import QueryProcessor
-from tennis_calculator.core.exceptions import TennisCalculatorException
+from tennis_calculator.core.scoring.cache import (
+    DEFAULT_CACHE_ENTRIES,
+    DEFAULT_CACHE_PATH,
+    ScoreCache,
+)
+from tennis_calculator.core.server.feed import (
+    DEFAULT_FEED_PATH,
+    FeedClient,
+    ScoreFeed,
+)
+from tennis_calculator.core.server.http_api import (
+    DEFAULT_HTTP_HOST,
+    run_http_server,
+)
+from tennis_calculator.core.server.unix_socket import (
+    DEFAULT_SOCKET_PATH,
+    QueryClient,
+    QueryServer,
+)
+from tennis_calculator.core.storage import (
+    DEFAULT_PICKLE_PATH,
+    STORES,
+    PickleStore,
+    TournamentStore,
+    migrate,
+    open_store,
+)
+from tennis_calculator.core.exceptions import (
+    InvalidMatchDataException,
+    TennisCalculatorException,
+)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Tennis Calculator CLI")
+    parser.add_argument(
+        "--store",
+        choices=sorted(STORES),
+        default="sqlite",
+        help="Storage backend for processed matches",
+    )
+    parser.add_argument(
+        "--data", help="Path of the tournament store, defaults per backend"
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     process_parser = subparsers.add_parser(
         "process", help="Process match input from file"
     )
     process_parser.add_argument(
-        "--input", "-i", required=True, help="Path to input file containing match data"
+        "--input",
+        "-i",
+        required=True,
+        action="extend",
+        nargs="+",
+        help="Input files or glob patterns, plain or gzip/bz2/xz compressed",
+    )
+    process_parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=1,
+        help="Number of worker processes used to score matches",
+    )
+    process_parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Print matches and throughput for each input file",
+    )
+    process_parser.add_argument(
+        "--cache",
+        nargs="?",
+        const=DEFAULT_CACHE_PATH,
+        help="Reuse scores of unchanged match blocks from this cache file "
+        f"(default {DEFAULT_CACHE_PATH})",
+    )
+    process_parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_ENTRIES,
+        help="Maximum number of cached scores, least recently used are evicted",
+    )
+    process_parser.add_argument(
+        "--append",
+        "-a",
+        action="store_true",
+        help="Continue matches that already exist instead of replacing them",
+    )
+    process_parser.add_argument(
+        "--follow",
+        "-f",
+        action="store_true",
+        help="Keep scoring points appended to the input files until interrupted",
+    )
+    process_parser.add_argument(
+        "--interval",
+        type=float,
+        default=FOLLOW_INTERVAL,
+        help="Seconds between checks for appended points in follow mode",
+    )
+    process_parser.add_argument(
+        "--feed",
+        nargs="?",
+        const=DEFAULT_FEED_PATH,
+        help="In follow mode, publish score changes on this socket "
+        f"(default {DEFAULT_FEED_PATH})",
+    )
+
+    convert_parser = subparsers.add_parser(
+        "convert", help="Convert a text match file to the binary format"
+    )
+    convert_parser.add_argument(
+        "--input", "-i", required=True, help="Path to text input file"
+    )
+    convert_parser.add_argument(
+        "--output", "-o", required=True, help="Path to binary output file"
     )
 
     query_parser = subparsers.add_parser("query", help="Query processed matches")
     query_parser.add_argument(
-        "subcommand", choices=["score", "games"], help="Query type: score or games"
+        "subcommand",
+        nargs="?",
+        choices=["score", "games", "stats"],
+        help="Query type: score, games or stats of the result cache",
     )
     query_parser.add_argument("--id", help="Match ID for score query")
+    query_parser.add_argument(
+        "--at",
+        type=int,
+        help="Score the match as it stood after this many points",
+    )
     query_parser.add_argument("--player", help="Player name for games query")
+    query_parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET_PATH,
+        help="Query server socket to use when a server is running",
+    )
+    query_parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Answer the queries in FILE, one per line, '-' for stdin",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Answer queries from memory over a unix domain socket"
+    )
+    serve_parser.add_argument(
+        "--socket", default=DEFAULT_SOCKET_PATH, help="Path of the socket to serve on"
+    )
+    serve_parser.add_argument(
+        "--http",
+        type=int,
+        metavar="PORT",
+        help="Serve the HTTP JSON API on this port instead of the socket",
+    )
+    serve_parser.add_argument(
+        "--host", default=DEFAULT_HTTP_HOST, help="Address to bind the HTTP API to"
+    )
+
+    subscribe_parser = subparsers.add_parser(
+        "subscribe", help="Print live score changes published by process --feed"
+    )
+    subscribe_parser.add_argument(
+        "--id", action="append", default=[], help="Match ID to follow, repeatable"
+    )
+    subscribe_parser.add_argument(
+        "--player", action="append", default=[], help="Player to follow, repeatable"
+    )
+    subscribe_parser.add_argument(
+        "--feed", default=DEFAULT_FEED_PATH, help="Score feed socket to connect to"
+    )
+
+    migrate_parser = subparsers.add_parser(
+        "migrate", help="Copy matches from a pickle file into the selected store"
+    )
+    migrate_parser.add_argument(
+        "--input",
+        "-i",
+        default=DEFAULT_PICKLE_PATH,
+        help="Path of the pickled tournament to migrate",
+    )
 
     args = parser.parse_args()
 
-    tournament_file = ".tournament_data"
-    match_processor = None
+    if args.command == "convert":
+        try:
+            converted = convert_text_to_binary(args.input, args.output)
+        except TennisCalculatorException as ex:
+            print(f"Error: {ex}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Converted {converted} matches.")
+        return
+
+    if args.command == "subscribe":
+        if not args.id and not args.player:
+            parser.error("--id or --player is required for subscribe")
+        try:
+            subscribe(args.feed, args.id, args.player)
+        except TennisCalculatorException as ex:
+            print(f"Error: {ex}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    if args.command == "query" and args.batch is None:
+        query = build_query(parser, args)
+        client = QueryClient.connect(args.socket)
+        if client is not None:
+            with client:
+                try:
+                    print(client.query(query))
+                except TennisCalculatorException as ex:
+                    print(f"Error: {ex}", file=sys.stderr)
+                    sys.exit(1)
+            return
 
     try:
-        if os.path.exists(tournament_file):
-            with open(tournament_file, "rb") as f:
-                match_processor = pickle.load(f)
-        else:
-            match_processor = MatchProcessor()
-
-        query_processor = QueryProcessor(match_processor)
-
-        if args.command == "process":
-            with open(args.input, "r") as f:
-                lines = [line.strip() for line in f if line.strip()]
-            match_processor.process_matches(lines)
-            with open(tournament_file, "wb") as f:
-                pickle.dump(match_processor, f)
-            print("Matches processed successfully.")
-
-        elif args.command == "query":
-            if args.subcommand == "score":
-                if not args.id:
-                    parser.error("--id is required for score query")
-                result = query_processor.handle_query(f"Score Match {args.id}")
-                print(result)
-            else:
-                if not args.player:
-                    parser.error("--player is required for games query")
-                result = query_processor.handle_query(f"Games Player {args.player}")
-                print(result)
+        with open_cli_store(args) as store:
+            if args.command == "serve" and args.http is not None:
+                serve_http(args.host, args.http, store)
+                return
+
+            if args.command == "serve":
+                serve(args.socket, store)
+                return
+
+            if args.command == "migrate":
+                if not os.path.exists(args.input):
+                    raise TennisCalculatorException(f"{args.input} does not exist")
+                migrated = migrate(PickleStore(args.input), store)
+                print(f"Migrated {migrated} matches.")
+                return
+
+            match_processor = store.load()
+            query_processor = QueryProcessor(match_processor)
+
+            if args.command == "process" and args.follow:
+                follow(
+                    expand_inputs(args.input),
+                    match_processor,
+                    store,
+                    args.interval,
+                    args.append,
+                    args.feed,
+                )
+
+            elif args.command == "process":
+                if args.cache:
+                    match_processor.score_cache = ScoreCache(
+                        args.cache, args.cache_size
+                    )
+                try:
+                    reports = match_processor.process_inputs(
+                        expand_inputs(args.input), args.workers, append=args.append
+                    )
+                finally:
+                    if match_processor.score_cache is not None:
+                        match_processor.score_cache.save()
+                if args.report:
+                    for report in reports:
+                        print(report.describe())
+                    if match_processor.score_cache is not None:
+                        print(match_processor.score_cache.describe())
+                if not sum(report.matches for report in reports):
+                    raise InvalidMatchDataException("No match data provided")
+                store.save(match_processor)
+                print("Matches processed successfully.")
+                report_discarded(match_processor)
+
+            elif args.command == "query" and args.batch is not None:
+                run_batch(query_processor, args.batch)
+
+            elif args.command == "query":
+                print(query_processor.handle_query(query))
 
     except TennisCalculatorException as ex:
         print(f"Error: {ex}", file=sys.stderr)
         sys.exit(1)
 
 
+def open_cli_store(args: argparse.Namespace) -> TournamentStore:
+    """Opens the store selected on the command line.
+
+    A new store is seeded from the legacy pickle file when one exists,
+    so upgrading does not lose previously processed matches.
+
+    Args:
+        args: The parsed command line arguments.
+
+    Returns:
+        The opened store.
+    """
+    path = args.data or STORES[args.store][1]
+    legacy = PickleStore(DEFAULT_PICKLE_PATH)
+    seed_from_legacy = (
+        args.store != "pickle"
+        and args.command != "migrate"
+        and not os.path.exists(path)
+        and legacy.exists()
+    )
+    store = open_store(args.store, path)
+    if seed_from_legacy:
+        migrated = migrate(legacy, store)
+        print(f"Migrated {migrated} matches from {legacy.path}.", file=sys.stderr)
+    return store
+
+
+def build_query(parser: argparse.ArgumentParser, args: argparse.Namespace) -> str:
+    """Builds the query text for the query subcommand.
+
+    Args:
+        parser: The parser used to report missing arguments.
+        args: The parsed command line arguments.
+
+    Returns:
+        The query in the form accepted by QueryProcessor.handle_query.
+    """
+    if args.subcommand is None:
+        parser.error("a query type or --batch is required for query")
+    if args.subcommand == "stats":
+        return "Stats Cache"
+    if args.subcommand == "score":
+        if not args.id:
+            parser.error("--id is required for score query")
+        if args.at is not None:
+            return f"Score Match {args.id} At {args.at}"
+        return f"Score Match {args.id}"
+    if not args.player:
+        parser.error("--player is required for games query")
+    return f"Games Player {args.player}"
+
+
+def run_batch(query_processor: QueryProcessor, batch_path: str) -> None:
+    """Answers a file of queries, writing one result per query to stdout.
+
+    Failed queries are answered with an error line and the remaining
+    queries are still answered.
+
+    Args:
+        query_processor: The query processor to use.
+        batch_path: Path of the file holding one query per line, or '-'
+            to read the queries from stdin.
+
+    Raises:
+        TennisCalculatorException: If the file does not exist or any
+            query failed.
+    """
+    if batch_path == "-":
+        failures = query_processor.handle_queries(script_queries(sys.stdin), sys.stdout)
+    else:
+        if not os.path.exists(batch_path):
+            raise TennisCalculatorException(f"{batch_path} does not exist")
+        with open(batch_path, encoding="utf-8") as batch_file:
+            failures = query_processor.handle_queries(
+                script_queries(batch_file), sys.stdout
+            )
+    if failures:
+        raise TennisCalculatorException(f"{failures} queries failed")
+
+
+def script_queries(lines: Iterable[str]) -> Iterator[str]:
+    """Yields the queries of a script, skipping blank lines.
+
+    Args:
+        lines: Lines of the script.
+
+    Yields:
+        Each query, up to a line reading 'exit'.
+    """
+    for line in lines:
+        query = line.strip()
+        if not query:
+            continue
+        if query.lower() == "exit":
+            return
+        yield query
+
+
+def serve(socket_path: str, store: TournamentStore) -> None:
+    """Serves queries over a unix domain socket until interrupted.
+
+    Args:
+        socket_path: Path of the socket to listen on.
+        store: The store holding the processed tournament.
+    """
+    server = QueryServer(socket_path, store)
+    print(f"Serving queries on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nExiting...")
+    finally:
+        server.server_close()
+
+
+def serve_http(host: str, port: int, store: TournamentStore) -> None:
+    """Serves the HTTP JSON API until interrupted.
+
+    Args:
+        host: Address to bind to.
+        port: Port to listen on.
+        store: The store holding the processed tournament.
+    """
+    print(f"Serving HTTP queries on http://{host}:{port}")
+    try:
+        run_http_server(store, host, port)
+    except KeyboardInterrupt:
+        print("\nExiting...")
+
+
+def follow(
+    paths: List[str],
+    match_processor: MatchProcessor,
+    store: TournamentStore,
+    interval: float,
+    append: bool = False,
+    feed_path: Optional[str] = None,
+) -> None:
+    """Scores points appended to input files until interrupted.
+
+    The files are read from the start, then polled for appended lines. The
+    matches changed by each poll are saved, so queries and a running query
+    server see live scores.
+
+    Args:
+        paths: Text input files to follow.
+        match_processor: The match processor holding the live matches.
+        store: The store to save changes to.
+        interval: Seconds to wait between polls that find nothing new.
+        append: Whether blocks for known match ids continue those matches.
+        feed_path: Socket to publish score changes on, if any.
+    """
+    feed = None
+    if feed_path:
+        feed = ScoreFeed(feed_path, match_processor.tournament)
+        threading.Thread(target=feed.serve_forever, daemon=True).start()
+        print(f"Publishing score changes on {feed_path}")
+    follower = MatchFollower(match_processor, paths, append=append)
+    print(f"Following {len(paths)} input file(s), press Ctrl+C to stop")
+    try:
+        while True:
+            if follower.poll():
+                store.save(match_processor)
+            else:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nExiting...")
+    finally:
+        if feed is not None:
+            feed.shutdown()
+            feed.server_close()
+        store.save(match_processor)
+        report_discarded(match_processor)
+
+
+def subscribe(feed_path: str, match_ids: List[str], players: List[str]) -> None:
+    """Prints score changes of matches and players until interrupted.
+
+    Args:
+        feed_path: Socket of the running score feed.
+        match_ids: Match ids to follow.
+        players: Players whose matches to follow.
+
+    Raises:
+        TennisCalculatorException: If no feed is running or it rejects a
+            subscription.
+    """
+    client = FeedClient.connect(feed_path)
+    if client is None:
+        raise TennisCalculatorException(
+            f"No score feed running on {feed_path}, start process --follow --feed"
+        )
+    with client:
+        for match_id in match_ids:
+            client.subscribe_match(match_id)
+        for player in players:
+            client.subscribe_player(player)
+        try:
+            for kind, match_id, score in client.events():
+                suffix = " (final)" if kind == "FINAL" else ""
+                print(f"Match {match_id}: {score}{suffix}", flush=True)
+        except KeyboardInterrupt:
+            print("\nExiting...")
+
+
+def report_discarded(match_processor: MatchProcessor) -> None:
+    """Warns about points dropped because their match was already completed.
+
+    Args:
+        match_processor: The match processor that ingested the points.
+    """
+    if match_processor.discarded_points:
+        print(
+            f"Warning: discarded {match_processor.discarded_points} points "
+            "received after their match was completed.",
+            file=sys.stderr,
+        )
+
+
 def validate_input_file(input_file_path: str) -> None:
     """Validates the input file exists and is a valid .txt file.
 
@@ -92,6 +538,7 @@ def print_welcome_message() -> None:
     print("Instructions:")
     print("1. To query match result, type: Score Match <id>")
     print("   Example: Score Match 01")
+    print("   Score after a number of points: Score Match <id> At <points>")
     print("2. To query games for a player, type: Games Player <Player Name>")
     print("   Example: Games Player Person A")
     print("3. To exit the application, type: exit\n")
@@ -130,30 +577,24 @@ def handle_interactive_mode(query_processor: QueryProcessor) -> None:
 def handle_script_mode(query_processor: QueryProcessor) -> None:
     """Handles queries in script mode.
 
+    Results are written and flushed once per batch, stopping at the first
+    failed query.
+
     Args:
         query_processor: The query processor to use.
     """
-    for raw_query in sys.stdin:
-        if not _execute_script_query(query_processor, raw_query):
-            break
-
-
-def _execute_interactive_query(query_processor: QueryProcessor, query: str) -> bool:
-    if not query:
-        return True
-    if query.lower() == "exit":
-        return False
     try:
-        print(query_processor.handle_query(query))
-    except TennisCalculatorException as exception:
-        print(f"Error: {str(exception)}")
+        failures = query_processor.handle_queries(
+            script_queries(sys.stdin), sys.stdout, stop_on_error=True
+        )
     except Exception as exception:
         print(f"An unexpected error occurred: {str(exception)}")
-    return True
+        sys.exit(1)
+    if failures:
+        sys.exit(1)
 
 
-def _execute_script_query(query_processor: QueryProcessor, raw_query: str) -> bool:
-    query = raw_query.strip()
+def _execute_interactive_query(query_processor: QueryProcessor, query: str) -> bool:
     if not query:
         return True
     if query.lower() == "exit":
@@ -162,10 +603,8 @@ def _execute_script_query(query_processor: QueryProcessor, raw_query: str) -> bo
         print(query_processor.handle_query(query))
     except TennisCalculatorException as exception:
         print(f"Error: {str(exception)}")
-        sys.exit(1)
     except Exception as exception:
         print(f"An unexpected error occurred: {str(exception)}")
-        sys.exit(1)
     return True
 
 
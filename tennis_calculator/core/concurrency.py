@@ -0,0 +1,108 @@
+"""Locks shared by the tournament and the query paths."""
+
+import threading
+from threading import get_ident
+from typing import Callable, Optional
+
+
+class _Held:
+    """context manager that holds one side of a ReadWriteLock"""
+
+    __slots__ = ("_acquire", "_release")
+
+    def __init__(self, acquire: Callable[[], None], release: Callable[[], None]):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self) -> None:
+        self._acquire()
+
+    def __exit__(self, *exc_info) -> None:
+        self._release()
+
+
+class ReadWriteLock:
+    """lets any number of readers or a single writer hold the lock
+
+    Use ``with lock.reading:`` and ``with lock.writing:``. A writer waiting
+    for the lock keeps new readers out, so a steady stream of queries cannot
+    starve ingest. Both sides are reentrant, and the writing thread may also
+    take the read side, so locked methods can call each other. A reader
+    cannot take the write side; that raises RuntimeError instead of
+    deadlocking.
+    """
+
+    def __init__(self) -> None:
+        """initializes an unheld lock"""
+        # Uncontended paths take the plain mutex, which is much cheaper than
+        # entering the condition; both guard the same state
+        self._mutex = threading.Lock()
+        self._condition = threading.Condition(self._mutex)
+        self._readers = 0
+        self._waiting_readers = 0
+        self._waiting_writers = 0
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._local = threading.local()
+        self.reading = _Held(self.acquire_read, self.release_read)
+        self.writing = _Held(self.acquire_write, self.release_write)
+
+    def acquire_read(self) -> None:
+        """waits until no writer holds or waits for the lock"""
+        writer = self._writer
+        if writer is not None and writer == get_ident():
+            self._writer_depth += 1
+            return
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if not depth:
+            with self._mutex:
+                if self._writer is not None or self._waiting_writers:
+                    self._waiting_readers += 1
+                    while self._writer is not None or self._waiting_writers:
+                        self._condition.wait()
+                    self._waiting_readers -= 1
+                self._readers += 1
+        local.depth = depth + 1
+
+    def release_read(self) -> None:
+        """releases one read hold"""
+        writer = self._writer
+        if writer is not None and writer == get_ident():
+            self._writer_depth -= 1
+            return
+        local = self._local
+        local.depth -= 1
+        if not local.depth:
+            with self._mutex:
+                self._readers -= 1
+                if not self._readers and self._waiting_writers:
+                    self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """waits until no reader or other writer holds the lock"""
+        ident = get_ident()
+        if self._writer == ident:
+            self._writer_depth += 1
+            return
+        if getattr(self._local, "depth", 0):
+            raise RuntimeError("Cannot take the write lock while holding a read lock")
+        with self._mutex:
+            if self._writer is not None or self._readers:
+                self._waiting_writers += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._condition.wait()
+                finally:
+                    self._waiting_writers -= 1
+            self._writer = ident
+            self._writer_depth = 1
+
+    def release_write(self) -> None:
+        """releases one write hold"""
+        self._writer_depth -= 1
+        if not self._writer_depth:
+            with self._mutex:
+                self._writer = None
+                if self._waiting_readers or self._waiting_writers:
+                    self._condition.notify_all()
@@ -37,6 +37,12 @@ class PlayerNotFoundException(TennisCalculatorException):
     pass
 
 
+class PointNotFoundException(TennisCalculatorException):
+    """Raised when a point is not in a match's recorded points."""
+
+    pass
+
+
 class DuplicateMatchException(TennisCalculatorException):
     """Raised when trying to add a duplicate match."""
 
@@ -0,0 +1,219 @@
+"""handles columnar storage of completed matches
+
+A completed match never changes again and is only ever asked for its
+winner, its sets score and the games of each set. Instead of the full
+Match, Set and Game object graph those are kept in flat arrays: players
+as interned ids, and per set the games won by each side plus the points
+of the set's final game so the original Match can be rebuilt exactly. The
+point history of each match is kept serialized in one byte column.
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+from tennis_calculator.core.models.history import PointHistory
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.scoring.table import add_completed_set
+
+
+# Games won by each side, then each side's points in the set's final game
+SetValues = Tuple[int, int, int, int]
+# Removed rows kept in the columns before they are rebuilt, at the least
+MIN_DEAD_ROWS = 1024
+# Largest fraction of removed rows in the columns before they are rebuilt
+MAX_DEAD_FRACTION = 0.5
+
+
+class CompactMatches:
+    """stores completed matches column by column
+
+    Matches are rows; the sets of row ``n`` are the entries from
+    ``set_start[n]`` up to ``set_start[n + 1]`` of the set columns, and its
+    serialized point history is ``history[history_start[n]:history_start[n + 1]]``,
+    empty if the points are unknown. Removed and overwritten rows keep
+    their column entries until more than MAX_DEAD_FRACTION of the rows, and
+    at least MIN_DEAD_ROWS, are dead; the columns are then rebuilt from the
+    live rows, as they are when pickled.
+    """
+
+    def __init__(self) -> None:
+        """initializes empty columns"""
+        self.rows: Dict[str, int] = {}
+        self.match_ids: List[str] = []
+        self.players: List[str] = []
+        self.player_ids: Dict[str, int] = {}
+        self.player_one = array("I")
+        self.player_two = array("I")
+        self.set_start = array("I", [0])
+        self.set_games_one = array("B")
+        self.set_games_two = array("B")
+        self.final_points_one = array("H")
+        self.final_points_two = array("H")
+        self.history = bytearray()
+        self.history_start = array("Q", [0])
+
+    def __getstate__(self):
+        """Return state for pickling, dropping removed rows."""
+        state = dict(vars(self._rebuilt()))
+        del state["rows"], state["player_ids"]
+        return state
+
+    def __setstate__(self, state):
+        """Set state when unpickling, rebuilding the lookups."""
+        vars(self).update(state)
+        # Storage pickled before point histories were kept has none
+        if "history_start" not in state:
+            self.history = bytearray()
+            self.history_start = array("Q", [0] * (len(self.match_ids) + 1))
+        self.rows = {match_id: row for row, match_id in enumerate(self.match_ids)}
+        self.player_ids = {player: pid for pid, player in enumerate(self.players)}
+
+    def __contains__(self, match_id: object) -> bool:
+        """checks whether a match is stored"""
+        return match_id in self.rows
+
+    def __len__(self) -> int:
+        """counts stored matches"""
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[str]:
+        """iterates over stored match ids"""
+        return iter(self.rows)
+
+    def add(self, match: Match) -> None:
+        """stores a completed match"""
+        if match.current_set is not None or not match.winner:
+            raise ValueError(f"Match {match.match_id} is not completed")
+        sets = [
+            (
+                set_obj.games.player_one,
+                set_obj.games.player_two,
+                set_obj.current_game.points.player_one,
+                set_obj.current_game.points.player_two,
+            )
+            for set_obj in match.completed_sets
+        ]
+        self.add_sets(
+            match.match_id, match.player_one, match.player_two, sets, match.history
+        )
+
+    def add_sets(
+        self,
+        match_id: str,
+        player_one: str,
+        player_two: str,
+        sets: List[SetValues],
+        history: Optional[PointHistory] = None,
+    ) -> None:
+        """stores a completed match given as the values of its sets"""
+        self.remove(match_id)
+        serialized = history.to_bytes() if history is not None else b""
+        self._add_row(match_id, player_one, player_two, sets, serialized)
+
+    def remove(self, match_id: str) -> None:
+        """drops a stored match, if present, rebuilding once too many are dead"""
+        if self.rows.pop(match_id, None) is None:
+            return
+        dead = len(self.match_ids) - len(self.rows)
+        if dead >= MIN_DEAD_ROWS and dead > MAX_DEAD_FRACTION * len(self.match_ids):
+            vars(self).update(vars(self._rebuilt()))
+
+    def get_players(self, match_id: str) -> Tuple[str, str]:
+        """returns the players of a stored match"""
+        row = self.rows[match_id]
+        return self.players[self.player_one[row]], self.players[self.player_two[row]]
+
+    def set_scores(self, match_id: str) -> List[Tuple[int, int]]:
+        """returns the games won by each side in every set"""
+        sets = range(*self._set_range(self.rows[match_id]))
+        return [(self.set_games_one[i], self.set_games_two[i]) for i in sets]
+
+    def sets_score(self, match_id: str) -> Tuple[int, int]:
+        """returns the sets won by each side"""
+        scores = self.set_scores(match_id)
+        sets_one = sum(1 for games_one, games_two in scores if games_one > games_two)
+        return sets_one, len(scores) - sets_one
+
+    def winner(self, match_id: str) -> str:
+        """returns the winner of a stored match"""
+        sets_one, sets_two = self.sets_score(match_id)
+        player_one, player_two = self.get_players(match_id)
+        return player_one if sets_one > sets_two else player_two
+
+    def games_score(self, match_id: str) -> Tuple[int, int]:
+        """returns total games won by player one and player two"""
+        scores = self.set_scores(match_id)
+        return sum(one for one, _ in scores), sum(two for _, two in scores)
+
+    def score_display(self, match_id: str) -> str:
+        """generates the same score display as Match.score_display"""
+        return ", ".join(f"{one}-{two}" for one, two in self.set_scores(match_id))
+
+    def to_match(self, match_id: str) -> Match:
+        """rebuilds the full Match object of a stored match"""
+        row = self.rows[match_id]
+        player_one, player_two, sets, history = self._row_values(row)
+        match = Match(match_id, player_one, player_two)
+        match.history = PointHistory.from_bytes(history) if history else None
+        for games_one, games_two, points_one, points_two in sets:
+            add_completed_set(match, (games_one, games_two), (points_one, points_two))
+        match._complete_match(self.winner(match_id))
+        return match
+
+    def _rebuilt(self) -> "CompactMatches":
+        """copies the live rows into new columns, in storage order"""
+        rebuilt = CompactMatches()
+        for match_id, row in self.rows.items():
+            rebuilt._add_row(match_id, *self._row_values(row))
+        return rebuilt
+
+    def _add_row(
+        self,
+        match_id: str,
+        player_one: str,
+        player_two: str,
+        sets: List[SetValues],
+        history: bytes,
+    ) -> None:
+        """appends a row to the columns"""
+        self.rows[match_id] = len(self.match_ids)
+        self.match_ids.append(match_id)
+        self.player_one.append(self._intern(player_one))
+        self.player_two.append(self._intern(player_two))
+        for games_one, games_two, points_one, points_two in sets:
+            self.set_games_one.append(games_one)
+            self.set_games_two.append(games_two)
+            self.final_points_one.append(points_one)
+            self.final_points_two.append(points_two)
+        self.set_start.append(len(self.set_games_one))
+        self.history += history
+        self.history_start.append(len(self.history))
+
+    def _row_values(self, row: int) -> Tuple[str, str, List[SetValues], bytes]:
+        """reads a row back as players, per-set values and serialized history"""
+        sets = [
+            (
+                self.set_games_one[i],
+                self.set_games_two[i],
+                self.final_points_one[i],
+                self.final_points_two[i],
+            )
+            for i in range(*self._set_range(row))
+        ]
+        player_one = self.players[self.player_one[row]]
+        player_two = self.players[self.player_two[row]]
+        history = bytes(
+            self.history[self.history_start[row] : self.history_start[row + 1]]
+        )
+        return player_one, player_two, sets, history
+
+    def _set_range(self, row: int) -> Tuple[int, int]:
+        """returns the set column slice of a row"""
+        return self.set_start[row], self.set_start[row + 1]
+
+    def _intern(self, player: str) -> int:
+        """returns the id of a player name, assigning one if needed"""
+        player_id = self.player_ids.get(player)
+        if player_id is None:
+            player_id = self.player_ids[player] = len(self.players)
+            self.players.append(player)
+        return player_id
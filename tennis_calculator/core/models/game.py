@@ -15,8 +15,10 @@ from tennis_calculator.core.rules import (
 )
 from tennis_calculator.core.models.points import PlayerPoints
 from tennis_calculator.core.exceptions import InvalidPlayerNumberException
+from tennis_calculator.core.models.slotted import slotted
 
 
+@slotted
 @dataclass
 class Game:
     """represents a tennis game with scoring and state tracking"""
@@ -0,0 +1,126 @@
+"""handles the point sequence of a match and periodic score checkpoints
+
+Points are stored one bit each, clear for player one and set for player
+two, in the order they were played. After every CHECKPOINT_INTERVAL points
+the score reached is stored as a checkpoint, so the score after any point
+can be rebuilt by replaying at most CHECKPOINT_INTERVAL points from the
+checkpoint before it.
+"""
+
+import struct
+from typing import Tuple
+from tennis_calculator.core.rules import PLAYER_TWO
+
+CHECKPOINT_INTERVAL = 32
+# sets and games won by each side, then each side's points in the current game
+CHECKPOINT = struct.Struct("<BBBBHH")
+POINT_COUNT = struct.Struct("<I")
+
+# Player numbers to the binary digits of their bits, and back
+_PLAYER_DIGITS = bytes.maketrans(b"\x01\x02", b"01")
+_DIGIT_PLAYERS = bytes.maketrans(b"01", b"\x01\x02")
+
+CheckpointValues = Tuple[int, int, int, int, int, int]
+
+
+class PointHistory:
+    """stores the points of a match as bits alongside score checkpoints"""
+
+    __slots__ = ("bits", "length", "checkpoints")
+
+    def __init__(self) -> None:
+        """initializes an empty history"""
+        self.bits = bytearray()
+        self.length = 0
+        self.checkpoints = bytearray()
+
+    def __len__(self) -> int:
+        """counts recorded points"""
+        return self.length
+
+    def __eq__(self, other: object) -> bool:
+        """compares recorded points and checkpoints"""
+        if not isinstance(other, PointHistory):
+            return NotImplemented
+        return self.to_bytes() == other.to_bytes()
+
+    def __getstate__(self):
+        """Return state for pickling."""
+        return self.to_bytes()
+
+    def __setstate__(self, state):
+        """Set state when unpickling."""
+        self._restore(state)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PointHistory":
+        """restores a history serialized with to_bytes"""
+        history = cls.__new__(cls)
+        history._restore(data)
+        return history
+
+    def to_bytes(self) -> bytes:
+        """serializes the point count, point bits and checkpoints"""
+        return POINT_COUNT.pack(self.length) + self.bits + self.checkpoints
+
+    def _restore(self, data: bytes) -> None:
+        """reads the fields written by to_bytes"""
+        (self.length,) = POINT_COUNT.unpack_from(data)
+        end = POINT_COUNT.size + (self.length + 7) // 8
+        self.bits = bytearray(data[POINT_COUNT.size : end])
+        self.checkpoints = bytearray(data[end:])
+
+    def append(self, player_number: int) -> None:
+        """records the player number of one point"""
+        byte, bit = divmod(self.length, 8)
+        if not bit:
+            self.bits.append(0)
+        if player_number == PLAYER_TWO:
+            self.bits[byte] |= 1 << bit
+        self.length += 1
+
+    def extend(self, players: bytes) -> None:
+        """records a buffer of player numbers"""
+        players = bytes(players)
+        unaligned = -self.length % 8
+        for player_number in players[:unaligned]:
+            self.append(player_number)
+        aligned = players[unaligned:]
+        if aligned:
+            # Reversed so the first point becomes the lowest bit
+            digits = aligned.translate(_PLAYER_DIGITS)[::-1]
+            self.bits += int(digits, 2).to_bytes((len(aligned) + 7) // 8, "little")
+            self.length += len(aligned)
+
+    def truncate(self, length: int) -> None:
+        """drops the points after the first length, and their checkpoints"""
+        if length >= self.length:
+            return
+        del self.bits[(length + 7) // 8 :]
+        if length % 8:
+            self.bits[-1] &= (1 << length % 8) - 1
+        del self.checkpoints[length // CHECKPOINT_INTERVAL * CHECKPOINT.size :]
+        self.length = length
+
+    def points(self, start: int, stop: int) -> bytes:
+        """returns the player numbers of points start up to stop"""
+        count = stop - start
+        if count <= 0:
+            return b""
+        first = start // 8
+        value = int.from_bytes(self.bits[first : (stop + 7) // 8], "little")
+        value = (value >> (start - first * 8)) & ((1 << count) - 1)
+        digits = f"{value:0{count}b}"[::-1].encode("ascii")
+        return digits.translate(_DIGIT_PLAYERS)
+
+    def checkpoint_count(self) -> int:
+        """counts stored checkpoints"""
+        return len(self.checkpoints) // CHECKPOINT.size
+
+    def add_checkpoint(self, *values: int) -> None:
+        """stores the score reached after the latest interval of points"""
+        self.checkpoints += CHECKPOINT.pack(*values)
+
+    def checkpoint(self, index: int) -> CheckpointValues:
+        """returns the score after (index + 1) * CHECKPOINT_INTERVAL points"""
+        return CHECKPOINT.unpack_from(self.checkpoints, index * CHECKPOINT.size)
@@ -1,24 +1,38 @@
 """handles tennis match scoring and state management"""
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 from tennis_calculator.core.rules import (
     PLAYER_ONE,
     PLAYER_TWO,
     SETS_TO_WIN_MATCH,
+    GAMES_FOR_TIEBREAK,
     GAME,
     POINT_NAMES,
     MATCH_NOT_STARTED,
 )
 from tennis_calculator.core.exceptions import (
     PlayerNotFoundException,
+    PointNotFoundException,
     MatchCompletedException,
     InvalidPlayerNumberException,
 )
-from tennis_calculator.core.models.set import Set
+from tennis_calculator.core.models.game import Game
+from tennis_calculator.core.models.history import (
+    CHECKPOINT,
+    CHECKPOINT_INTERVAL,
+    CheckpointValues,
+    PointHistory,
+)
+from tennis_calculator.core.models.set import Set, TiebreakGame
 from tennis_calculator.core.models.points import PlayerPoints
+from tennis_calculator.core.models.slotted import slotted
+
+# Number of latest points that can be undone
+UNDO_LIMIT = 64
 
 
+@slotted
 @dataclass
 class Match:
     """represents a tennis match with scoring and state tracking"""
@@ -31,6 +45,19 @@ class Match:
     winner: Optional[str] = field(init=False, default=None)
     sets_score: PlayerPoints = field(init=False, default_factory=PlayerPoints)
     result: Optional[Tuple[int, int]] = field(init=False, default=None)
+    # None when the points were not recorded, e.g. for matches saved earlier
+    history: Optional[PointHistory] = field(
+        init=False, default_factory=PointHistory, repr=False, compare=False
+    )
+    # Scores before the latest live points, packed as history checkpoints.
+    # Created by the first recorded point and dropped when the match is
+    # completed or pickled; undo then replays the point history instead
+    undo_log: Optional[bytearray] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    listeners: List[Callable[["Match"], None]] = field(
+        init=False, default_factory=list, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         """initializes match with first set"""
@@ -46,7 +73,8 @@ class Match:
             'completed_sets': self.completed_sets,
             'winner': self.winner,
             'sets_score': self.sets_score,
-            'result': self.result
+            'result': self.result,
+            'history': self.history,
         }
 
     def __setstate__(self, state):
@@ -59,6 +87,25 @@ class Match:
         self.winner = state['winner']
         self.sets_score = state['sets_score']
         self.result = state['result']
+        self.history = state.get('history')
+        self.undo_log = None
+        self.listeners = []
+
+    def add_listener(self, listener: Callable[["Match"], None]) -> None:
+        """registers a callback run after every change to the match score
+
+        Listeners are not pickled; owners re-register them after loading.
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[["Match"], None]) -> None:
+        """unregisters a score change callback"""
+        self.listeners.remove(listener)
+
+    def _notify_listeners(self) -> None:
+        """runs score change callbacks"""
+        for listener in self.listeners:
+            listener(self)
 
     def validate_player_number(self, player_number: int) -> None:
         """validates if player number is valid"""
@@ -82,9 +129,110 @@ class Match:
         if not self.current_set:
             raise MatchCompletedException("Match is already completed")
 
+        if self.undo_log is None:
+            self.undo_log = bytearray()
+        elif len(self.undo_log) == UNDO_LIMIT * CHECKPOINT.size:
+            del self.undo_log[: CHECKPOINT.size]
+        self.undo_log += CHECKPOINT.pack(*self.checkpoint_values())
+        self._score_point(player_number)
+        if self.listeners:
+            self._notify_listeners()
+
+    def _score_point(self, player_number: int) -> None:
+        """applies a validated point to the score and history"""
         self.current_set.record_point(player_number)
         if self.current_set.winner:
             self._handle_set_completion()
+        if self.history is not None:
+            self._record_history(player_number)
+
+    def _record_history(self, player_number: int) -> None:
+        """appends a point to the history, checkpointing every interval"""
+        self.history.append(player_number)
+        if len(self.history) % CHECKPOINT_INTERVAL == 0:
+            self.history.add_checkpoint(*self.checkpoint_values())
+
+    def undo_last_point(self, count: int = 1) -> None:
+        """takes back the latest points, restoring the score before them
+
+        Up to UNDO_LIMIT points can be undone. While the match is live the
+        score before each of them is kept, so undoing costs the same however
+        long the match has run. Completed or reloaded matches no longer keep
+        those scores and replay their point history from its last checkpoint
+        instead.
+
+        Raises:
+            PointNotFoundException: If fewer than count points can be undone
+        """
+        undo_log = self.undo_log or bytearray()
+        logged = len(undo_log) // CHECKPOINT.size
+        undoable = logged
+        if self.history is not None:
+            undoable = min(len(self.history), UNDO_LIMIT)
+        if not 0 <= count <= undoable:
+            raise PointNotFoundException(
+                f"Only {undoable} points of match {self.match_id} can be undone"
+            )
+        if not count:
+            return
+        if count <= logged:
+            start = (logged - count) * CHECKPOINT.size
+            self._restore_score(CHECKPOINT.unpack_from(undo_log, start))
+            del undo_log[start:]
+            if self.history is not None:
+                self.history.truncate(len(self.history) - count)
+        else:
+            self.undo_log = None
+            self._replay_history(len(self.history) - count)
+        if self.listeners:
+            self._notify_listeners()
+
+    def _replay_history(self, points: int) -> None:
+        """rebuilds the score after the first points of the history"""
+        history = self.history
+        interval = min(points // CHECKPOINT_INTERVAL, history.checkpoint_count())
+        start = interval * CHECKPOINT_INTERVAL
+        replayed = history.points(start, points)
+        history.truncate(start)
+        self._restore_score(
+            history.checkpoint(interval - 1) if interval else (0, 0, 0, 0, 0, 0)
+        )
+        for player_number in replayed:
+            self._score_point(player_number)
+
+    def _restore_score(self, values: CheckpointValues) -> None:
+        """sets the score back to values taken by checkpoint_values"""
+        sets_one, sets_two, games_one, games_two, points_one, points_two = values
+        while len(self.completed_sets) > sets_one + sets_two:
+            self.current_set = self.completed_sets.pop()
+            self.current_set.winner = None
+        self.sets_score.player_one, self.sets_score.player_two = sets_one, sets_two
+        self.winner = None
+        self.result = None
+
+        current_set = self.current_set
+        current_set.games.player_one = games_one
+        current_set.games.player_two = games_two
+        current_set.is_tiebreak = games_one == games_two == GAMES_FOR_TIEBREAK
+        game_class = TiebreakGame if current_set.is_tiebreak else Game
+        current_set.current_game = game_class(self.player_one, self.player_two)
+        current_set.current_game.points.player_one = points_one
+        current_set.current_game.points.player_two = points_two
+
+    def checkpoint_values(self) -> CheckpointValues:
+        """returns sets, games and current game points won by each side"""
+        if self.current_set is None:
+            return self.sets_score.player_one, self.sets_score.player_two, 0, 0, 0, 0
+        games = self.current_set.games
+        points = self.current_set.current_game.points
+        return (
+            self.sets_score.player_one,
+            self.sets_score.player_two,
+            games.player_one,
+            games.player_two,
+            points.player_one,
+            points.player_two,
+        )
 
     def _handle_set_completion(self) -> None:
         """processes set completion and updates match state"""
@@ -109,6 +257,7 @@ class Match:
         self.winner = winner
         self.result = (self.sets_score.player_one, self.sets_score.player_two)
         self.current_set = None
+        self.undo_log = None
 
     def _is_not_started_display(self) -> bool:
         """checks if match has any points played"""
@@ -159,6 +308,12 @@ class Match:
 
         return completed_won + current_won, completed_lost + current_lost
 
+    def games_score(self) -> Tuple[int, int]:
+        """returns total games won by player one and player two"""
+        completed_one, completed_two = self._completed_sets_games(True)
+        current_one, current_two = self._current_set_games(True)
+        return completed_one + current_one, completed_two + current_two
+
     def _completed_sets_games(self, is_player_one: bool) -> Tuple[int, int]:
         """calculates games won and lost in completed sets"""
         won = sum(
@@ -196,6 +351,9 @@ class Match:
         self.current_set = Set(self.player_one, self.player_two)
         self.sets_score.reset()
         self.winner = None
+        self.history = PointHistory()
+        self.undo_log = None
+        self._notify_listeners()
 
     def sets_won_by(self, player_number: int) -> int:
         """retrieves number of sets won by player"""
@@ -1,8 +1,10 @@
 """handles tennis point tracking"""
 
 from dataclasses import dataclass
+from tennis_calculator.core.models.slotted import slotted
 
 
+@slotted
 @dataclass
 class PlayerPoints:
     """represents points for two players"""
@@ -11,8 +11,10 @@ from tennis_calculator.core.rules import (
 )
 from tennis_calculator.core.models.game import Game
 from tennis_calculator.core.models.points import PlayerPoints
+from tennis_calculator.core.models.slotted import slotted
 
 
+@slotted
 @dataclass
 class Set:
     """represents a tennis set with scoring and state tracking"""
@@ -103,6 +105,8 @@ class Set:
 class TiebreakGame(Game):
     """represents a tiebreak game in tennis"""
 
+    __slots__ = ()
+
     def _has_winner(self) -> bool:
         """checks if current points state indicates a winner"""
         points_diff = abs(self.points.player_one - self.points.player_two)
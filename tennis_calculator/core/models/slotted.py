@@ -0,0 +1,42 @@
+"""adds __slots__ to dataclasses on Python versions without slots=True"""
+
+import functools
+from dataclasses import MISSING, fields
+from typing import Any, Type, TypeVar
+
+T = TypeVar("T")
+
+
+def slotted(cls: Type[T]) -> Type[T]:
+    """recreates a dataclass with __slots__ for its fields
+
+    Defaults of init fields already live in the generated __init__, so the
+    class attributes holding them can be replaced by slot descriptors.
+    Fields declared with init=False and a plain default relied on those
+    class attributes, so they are assigned before __init__ runs instead.
+    """
+    field_names = tuple(field.name for field in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in field_names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = field_names
+
+    class_defaults = {
+        field.name: field.default
+        for field in fields(cls)
+        if not field.init and field.default is not MISSING
+    }
+    if class_defaults:
+        init = namespace["__init__"]
+
+        @functools.wraps(init)
+        def __init__(self: Any, *args: Any, **kwargs: Any) -> None:
+            for name, value in class_defaults.items():
+                setattr(self, name, value)
+            init(self, *args, **kwargs)
+
+        namespace["__init__"] = __init__
+
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
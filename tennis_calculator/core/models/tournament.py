@@ -1,29 +1,105 @@
 """handles tennis tournament management and scoring"""
 
-from typing import Dict, List, Optional, Tuple
+import itertools
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from tennis_calculator.core.concurrency import ReadWriteLock
 from tennis_calculator.core.rules import MATCH_NOT_STARTED
 from tennis_calculator.core.exceptions import (
     MatchNotFoundException,
     PlayerNotFoundException,
     DuplicateMatchException,
 )
+from tennis_calculator.core.models.compact import CompactMatches, SetValues
+from tennis_calculator.core.models.history import PointHistory
 from tennis_calculator.core.models.match import Match
 
+# Numbers each created or loaded tournament, see Tournament.generation
+_GENERATIONS = itertools.count()
+
 
 class Tournament:
-    """represents a tennis tournament with match tracking"""
+    """represents a tennis tournament with match tracking
+
+    Besides the matches, the tournament keeps a player to match id index and
+    running games won/lost totals per player. Totals are updated when a
+    match is added or replaced and, through a match listener, whenever a
+    point is recorded, so player queries never scan the matches.
+
+    Matches added or changed since the last call to pop_dirty_matches are
+    tracked so stores can persist only what a run touched. Score listeners
+    registered on the tournament run after every change to any match it
+    holds as an object. match_version and player_version count the changes
+    to each match's score and each player's games, so callers caching
+    answers can tell which ones are stale. They restart on every load, so
+    callers caching answers across tournaments also compare generation,
+    which differs for every created or loaded tournament.
+
+    compact moves completed matches out of matches into columnar storage;
+    get_match rebuilds a Match object for them only when asked.
+
+    Changes hold the write side of lock and lookups its read side, so
+    queries may run on other threads while points are recorded. Callers
+    that read a returned Match, as QueryProcessor does, hold the read side
+    until they are done with it so they never see a half-recorded point.
+    """
 
     def __init__(self) -> None:
         """initializes tournament"""
         self.matches: Dict[str, Match] = {}
+        self.compacted = CompactMatches()
+        self.lock = ReadWriteLock()
+        self._init_indexes()
 
     def __getstate__(self):
         """Return state for pickling."""
-        return self.matches
+        return self.matches, self.compacted
 
     def __setstate__(self, state):
         """Set state when unpickling."""
-        self.matches = state
+        # Tournaments pickled before compaction existed hold only matches
+        if isinstance(state, dict):
+            state = state, CompactMatches()
+        self.matches, self.compacted = state
+        self.lock = ReadWriteLock()
+        self._init_indexes()
+        for match in self.matches.values():
+            self._index_match(match)
+        for match_id in self.compacted:
+            player_one, player_two = self.compacted.get_players(match_id)
+            self._index_players(match_id, player_one, player_two)
+            games_one, games_two = self.compacted.games_score(match_id)
+            self._add_games(player_one, player_two, games_one, games_two)
+        self._dirty.clear()
+
+    def _init_indexes(self) -> None:
+        """creates empty player indexes"""
+        self._player_matches: Dict[str, Dict[str, None]] = {}
+        self._player_games: Dict[str, List[int]] = {}
+        self._match_games: Dict[str, Tuple[int, int]] = {}
+        self._dirty: Dict[str, None] = {}
+        self._match_versions: Dict[str, int] = {}
+        self._player_versions: Dict[str, int] = {}
+        self._score_listeners: List[Callable[[Match], None]] = []
+        self.generation = next(_GENERATIONS)
+
+    def add_score_listener(self, listener: Callable[[Match], None]) -> None:
+        """registers a callback run after every score change of any match
+
+        Listeners are not pickled; owners re-register them after loading.
+        """
+        self._score_listeners.append(listener)
+
+    def remove_score_listener(self, listener: Callable[[Match], None]) -> None:
+        """unregisters a score change callback"""
+        self._score_listeners.remove(listener)
+
+    def match_version(self, match_id: str) -> int:
+        """counts the changes to a match's score since the tournament loaded"""
+        return self._match_versions.get(match_id, 0)
+
+    def player_version(self, player_name: str) -> int:
+        """counts the changes to a player's games since the tournament loaded"""
+        return self._player_versions.get(player_name, 0)
 
     def add_match(self, match: Match, overwrite: bool = False) -> None:
         """adds match to tournament
@@ -32,53 +108,222 @@ class Tournament:
             match: Match object to add
             overwrite: If True, overwrites existing match with same ID
         """
-        if match.match_id in self.matches and not overwrite:
-            raise DuplicateMatchException(f"Match {match.match_id} already exists")
+        with self.lock.writing:
+            self._add_match(match, overwrite)
+
+    def _add_match(self, match: Match, overwrite: bool) -> None:
+        """adds match to tournament, the caller holds the lock"""
+        if self._in_memory(match.match_id):
+            if not overwrite:
+                raise DuplicateMatchException(f"Match {match.match_id} already exists")
+            self._unindex_match(match.match_id)
         self.matches[match.match_id] = match
+        self._index_match(match)
+        # Games may be unchanged, but the players gained a match
+        self._bump_players(match.player_one, match.player_two)
+
+    def add_completed_match(
+        self,
+        match_id: str,
+        player_one: str,
+        player_two: str,
+        sets: List[SetValues],
+        overwrite: bool = False,
+        history: Optional[PointHistory] = None,
+    ) -> None:
+        """adds a completed match straight into columnar storage
+
+        Args:
+            match_id: Match identifier
+            player_one: Name of the first player
+            player_two: Name of the second player
+            sets: Games won by each side and the points of each side in the
+                final game, for every set
+            overwrite: If True, overwrites existing match with same ID
+            history: Points of the match, if they were recorded
+        """
+        with self.lock.writing:
+            if self._in_memory(match_id):
+                if not overwrite:
+                    raise DuplicateMatchException(f"Match {match_id} already exists")
+                self._unindex_match(match_id)
+                self.matches.pop(match_id, None)
+            self.compacted.add_sets(match_id, player_one, player_two, sets, history)
+            self._index_players(match_id, player_one, player_two)
+            games_one, games_two = self.compacted.games_score(match_id)
+            self._add_games(player_one, player_two, games_one, games_two)
+            self._dirty[match_id] = None
+            self._bump_match(match_id)
+
+    def _in_memory(self, match_id: str) -> bool:
+        """checks whether a match is held, as an object or compacted"""
+        return match_id in self.matches or match_id in self.compacted
+
+    def _index_match(self, match: Match) -> None:
+        """adds match to the player indexes and starts tracking its games"""
+        self._index_players(match.match_id, match.player_one, match.player_two)
+        self._match_games[match.match_id] = (0, 0)
+        self._update_games(match)
+        match.add_listener(self._update_games)
+
+    def _index_players(self, match_id: str, player_one: str, player_two: str) -> None:
+        """adds a match to the player indexes"""
+        for player in (player_one, player_two):
+            self._player_matches.setdefault(player, {})[match_id] = None
+            self._player_games.setdefault(player, [0, 0])
+
+    def _unindex_match(self, match_id: str) -> None:
+        """removes match from the player indexes and its games from totals"""
+        match = self.matches.get(match_id)
+        if match is not None:
+            match.remove_listener(self._update_games)
+            player_one, player_two = match.player_one, match.player_two
+            games_one, games_two = self._match_games.pop(match_id)
+        else:
+            player_one, player_two = self.compacted.get_players(match_id)
+            games_one, games_two = self.compacted.games_score(match_id)
+            self.compacted.remove(match_id)
+        self._bump_match(match_id)
+        self._add_games(player_one, player_two, -games_one, -games_two)
+        for player in (player_one, player_two):
+            player_matches = self._player_matches[player]
+            player_matches.pop(match_id, None)
+            if not player_matches:
+                del self._player_matches[player]
+                del self._player_games[player]
+
+    def _update_games(self, match: Match) -> None:
+        """applies the change in a match's games to the player totals"""
+        if self.matches.get(match.match_id) is not match:
+            return
+        self._dirty[match.match_id] = None
+        self._bump_match(match.match_id)
+        games_one, games_two = match.games_score()
+        counted_one, counted_two = self._match_games[match.match_id]
+        if (games_one, games_two) != (counted_one, counted_two):
+            self._match_games[match.match_id] = (games_one, games_two)
+            self._add_games(
+                match.player_one,
+                match.player_two,
+                games_one - counted_one,
+                games_two - counted_two,
+            )
+        for listener in self._score_listeners:
+            listener(match)
+
+    def _add_games(
+        self, player_one: str, player_two: str, games_one: int, games_two: int
+    ) -> None:
+        """adds games won by each side of a match to the player totals"""
+        self._bump_players(player_one, player_two)
+        player_one_games = self._player_games[player_one]
+        player_one_games[0] += games_one
+        player_one_games[1] += games_two
+        player_two_games = self._player_games[player_two]
+        player_two_games[0] += games_two
+        player_two_games[1] += games_one
+
+    def _bump_players(self, *players: str) -> None:
+        """records a change to players' games or matches"""
+        player_versions = self._player_versions
+        for player in players:
+            player_versions[player] = player_versions.get(player, 0) + 1
+
+    def _bump_match(self, match_id: str) -> None:
+        """records a change to a match's score"""
+        self._match_versions[match_id] = self._match_versions.get(match_id, 0) + 1
+
+    def compact(self) -> int:
+        """moves completed matches into columnar storage
+
+        Returns:
+            Number of matches compacted
+        """
+        with self.lock.writing:
+            completed = [match for match in self.matches.values() if match.winner]
+            for match in completed:
+                match.remove_listener(self._update_games)
+                del self.matches[match.match_id]
+                del self._match_games[match.match_id]
+                self.compacted.add(match)
+            return len(completed)
+
+    def iter_matches(self) -> Iterator[Match]:
+        """yields every match, rebuilding compacted ones"""
+        yield from self.matches.values()
+        for match_id in list(self.compacted):
+            yield self.compacted.to_match(match_id)
+
+    def pop_dirty_matches(self) -> List[Match]:
+        """returns matches added or changed since the last call, in order"""
+        with self.lock.writing:
+            dirty = [self.get_match(match_id) for match_id in self._dirty]
+            self._dirty.clear()
+            return dirty
 
     def get_match(self, match_id: str) -> Match:
-        """retrieves match by id"""
-        if match_id not in self.matches:
+        """retrieves match by id, rebuilding it if it was compacted"""
+        with self.lock.reading:
+            match = self.matches.get(match_id)
+            if match is not None:
+                return match
+            if match_id in self.compacted:
+                return self.compacted.to_match(match_id)
             raise MatchNotFoundException(f"Match {match_id} not found")
-        return self.matches[match_id]
 
     def record_match_point(self, match_id: str, player_number: int) -> None:
         """records point for a player in specified match"""
-        match = self.get_match(match_id)
-        match.record_point(player_number)
+        with self.lock.writing:
+            match = self.matches.get(match_id) or self.get_match(match_id)
+            match.record_point(player_number)
+
+    def undo_last_point(self, match_id: str, count: int = 1) -> None:
+        """takes back the latest points of a match
+
+        Player totals are rolled back through the match listener. A
+        compacted match is first restored to a live Match object, since the
+        one get_match rebuilds for it is a copy.
+
+        Args:
+            match_id: Match identifier
+            count: Number of points to take back
+        """
+        with self.lock.writing:
+            if match_id in self.compacted:
+                self._restore_compacted(match_id)
+            self.get_match(match_id).undo_last_point(count)
+
+    def _restore_compacted(self, match_id: str) -> None:
+        """moves a compacted match back into matches, keeping player totals"""
+        match = self.compacted.to_match(match_id)
+        self.compacted.remove(match_id)
+        self.matches[match_id] = match
+        # Its games are already counted in the player totals
+        self._match_games[match_id] = match.games_score()
+        match.add_listener(self._update_games)
 
     def get_player_games(self, player_name: str) -> Tuple[int, int]:
         """retrieves total games won and lost for player"""
-        if not any(
-            player_name in (match.player_one, match.player_two)
-            for match in self.matches.values()
-        ):
-            raise PlayerNotFoundException(f"Player {player_name} not found")
-
-        total_won = 0
-        total_lost = 0
-        for match in self.matches.values():
-            if player_name in (match.player_one, match.player_two):
-                won, lost = match.games_summary(player_name)
-                total_won += won
-                total_lost += lost
-
-        return total_won, total_lost
+        with self.lock.reading:
+            games: Optional[List[int]] = self._player_games.get(player_name)
+            if games is None:
+                raise PlayerNotFoundException(f"Player {player_name} not found")
+            return games[0], games[1]
 
     def get_match_score(self, match_id: str) -> str:
         """retrieves formatted score for match"""
-        match = self.get_match(match_id)
-        if match._is_not_started_display():
-            return MATCH_NOT_STARTED
-        return match.score_display()
+        with self.lock.reading:
+            if match_id in self.compacted:
+                return self.compacted.score_display(match_id)
+            match = self.get_match(match_id)
+            if match._is_not_started_display():
+                return MATCH_NOT_STARTED
+            return match.score_display()
 
     def get_player_matches(self, player_name: str) -> List[Match]:
         """retrieves all matches for player"""
-        matches = [
-            match
-            for match in self.matches.values()
-            if player_name in (match.player_one, match.player_two)
-        ]
-        if not matches:
-            raise PlayerNotFoundException(f"Player {player_name} not found")
-        return matches
+        with self.lock.reading:
+            match_ids = self._player_matches.get(player_name)
+            if not match_ids:
+                raise PlayerNotFoundException(f"Player {player_name} not found")
+            return [self.get_match(match_id) for match_id in match_ids]
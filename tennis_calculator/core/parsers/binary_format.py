@@ -0,0 +1,306 @@
+"""Compact binary point-stream format for archived match data.
+
+Layout, all integers little endian::
+
+    file header   magic "TCPB", version (u8), 3 pad bytes,
+                  match count (u32), player count (u32)
+    index         sections, each a typecode byte, a byte length (u64) and
+                  the raw data: player names and match ids as NUL-separated
+                  UTF-8, then per-match player one and player two indexes
+                  into the names, point counts and the points offset table
+    data section  per match: points packed 8 per byte, least significant bit
+                  first, a set bit meaning the point went to player two
+
+Integer sections use the narrowest array typecode that fits their values,
+so the index of a typical tournament costs a few bytes per match.
+"""
+
+import array
+import mmap
+import shutil
+import struct
+import sys
+import tempfile
+from typing import BinaryIO, Dict, Iterator, List, Sequence, Tuple
+from tennis_calculator.core.rules import PLAYER_ONE, PLAYER_TWO
+from tennis_calculator.core.exceptions import InvalidMatchFormatException
+from tennis_calculator.core.parsers.byte_scanner import (
+    POINT_BYTES,
+    ByteMatchScanner,
+    RawMatch,
+)
+from tennis_calculator.core.scoring.bulk import buffer_to_players
+
+MAGIC = b"TCPB"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sB3xII")
+SECTION_HEADER = struct.Struct("<cQ")
+INTEGER_TYPECODES = "BHIQ"
+TEXT_TYPECODE = b"s"
+TEXT_SEPARATOR = b"\0"
+
+# Player numbers to bit characters, and bit characters to ASCII point values
+_PLAYERS_TO_BITS = bytes.maketrans(bytes([PLAYER_ONE, PLAYER_TWO]), b"01")
+_BITS_TO_POINTS = bytes.maketrans(b"01", b"".join(POINT_BYTES))
+
+
+def pack_points(points: bytes) -> bytes:
+    """Pack a buffer of point values into bits.
+
+    Args:
+        points: One point value per byte, as accepted by ``buffer_to_players``.
+
+    Returns:
+        Packed points, least significant bit first.
+    """
+    if not points:
+        return b""
+    bits = buffer_to_players(points).translate(_PLAYERS_TO_BITS)
+    return int(bits[::-1], 2).to_bytes((len(points) + 7) // 8, "little")
+
+
+def unpack_points(packed: bytes, count: int) -> bytes:
+    """Unpack bits into a buffer of ASCII point values.
+
+    Args:
+        packed: Packed points as written by ``pack_points``.
+        count: Number of points in the buffer.
+
+    Returns:
+        One ASCII point value per point.
+    """
+    if not count:
+        return b""
+    bits = format(int.from_bytes(packed, "little"), f"0{count}b").encode()
+    return bits[::-1].translate(_BITS_TO_POINTS)
+
+
+def _integer_section(values: Sequence[int]) -> bytes:
+    """Encode integers with the narrowest typecode that fits them."""
+    largest = max(values, default=0)
+    for typecode in INTEGER_TYPECODES:
+        if largest < 1 << (8 * array.array(typecode).itemsize):
+            break
+    packed = array.array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return SECTION_HEADER.pack(typecode.encode(), len(packed) * packed.itemsize) + (
+        packed.tobytes()
+    )
+
+
+def _text_section(values: Sequence[str]) -> bytes:
+    """Encode strings as one NUL-separated UTF-8 blob."""
+    blob = TEXT_SEPARATOR.join(value.encode() for value in values)
+    return SECTION_HEADER.pack(TEXT_TYPECODE, len(blob)) + blob
+
+
+def _read_section(data: bytes, position: int) -> Tuple[bytes, bytes, int]:
+    """Read a section, returning its typecode, payload and end position."""
+    if position + SECTION_HEADER.size > len(data):
+        raise InvalidMatchFormatException("Binary match file is truncated")
+    typecode, length = SECTION_HEADER.unpack_from(data, position)
+    start = position + SECTION_HEADER.size
+    if start + length > len(data):
+        raise InvalidMatchFormatException("Binary match file is truncated")
+    return typecode, data[start : start + length], start + length
+
+
+def _read_integers(data: bytes, position: int) -> Tuple[array.array, int]:
+    """Read an integer section."""
+    typecode, payload, position = _read_section(data, position)
+    if typecode.decode() not in INTEGER_TYPECODES:
+        raise InvalidMatchFormatException("Corrupt binary match file index")
+    values = array.array(typecode.decode())
+    values.frombytes(payload)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values, position
+
+
+def _read_texts(data: bytes, position: int, count: int) -> Tuple[List[str], int]:
+    """Read a text section holding ``count`` strings."""
+    typecode, payload, position = _read_section(data, position)
+    values = payload.decode().split(TEXT_SEPARATOR.decode()) if count else []
+    if typecode != TEXT_TYPECODE or len(values) != count:
+        raise InvalidMatchFormatException("Corrupt binary match file index")
+    return values, position
+
+
+class BinaryMatchWriter:
+    """Writer for the binary point-stream format.
+
+    Packed points are spooled to a temporary file while the index is
+    collected, and both are written out on ``close``.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initializes the writer.
+
+        Args:
+            path: Output file path.
+        """
+        self.path = path
+        self._players: Dict[str, int] = {}
+        self._match_ids: List[str] = []
+        self._player_one: List[int] = []
+        self._player_two: List[int] = []
+        self._counts: List[int] = []
+        self._offsets: List[int] = []
+        self._data: BinaryIO = tempfile.TemporaryFile()
+        self._data_size = 0
+
+    def __enter__(self) -> "BinaryMatchWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._data.close()
+
+    def add(
+        self, match_id: str, player_one: str, player_two: str, points: bytes
+    ) -> None:
+        """Add one match.
+
+        Args:
+            match_id: Match identifier.
+            player_one: Name of the first player.
+            player_two: Name of the second player.
+            points: One point value per byte.
+        """
+        packed = pack_points(points)
+        self._match_ids.append(match_id)
+        self._player_one.append(self._player_index(player_one))
+        self._player_two.append(self._player_index(player_two))
+        self._counts.append(len(points))
+        self._offsets.append(self._data_size)
+        self._data.write(packed)
+        self._data_size += len(packed)
+
+    def _player_index(self, name: str) -> int:
+        """Intern a player name, returning its position in the names table."""
+        return self._players.setdefault(name, len(self._players))
+
+    def close(self) -> None:
+        """Write header, index and data to the output file."""
+        with open(self.path, "wb") as f:
+            f.write(
+                FILE_HEADER.pack(
+                    MAGIC, VERSION, len(self._match_ids), len(self._players)
+                )
+            )
+            f.write(_text_section(list(self._players)))
+            f.write(_text_section(self._match_ids))
+            for values in (
+                self._player_one,
+                self._player_two,
+                self._counts,
+                self._offsets,
+            ):
+                f.write(_integer_section(values))
+            self._data.seek(0)
+            shutil.copyfileobj(self._data, f)
+        self._data.close()
+
+
+class BinaryMatchReader:
+    """Reader for the binary point-stream format."""
+
+    def __init__(self, data: bytes) -> None:
+        """Initializes the reader and parses the index.
+
+        Args:
+            data: File contents, e.g. an ``mmap`` of the binary file.
+
+        Raises:
+            InvalidMatchFormatException: If the data is not a valid archive.
+        """
+        if len(data) < FILE_HEADER.size:
+            raise InvalidMatchFormatException("Binary match file is truncated")
+        magic, version, count, player_count = FILE_HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise InvalidMatchFormatException("Not a binary match file")
+        if version != VERSION:
+            raise InvalidMatchFormatException(
+                f"Unsupported binary match file version: {version}"
+            )
+        self.data = data
+        self.players, position = _read_texts(data, FILE_HEADER.size, player_count)
+        self.match_ids, position = _read_texts(data, position, count)
+        self.player_one, position = _read_integers(data, position)
+        self.player_two, position = _read_integers(data, position)
+        self.counts, position = _read_integers(data, position)
+        self.offsets, position = _read_integers(data, position)
+        self.data_offset = position
+
+    @staticmethod
+    def is_binary(path: str) -> bool:
+        """Check whether a file starts with the binary format magic."""
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+
+    @classmethod
+    def read_file(cls, path: str) -> Iterator[RawMatch]:
+        """Memory-map a binary file and yield its matches.
+
+        Args:
+            path: Path to the binary file.
+
+        Yields:
+            Matches with ASCII point buffers, in archive order.
+        """
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield from cls(data)
+
+    def __len__(self) -> int:
+        return len(self.match_ids)
+
+    def __iter__(self) -> Iterator[RawMatch]:
+        for number in range(len(self.match_ids)):
+            yield self.read_match(number)
+
+    def read_match(self, number: int) -> RawMatch:
+        """Decode the match at a position in the index."""
+        match_id = self.match_ids[number]
+        count = self.counts[number]
+        start = self.data_offset + self.offsets[number]
+        end = start + (count + 7) // 8
+        if end > len(self.data):
+            raise InvalidMatchFormatException(
+                f"Binary match file is truncated in match {match_id}"
+            )
+        points = unpack_points(self.data[start:end], count)
+        return RawMatch(
+            match_id,
+            self.players[self.player_one[number]],
+            self.players[self.player_two[number]],
+            points,
+            start,
+            0,
+        )
+
+
+def convert_text_to_binary(input_path: str, output_path: str) -> int:
+    """Convert a text match file into the binary format.
+
+    Every point is kept, including points after a match was completed.
+
+    Args:
+        input_path: Text input file.
+        output_path: Binary output file.
+
+    Returns:
+        Number of matches converted.
+
+    Raises:
+        InvalidMatchFormatException: If the text input is invalid.
+    """
+    converted = 0
+    with BinaryMatchWriter(output_path) as writer:
+        for raw in ByteMatchScanner.scan_file(input_path):
+            writer.add(raw.match_id, raw.player_one, raw.player_two, raw.points)
+            converted += 1
+    return converted
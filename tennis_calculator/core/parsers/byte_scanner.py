@@ -0,0 +1,226 @@
+"""Memory-mapped byte-level scanner for tennis match input files."""
+
+import itertools
+import mmap
+import re
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional, Tuple, Union
+from tennis_calculator.core.rules import (
+    POINT_VALUE_PLAYER_ONE,
+    POINT_VALUE_PLAYER_TWO,
+)
+from tennis_calculator.core.exceptions import InvalidMatchFormatException
+from tennis_calculator.core.parsers.match_parser import MatchParser
+
+Buffer = Union[bytes, mmap.mmap]
+
+POINT_BYTES = (
+    str(POINT_VALUE_PLAYER_ONE).encode(),
+    str(POINT_VALUE_PLAYER_TWO).encode(),
+)
+# Whitespace removed from point lines; newlines are kept to check line shape
+INLINE_WHITESPACE = b" \t\r\x0b\x0c"
+HEADER_PATTERN = re.compile(
+    rb"^[ \t\r\x0b\x0c]*" + re.escape(MatchParser.MATCH_HEADER_PREFIX.encode()),
+    re.MULTILINE,
+)
+ADJACENT_POINTS_PATTERN = re.compile(b"[" + b"".join(POINT_BYTES) + b"]{2}")
+# Bytes read at a time when scanning a stream
+STREAM_BLOCK_SIZE = 1 << 20
+
+
+@dataclass
+class RawMatch:
+    """Class representing a scanned match with its points as raw bytes.
+
+    ``offset`` is the byte offset of the match in its source file and
+    ``line`` the line number of its header, or 0 for binary input.
+    """
+
+    match_id: str
+    player_one: str
+    player_two: str
+    points: bytes
+    offset: int
+    line: int
+
+
+class ByteMatchScanner:
+    """Scanner yielding compact per-match point buffers from raw bytes.
+
+    Header and player lines are decoded, but point lines are validated and
+    compacted with whole-block byte operations, so no per-line ``str``
+    objects are created. ``points`` holds one ASCII point value per point.
+    """
+
+    def __init__(self, data: Buffer, offset: int = 0, line: int = 1) -> None:
+        """Initializes the scanner over a bytes-like buffer.
+
+        Args:
+            data: File contents, e.g. an ``mmap`` of the input file.
+            offset: Byte offset of ``data`` within its source, for errors.
+            line: Line number of the first line of ``data``, for errors.
+        """
+        self.data = data
+        self.offset = offset
+        self.first_line = line
+
+    @classmethod
+    def scan_file(cls, path: str) -> Iterator[RawMatch]:
+        """Memory-map a file and scan its matches.
+
+        Args:
+            path: Path to the input file.
+
+        Yields:
+            Scanned matches in file order.
+
+        Raises:
+            InvalidMatchFormatException: If match format is invalid.
+        """
+        with open(path, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty files cannot be mapped
+                return
+            with data:
+                yield from cls(data)
+
+    @classmethod
+    def scan_stream(
+        cls, stream: BinaryIO, block_size: int = STREAM_BLOCK_SIZE
+    ) -> Iterator[RawMatch]:
+        """Scan matches from a binary stream, e.g. a decompressing reader.
+
+        The stream is read in blocks which are cut at the last match header,
+        so only about one block is held in memory at a time.
+
+        Args:
+            stream: Binary file-like object.
+            block_size: Number of bytes to read at a time.
+
+        Yields:
+            Scanned matches in stream order.
+
+        Raises:
+            InvalidMatchFormatException: If match format is invalid.
+        """
+        pending = b""
+        offset = 0
+        line = 1
+        while True:
+            block = stream.read(block_size)
+            pending += block
+            cut = len(pending)
+            if block:
+                headers = [match.start() for match in HEADER_PATTERN.finditer(pending)]
+                # A block ending inside the first match is kept and extended
+                cut = next((start for start in reversed(headers) if start > 0), 0)
+                if not cut:
+                    continue
+            yield from cls(pending[:cut], offset, line)
+            if not block:
+                return
+            offset += cut
+            line += pending.count(b"\n", 0, cut)
+            pending = pending[cut:]
+
+    def __iter__(self) -> Iterator[RawMatch]:
+        """Yield matches block by block.
+
+        Raises:
+            InvalidMatchFormatException: If match format is invalid.
+        """
+        data = self.data
+        headers = (header.start() for header in HEADER_PATTERN.finditer(data))
+        try:
+            starts: Iterator[int] = headers
+            start = next(starts, len(data))
+            if data[:start].strip():
+                # Data before the first header is reported like a malformed match
+                starts = itertools.chain([start], starts)
+                start = 0
+            line = self.first_line
+            previous = 0
+            while start < len(data):
+                end = next(starts, len(data))
+                line += data[previous:start].count(b"\n")
+                previous = start
+                yield self._scan_block(start, end, line)
+                start = end
+        finally:
+            # The regex scanner exports the buffer, which an mmap must not
+            # have when it is closed, even while an error propagates
+            headers.close()
+
+    def _scan_block(self, start: int, end: int, line: int) -> RawMatch:
+        """Scan one block starting at a header line."""
+        data = self.data
+        header, position, header_line = self._next_line(start, end, line)
+        players, position, players_line = self._next_line(
+            position, end, header_line + 1
+        )
+        if header is None or players is None:
+            raise self._error("Match data must have at least 2 lines", start, line)
+        try:
+            match_id, player_one, player_two = MatchParser.parse_match_details(
+                [header, players]
+            )
+        except InvalidMatchFormatException as error:
+            raise self._error(str(error), start, line) from None
+
+        cleaned = data[position:end].translate(None, INLINE_WHITESPACE)
+        if cleaned.translate(None, b"".join(POINT_BYTES) + b"\n") or (
+            ADJACENT_POINTS_PATTERN.search(cleaned)
+        ):
+            raise self._invalid_point(position, end, players_line)
+        return RawMatch(
+            match_id,
+            player_one,
+            player_two,
+            cleaned.translate(None, b"\n"),
+            self.offset + start,
+            line,
+        )
+
+    def _next_line(
+        self, position: int, end: int, line: int
+    ) -> Tuple[Optional[str], int, int]:
+        """Return the next non-empty stripped line, where it ends and its number."""
+        data = self.data
+        while position < end:
+            newline = data.find(b"\n", position, end)
+            line_end = end if newline == -1 else newline + 1
+            text = data[position:line_end].strip()
+            if text:
+                return text.decode(), line_end, line
+            position = line_end
+            line += 1
+        return None, position, line
+
+    def _invalid_point(
+        self, position: int, end: int, line: int
+    ) -> InvalidMatchFormatException:
+        """Locate the first invalid point line of a block and build its error."""
+        data = self.data
+        while position < end:
+            line += 1
+            newline = data.find(b"\n", position, end)
+            line_end = end if newline == -1 else newline + 1
+            value = data[position:line_end].strip()
+            if value and value not in POINT_BYTES:
+                return self._error(
+                    str(MatchParser._invalid_point(value.decode(errors="replace"))),
+                    position,
+                    line,
+                )
+            position = line_end
+        raise AssertionError("block contains no invalid point line")
+
+    def _error(
+        self, message: str, offset: int, line: int
+    ) -> InvalidMatchFormatException:
+        """Build an error carrying the byte offset and line number."""
+        return InvalidMatchFormatException(
+            f"{message} (line {line}, byte offset {self.offset + offset})"
+        )
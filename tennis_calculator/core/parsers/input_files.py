@@ -0,0 +1,117 @@
+"""Input file discovery, decompression and throughput reporting."""
+
+import bz2
+import glob
+import gzip
+import io
+import lzma
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, TextIO
+from tennis_calculator.core.exceptions import TennisCalculatorException
+
+# Leading bytes of each supported compression format, and how to open it
+COMPRESSION_MAGIC: Dict[bytes, Callable[[str], io.BufferedIOBase]] = {
+    b"\x1f\x8b": gzip.open,
+    b"BZh": bz2.open,
+    b"\xfd7zXZ\x00": lzma.open,
+}
+MAGIC_LENGTH = max(len(magic) for magic in COMPRESSION_MAGIC)
+
+
+@dataclass
+class InputReport:
+    """Class representing the ingest statistics of one input file.
+
+    ``size`` is the number of bytes of the file on disk, so throughput of a
+    compressed file is measured against its compressed size. ``discarded``
+    counts points dropped in append mode because their match was completed.
+    """
+
+    path: str
+    matches: int
+    size: int
+    seconds: float
+    discarded: int = 0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        """Input read per second, in megabytes."""
+        return self.size / 1e6 / self.seconds if self.seconds else 0.0
+
+    @property
+    def matches_per_second(self) -> float:
+        """Matches scored per second."""
+        return self.matches / self.seconds if self.seconds else 0.0
+
+    def describe(self) -> str:
+        """Format the statistics as one line of text."""
+        description = (
+            f"{self.path}: {self.matches} matches, {self.size / 1e6:.1f} MB in "
+            f"{self.seconds:.2f}s ({self.megabytes_per_second:.1f} MB/s, "
+            f"{self.matches_per_second:,.0f} matches/s)"
+        )
+        if self.discarded:
+            description += f", {self.discarded} points after match completion"
+        return description
+
+
+def expand_inputs(patterns: Sequence[str]) -> List[str]:
+    """Expand input paths and glob patterns into a list of files.
+
+    Each pattern's matches are sorted, so daily shards are read in date
+    order, and the patterns themselves keep their given order. A file
+    matched by more than one pattern is read once.
+
+    Args:
+        patterns: File paths or glob patterns.
+
+    Returns:
+        Paths of the input files.
+
+    Raises:
+        TennisCalculatorException: If a pattern matches no file.
+    """
+    paths: Dict[str, None] = {}
+    for pattern in patterns:
+        matches = sorted(
+            path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)
+        )
+        if not matches:
+            raise TennisCalculatorException(f"No input files match {pattern}")
+        paths.update(dict.fromkeys(matches))
+    return list(paths)
+
+
+def compression_opener(path: str) -> Optional[Callable[[str], io.BufferedIOBase]]:
+    """Detect the compression of a file from its leading bytes.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        The function opening the decompressed stream, or None for plain files.
+    """
+    with open(path, "rb") as f:
+        head = f.read(MAGIC_LENGTH)
+    for magic, opener in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return opener
+    return None
+
+
+def open_match_input(path: str) -> TextIO:
+    """Open a plain or compressed text input file for streaming.
+
+    Compressed files are decompressed as they are read, never to disk.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        A text stream of the file's lines.
+    """
+    opener = compression_opener(path)
+    if opener is None:
+        return open(path, "r")
+    return io.TextIOWrapper(opener(path))
@@ -2,7 +2,7 @@
 
 import re
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
 from tennis_calculator.core.rules import (
     PLAYER_ONE,
     PLAYER_TWO,
@@ -10,7 +10,9 @@ from tennis_calculator.core.rules import (
     POINT_VALUE_PLAYER_TWO,
 )
 from tennis_calculator.core.exceptions import InvalidMatchFormatException
+from tennis_calculator.core.models.history import PointHistory
 from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.scoring.table import TableScorer
 
 
 @dataclass
@@ -28,6 +30,11 @@ class MatchParser:
 
     MATCH_ID_PATTERN = r"^Match: (\w+)$"
     PLAYERS_PATTERN = r"^(.+) vs (.+)$"
+    MATCH_HEADER_PREFIX = "Match:"
+    POINT_LINES = {
+        str(POINT_VALUE_PLAYER_ONE): PLAYER_ONE,
+        str(POINT_VALUE_PLAYER_TWO): PLAYER_TWO,
+    }
 
     @classmethod
     def parse_match_details(cls, lines: List[str]) -> tuple[str, str, str]:
@@ -72,19 +79,38 @@ class MatchParser:
         Raises:
             InvalidMatchFormatException: If point format is invalid.
         """
-        points = []
-        for line in lines[2:]:  # Skip match ID and player lines
-            line = line.strip()
-            if not line:  # Skip empty lines
-                continue
-            if line not in (str(POINT_VALUE_PLAYER_ONE), str(POINT_VALUE_PLAYER_TWO)):
-                raise InvalidMatchFormatException(
-                    f"Invalid point value: {line}. Must be {POINT_VALUE_PLAYER_ONE} or {POINT_VALUE_PLAYER_TWO}"
-                )
-            points.append(
-                PLAYER_ONE if line == str(POINT_VALUE_PLAYER_ONE) else PLAYER_TWO
-            )
-        return points
+        point_lines = cls.POINT_LINES
+        try:
+            # Skip match ID and player lines, and empty lines
+            return [point_lines[line] for line in map(str.strip, lines[2:]) if line]
+        except KeyError as error:
+            raise cls._invalid_point(error.args[0]) from None
+
+    @classmethod
+    def parse_point(cls, line: str) -> int:
+        """Parse a single stripped point line into a player number.
+
+        Args:
+            line: Stripped input line.
+
+        Returns:
+            Player number that won the point.
+
+        Raises:
+            InvalidMatchFormatException: If point format is invalid.
+        """
+        player_number = cls.POINT_LINES.get(line)
+        if player_number is None:
+            raise cls._invalid_point(line)
+        return player_number
+
+    @staticmethod
+    def _invalid_point(line: str) -> InvalidMatchFormatException:
+        """builds the error for an invalid point line"""
+        return InvalidMatchFormatException(
+            f"Invalid point value: {line}. "
+            f"Must be {POINT_VALUE_PLAYER_ONE} or {POINT_VALUE_PLAYER_TWO}"
+        )
 
     @classmethod
     def create_match(cls, lines: List[str]) -> Match:
@@ -100,13 +126,95 @@ class MatchParser:
             InvalidMatchFormatException: If match format is invalid.
         """
         match_id, player_one, player_two = cls.parse_match_details(lines)
-        match = Match(match_id, player_one, player_two)
+        scorer = TableScorer(history=PointHistory())
+        # Points after match completion are ignored by the scorer
+        scorer.record_points(cls.parse_points(lines))
+        return scorer.to_match(match_id, player_one, player_two)
+
+    @classmethod
+    def stream_matches(cls, lines: Iterable[str]) -> Iterator[Match]:
+        """Lazily create Match objects from a stream of input lines.
+
+        Points are scored as soon as they are read, so memory is bounded by
+        the state of the match being parsed rather than by the input size.
+
+        Args:
+            lines: Iterable of input lines, e.g. an open file object.
+
+        Yields:
+            Match objects in input order.
 
-        points = cls.parse_points(lines)
-        for point in points:
-            try:
-                match.record_point(point)  # Points are already mapped to 1 or 2
-            except Exception:  # Stop processing points if match is complete
-                break
+        Raises:
+            InvalidMatchFormatException: If match format is invalid.
+        """
+        block_header: Optional[str] = None
+        details: Optional[Tuple[str, str, str]] = None
+        scorer = TableScorer(history=PointHistory())
+        for raw_line in lines:
+            line = raw_line.strip()
+            if not line:  # Skip empty lines
+                continue
+            if line.startswith(cls.MATCH_HEADER_PREFIX):  # New match starts
+                if block_header is not None:
+                    yield cls._finish_streamed_match(details, scorer)
+                block_header, details = line, None
+                scorer = TableScorer(history=PointHistory())
+            elif block_header is None:  # Data before any header, reported below
+                block_header = line
+            elif details is None:
+                details = cls.parse_match_details([block_header, line])
+            else:
+                scorer.record_point(cls.parse_point(line))
+
+        if block_header is not None:
+            yield cls._finish_streamed_match(details, scorer)
+
+    @classmethod
+    def stream_blocks(cls, lines: Iterable[str]) -> Iterator[MatchData]:
+        """Lazily parse match blocks from a stream of input lines, unscored.
+
+        Args:
+            lines: Iterable of input lines, e.g. an open file object.
 
-        return match
+        Yields:
+            Parsed match data in input order.
+
+        Raises:
+            InvalidMatchFormatException: If match format is invalid.
+        """
+        block_header: Optional[str] = None
+        details: Optional[Tuple[str, str, str]] = None
+        points: List[int] = []
+        for raw_line in lines:
+            line = raw_line.strip()
+            if not line:  # Skip empty lines
+                continue
+            if line.startswith(cls.MATCH_HEADER_PREFIX):  # New match starts
+                if block_header is not None:
+                    yield MatchData(*cls._require_details(details), points)
+                block_header, details, points = line, None, []
+            elif block_header is None:  # Data before any header, reported below
+                block_header = line
+            elif details is None:
+                details = cls.parse_match_details([block_header, line])
+            else:
+                points.append(cls.parse_point(line))
+
+        if block_header is not None:
+            yield MatchData(*cls._require_details(details), points)
+
+    @classmethod
+    def _finish_streamed_match(
+        cls, details: Optional[Tuple[str, str, str]], scorer: TableScorer
+    ) -> Match:
+        """builds streamed match, rejecting blocks without a players line"""
+        return scorer.to_match(*cls._require_details(details))
+
+    @staticmethod
+    def _require_details(
+        details: Optional[Tuple[str, str, str]]
+    ) -> Tuple[str, str, str]:
+        """rejects streamed blocks without a players line"""
+        if details is None:
+            raise InvalidMatchFormatException("Match data must have at least 2 lines")
+        return details
@@ -0,0 +1,141 @@
+"""handles scoring points appended to input files while matches are played
+
+Each followed file keeps its byte offset and the state of the match block
+being read, so a poll reads only the bytes appended since the last one and
+feeds their points to the live Match objects in the tournament. Matches are
+never rebuilt from their first point. In append mode a block for a known
+match id continues that match, as MatchProcessor.append_match does.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.parsers.binary_format import BinaryMatchReader
+from tennis_calculator.core.parsers.input_files import compression_opener
+from tennis_calculator.core.parsers.match_parser import MatchParser
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.exceptions import (
+    InvalidMatchDataException,
+    InvalidMatchFormatException,
+    TennisCalculatorException,
+)
+
+# Default seconds between polls of the followed files
+FOLLOW_INTERVAL = 0.5
+
+
+@dataclass
+class FollowedFile:
+    """read position and open match block of a followed file"""
+
+    path: str
+    offset: int = 0
+    inode: Optional[int] = None
+    line: int = 0
+    # Bytes after the last newline, completed by a later append
+    partial: bytes = b""
+    block_header: Optional[str] = None
+    match: Optional[Match] = None
+
+    def reset(self, inode: Optional[int]) -> None:
+        """starts again from the beginning of a truncated or replaced file"""
+        self.offset, self.inode, self.line, self.partial = 0, inode, 0, b""
+        self.block_header, self.match = None, None
+
+
+class MatchFollower:
+    """tails text input files and scores their new points incrementally"""
+
+    def __init__(
+        self,
+        match_processor: MatchProcessor,
+        paths: Sequence[str],
+        overwrite: bool = True,
+        append: bool = False,
+    ) -> None:
+        """initializes follower at the start of each file"""
+        for path in paths:
+            if compression_opener(path) is not None or BinaryMatchReader.is_binary(
+                path
+            ):
+                raise TennisCalculatorException(
+                    f"Only plain text input can be followed: {path}"
+                )
+        self.match_processor = match_processor
+        self.overwrite = overwrite
+        self.append = append
+        self.files: List[FollowedFile] = [FollowedFile(path) for path in paths]
+
+    def poll(self) -> int:
+        """reads what was appended to every file since the last poll
+
+        Returns:
+            Number of lines consumed
+        """
+        return sum(self._poll_file(followed) for followed in self.files)
+
+    def open_matches(self) -> List[Match]:
+        """returns the match currently being read from each file"""
+        return [followed.match for followed in self.files if followed.match]
+
+    def _poll_file(self, followed: FollowedFile) -> int:
+        """reads and scores the complete lines appended to one file"""
+        try:
+            stat = os.stat(followed.path)
+        except FileNotFoundError:
+            # A rotated file may not have been recreated yet
+            return 0
+        if stat.st_ino != followed.inode or stat.st_size < followed.offset:
+            followed.reset(stat.st_ino)
+        if stat.st_size == followed.offset:
+            return 0
+        with open(followed.path, "rb") as f:
+            f.seek(followed.offset)
+            appended = f.read(stat.st_size - followed.offset)
+        followed.offset += len(appended)
+        data = followed.partial + appended
+        complete = data.rfind(b"\n") + 1
+        followed.partial = data[complete:]
+        lines = data[:complete].decode("utf-8").splitlines()
+        for line in lines:
+            followed.line += 1
+            try:
+                self._feed_line(followed, line.strip())
+            except (InvalidMatchDataException, InvalidMatchFormatException) as error:
+                raise type(error)(
+                    f"{error} ({followed.path}, line {followed.line})"
+                ) from None
+        return len(lines)
+
+    def _feed_line(self, followed: FollowedFile, line: str) -> None:
+        """applies one stripped line to the file's open match block"""
+        if not line:
+            return
+        if line.startswith(MatchParser.MATCH_HEADER_PREFIX):
+            if followed.block_header is not None and followed.match is None:
+                raise InvalidMatchFormatException(
+                    "Match data must have at least 2 lines"
+                )
+            followed.block_header, followed.match = line, None
+        elif followed.block_header is None:
+            # Data before any header, reported with the next line
+            followed.block_header = line
+        elif followed.match is None:
+            details = MatchParser.parse_match_details([followed.block_header, line])
+            if self.append:
+                followed.match = self.match_processor.resume_match(*details)
+            if followed.match is None:
+                followed.match = Match(*details)
+                self.match_processor.tournament.add_match(
+                    followed.match, self.overwrite
+                )
+        else:
+            player_number = MatchParser.parse_point(line)
+            # Points after match completion are dropped, as in append ingest
+            if followed.match.winner:
+                self.match_processor.discarded_points += 1
+            else:
+                self.match_processor.tournament.record_match_point(
+                    followed.match.match_id, player_number
+                )
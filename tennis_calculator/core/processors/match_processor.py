@@ -1,50 +1,458 @@
 """handles tennis match processing"""
 
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Iterable, Iterator, List, Optional, Sequence, Sized, Tuple
+from tennis_calculator.core.models.history import PointHistory
+from tennis_calculator.core.models.match import Match
 from tennis_calculator.core.models.tournament import Tournament
-from tennis_calculator.core.parsers.match_parser import MatchParser
-from tennis_calculator.core.exceptions import InvalidMatchDataException
+from tennis_calculator.core.parsers.binary_format import BinaryMatchReader
+from tennis_calculator.core.parsers.byte_scanner import ByteMatchScanner, RawMatch
+from tennis_calculator.core.parsers.input_files import (
+    InputReport,
+    compression_opener,
+    open_match_input,
+)
+from tennis_calculator.core.parsers.match_parser import MatchData, MatchParser
+from tennis_calculator.core.scoring.bulk import (
+    MatchSummary,
+    buffer_to_players,
+    summarize_point_values,
+)
+from tennis_calculator.core.scoring.cache import ScoreCache
+from tennis_calculator.core.scoring.table import TableScorer
+from tennis_calculator.core.exceptions import (
+    InvalidMatchDataException,
+    MatchNotFoundException,
+)
+
+# Lines per chunk handed to a worker process in parallel ingest
+PARALLEL_CHUNK_LINES = 50_000
+
+
+def _score_chunk(lines: List[str]) -> Tuple[List[Match], Optional[Exception]]:
+    """scores a chunk of whole match blocks in a worker process
+
+    Errors are returned rather than raised so the matches scored before the
+    failing block can still be merged, exactly as sequential ingest would.
+    """
+    matches: List[Match] = []
+    try:
+        for match in MatchParser.stream_matches(lines):
+            matches.append(match)
+    except Exception as error:
+        return matches, error
+    return matches, None
+
+
+def read_input_matches(path: str) -> Iterator[Match]:
+    """scores the matches of a binary, plain text or compressed text file"""
+    return _summarize_raw(read_raw_matches(path))
+
+
+def read_raw_matches(path: str) -> Iterator[RawMatch]:
+    """scans the matches of a binary, plain text or compressed text file"""
+    opener = compression_opener(path)
+    if opener is not None:
+        with opener(path) as stream:
+            yield from ByteMatchScanner.scan_stream(stream)
+    elif BinaryMatchReader.is_binary(path):
+        yield from BinaryMatchReader.read_file(path)
+    else:
+        yield from ByteMatchScanner.scan_file(path)
+
+
+def _summarize_raw(raw_matches: Iterable[RawMatch]) -> Iterator[Match]:
+    """scores scanned matches"""
+    for raw in raw_matches:
+        summary = summarize_point_values(
+            raw.match_id, raw.player_one, raw.player_two, raw.points
+        )
+        yield summary.to_match()
+
+
+def _score_input(
+    path: str,
+) -> Tuple[List[Match], InputReport, Optional[Exception]]:
+    """scores a whole input file in a worker process, like _score_chunk"""
+    start = time.perf_counter()
+    matches: List[Match] = []
+    error: Optional[Exception] = None
+    try:
+        for match in read_input_matches(path):
+            matches.append(match)
+    except Exception as exception:
+        error = exception
+    report = InputReport(
+        path, len(matches), os.path.getsize(path), time.perf_counter() - start
+    )
+    return matches, report, error
+
+
+def split_match_chunks(
+    match_lines: Iterable[str], chunk_lines: int = PARALLEL_CHUNK_LINES
+) -> Iterator[List[str]]:
+    """groups stripped, non-empty lines into chunks that end on match boundaries"""
+    chunk: List[str] = []
+    for line in match_lines:
+        line = line.strip()
+        if not line:
+            continue
+        is_header = line.startswith(MatchParser.MATCH_HEADER_PREFIX)
+        if is_header and len(chunk) >= chunk_lines:
+            yield chunk
+            chunk = []
+        chunk.append(line)
+    if chunk:
+        yield chunk
 
 
 class MatchProcessor:
-    """processes tennis matches"""
+    """processes tennis matches
+
+    In append mode a block whose match id is already known continues that
+    match with its points instead of replacing it. Points arriving after
+    the match is completed are dropped and counted in discarded_points.
 
-    def __init__(self) -> None:
+    With a score_cache, file ingest restores the scores of point sequences
+    seen before instead of scoring them again, and completed matches go
+    straight into the tournament's columnar storage.
+    """
+
+    def __init__(
+        self,
+        tournament: Optional[Tournament] = None,
+        score_cache: Optional[ScoreCache] = None,
+    ) -> None:
         """initializes match processor"""
-        self.tournament = Tournament()
+        self.tournament = tournament if tournament is not None else Tournament()
+        self.score_cache = score_cache
+        self.discarded_points = 0
+
+    def __getstate__(self):
+        """Return state for pickling, leaving out the run's cache and counters."""
+        return {"tournament": self.tournament}
 
-    def process_matches(self, match_lines: list[str], overwrite: bool = True) -> None:
+    def __setstate__(self, state):
+        """Set state when unpickling."""
+        self.__init__(state["tournament"])
+
+    def process_matches(
+        self, match_lines: Iterable[str], overwrite: bool = True, append: bool = False
+    ) -> None:
         """processes match data and updates tournament state
 
         Args:
-            match_lines: List of lines containing match data
+            match_lines: Lines containing match data, as a list or any iterable
             overwrite: If True, overwrites existing matches with same ID
+            append: If True, continues existing matches with same ID
         """
-        if not match_lines:
+        if isinstance(match_lines, Sized) and not match_lines:
             raise InvalidMatchDataException("No match data provided")
 
-        current_match_lines = []
-        for line in match_lines:
-            line = line.strip()
-            if not line:  # Skip empty lines
-                continue
-            if line.startswith("Match:"):  # New match starts
-                if current_match_lines:  # Process previous match if exists
-                    self._process_match(current_match_lines, overwrite)
-                current_match_lines = [line]
-            else:
-                current_match_lines.append(line)
-
-        # Process last match
-        if current_match_lines:
-            self._process_match(current_match_lines, overwrite)
-
-    def _process_match(self, match_lines: list[str], overwrite: bool = True) -> None:
-        """processes single match data"""
-        if not match_lines:
-            raise InvalidMatchDataException("Empty match data")
-
-        match = MatchParser.create_match(match_lines)
-        self.tournament.add_match(match, overwrite)
+        self.process_stream(match_lines, overwrite, append)
+
+    def process_stream(
+        self, match_lines: Iterable[str], overwrite: bool = True, append: bool = False
+    ) -> int:
+        """scores matches point by point while lines are being read
+
+        Args:
+            match_lines: Iterable of lines, e.g. an open file object
+            overwrite: If True, overwrites existing matches with same ID
+            append: If True, continues existing matches with same ID
+
+        Returns:
+            Number of matches processed
+        """
+        processed = 0
+        if append:
+            for block in MatchParser.stream_blocks(match_lines):
+                self.append_match(
+                    block.match_id, block.player_one, block.player_two, block.points
+                )
+                processed += 1
+            return processed
+        for match in MatchParser.stream_matches(match_lines):
+            self.tournament.add_match(match, overwrite)
+            processed += 1
+        return processed
+
+    def process_file(
+        self, path: str, overwrite: bool = True, append: bool = False
+    ) -> int:
+        """memory-maps an input file and scores its matches from raw bytes
+
+        Args:
+            path: Path to a text or binary format input file
+            overwrite: If True, overwrites existing matches with same ID
+            append: If True, continues existing matches with same ID
+
+        Returns:
+            Number of matches processed
+        """
+        processed = 0
+        if append:
+            for raw in read_raw_matches(path):
+                self.append_match(
+                    raw.match_id,
+                    raw.player_one,
+                    raw.player_two,
+                    buffer_to_players(raw.points),
+                )
+                processed += 1
+            return processed
+        if self.score_cache is not None:
+            for raw in read_raw_matches(path):
+                self._add_cached(raw, self.score_cache, overwrite)
+                processed += 1
+            return processed
+        for match in read_input_matches(path):
+            self.tournament.add_match(match, overwrite)
+            processed += 1
+        return processed
+
+    def _add_cached(self, raw: RawMatch, cache: ScoreCache, overwrite: bool) -> None:
+        """adds a scanned match scored through the cache"""
+        scorer = cache.score(raw.points)
+        if not scorer.is_completed:
+            self.tournament.add_match(
+                scorer.to_match(raw.match_id, raw.player_one, raw.player_two),
+                overwrite,
+            )
+            return
+        sets = [
+            games + final_points
+            for games, final_points in zip(
+                scorer.completed_sets, scorer.final_game_points
+            )
+        ]
+        self.tournament.add_completed_match(
+            raw.match_id,
+            raw.player_one,
+            raw.player_two,
+            sets,
+            overwrite,
+            scorer.history,
+        )
+
+    def process_input(
+        self,
+        path: str,
+        workers: int = 1,
+        overwrite: bool = True,
+        append: bool = False,
+    ) -> InputReport:
+        """scores one input file, splitting text input across workers
+
+        Appending depends on the state left by earlier blocks, and the score
+        cache lives in this process, so either reads the file in this process.
+
+        Args:
+            path: Path to a binary, plain text or compressed text input file
+            workers: Number of worker processes for text input
+            overwrite: If True, overwrites existing matches with same ID
+            append: If True, continues existing matches with same ID
+
+        Returns:
+            Ingest statistics for the file
+        """
+        start = time.perf_counter()
+        discarded = self.discarded_points
+        in_process = append or self.score_cache is not None
+        if workers > 1 and not in_process and not BinaryMatchReader.is_binary(path):
+            with open_match_input(path) as lines:
+                processed = self.process_parallel(lines, workers, overwrite)
+        else:
+            processed = self.process_file(path, overwrite, append)
+        return InputReport(
+            path,
+            processed,
+            os.path.getsize(path),
+            time.perf_counter() - start,
+            self.discarded_points - discarded,
+        )
+
+    def process_inputs(
+        self,
+        paths: Sequence[str],
+        workers: int = 1,
+        overwrite: bool = True,
+        append: bool = False,
+    ) -> List[InputReport]:
+        """scores several input files, decoding whole files in parallel
+
+        Matches are merged in input order, so a match repeated in a later
+        file replaces, or in append mode continues, the earlier one exactly
+        as in sequential ingest.
+
+        Args:
+            paths: Paths to binary, plain text or compressed text input files
+            workers: Number of worker processes
+            overwrite: If True, overwrites existing matches with same ID
+            append: If True, continues existing matches with same ID
+
+        Returns:
+            Ingest statistics per file, in input order
+        """
+        if workers <= 1 or len(paths) == 1 or append or self.score_cache is not None:
+            return [
+                self.process_input(path, workers, overwrite, append) for path in paths
+            ]
+
+        reports: List[InputReport] = []
+        pending: Deque[Future] = deque()
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+            try:
+                for path in paths:
+                    pending.append(executor.submit(_score_input, path))
+                    # Bound the scored files held in memory while merging
+                    if len(pending) > 2 * workers:
+                        reports.append(self._merge_input(pending.popleft(), overwrite))
+                while pending:
+                    reports.append(self._merge_input(pending.popleft(), overwrite))
+            finally:
+                for future in pending:
+                    future.cancel()
+        return reports
+
+    def resume_match(
+        self, match_id: str, player_one: str, player_two: str
+    ) -> Optional[Match]:
+        """returns the existing match a block continues, checking its players
+
+        Args:
+            match_id: Match id of the block
+            player_one: First player named by the block
+            player_two: Second player named by the block
+
+        Returns:
+            The existing match, or None if the match id is new
+        """
+        try:
+            match = self.tournament.get_match(match_id)
+        except MatchNotFoundException:
+            return None
+        if (match.player_one, match.player_two) != (player_one, player_two):
+            raise InvalidMatchDataException(
+                f"Match {match_id} is {match.player_one} vs {match.player_two}, "
+                f"not {player_one} vs {player_two}"
+            )
+        return match
+
+    def append_match(
+        self, match_id: str, player_one: str, player_two: str, points: Sequence[int]
+    ) -> int:
+        """continues a match with new points, adding it if the id is new
+
+        Only the new points are scored. Points after the match is completed
+        are dropped instead of raising MatchCompletedException.
+
+        Args:
+            match_id: Match id of the block
+            player_one: First player named by the block
+            player_two: Second player named by the block
+            points: Player numbers of the new points
+
+        Returns:
+            Number of points discarded because the match was completed
+        """
+        match = self.resume_match(match_id, player_one, player_two)
+        if match is None:
+            scorer = TableScorer(history=PointHistory())
+            recorded = scorer.record_points(points)
+            self.tournament.add_match(scorer.to_match(match_id, player_one, player_two))
+        else:
+            recorded = 0
+            for player_number in points:
+                if match.winner:
+                    break
+                self.tournament.record_match_point(match_id, player_number)
+                recorded += 1
+        discarded = len(points) - recorded
+        self.discarded_points += discarded
+        return discarded
+
+    def _merge_input(self, future: Future, overwrite: bool) -> InputReport:
+        """adds a scored file to the tournament, re-raising its error"""
+        matches, report, error = future.result()
+        for match in matches:
+            self.tournament.add_match(match, overwrite)
+        if error is not None:
+            raise error
+        return report
+
+    def process_parallel(
+        self,
+        match_lines: Iterable[str],
+        workers: int,
+        overwrite: bool = True,
+        chunk_lines: int = PARALLEL_CHUNK_LINES,
+    ) -> int:
+        """scores chunks of matches in worker processes, merging in input order
+
+        Args:
+            match_lines: Iterable of lines, e.g. an open file object
+            workers: Number of worker processes
+            overwrite: If True, overwrites existing matches with same ID
+            chunk_lines: Approximate number of lines per chunk
+
+        Returns:
+            Number of matches processed
+        """
+        if workers <= 1:
+            return self.process_stream(match_lines, overwrite)
+
+        processed = 0
+        pending: Deque[Future] = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            try:
+                for chunk in split_match_chunks(match_lines, chunk_lines):
+                    pending.append(executor.submit(_score_chunk, chunk))
+                    # Bound the chunks held in memory while workers catch up
+                    if len(pending) > 2 * workers:
+                        processed += self._merge_chunk(pending.popleft(), overwrite)
+                while pending:
+                    processed += self._merge_chunk(pending.popleft(), overwrite)
+            finally:
+                for future in pending:
+                    future.cancel()
+        return processed
+
+    def _merge_chunk(self, future: Future, overwrite: bool) -> int:
+        """adds a scored chunk to the tournament, re-raising its error"""
+        matches, error = future.result()
+        for match in matches:
+            self.tournament.add_match(match, overwrite)
+        if error is not None:
+            raise error
+        return len(matches)
+
+    def process_batch(
+        self,
+        matches: Sequence[MatchData],
+        overwrite: bool = True,
+        use_numpy: Optional[bool] = None,
+    ) -> List[MatchSummary]:
+        """scores parsed matches in one batch and adds them to the tournament
+
+        Args:
+            matches: Parsed matches to score
+            overwrite: If True, overwrites existing matches with same ID
+            use_numpy: Backend selection, see score_batch
+
+        Returns:
+            Summaries of the scored matches, in input order
+        """
+        # Imported here so plain ingest and queries never pay for NumPy
+        from tennis_calculator.core.scoring.vectorized import score_batch
+
+        summaries = score_batch(matches, use_numpy)
+        for summary in summaries:
+            self.tournament.add_match(summary.to_match(), overwrite)
+        return summaries
 
     def get_match(self, match_id: str):
         """gets match by id"""
@@ -1,24 +1,143 @@
 """handles tennis query processing"""
 
-from typing import Optional, Tuple
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO, Tuple, Union
+from tennis_calculator.core.models.match import Match
 from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.processors.result_cache import (
+    DEFAULT_RESULT_ENTRIES,
+    ResultCache,
+)
+from tennis_calculator.core.scoring.timeline import score_at
 from tennis_calculator.core.exceptions import (
     InvalidQueryException,
     MatchNotFoundException,
     PlayerNotFoundException,
+    TennisCalculatorException,
 )
 
+# Queries answered per hold of the read lock by handle_queries
+BATCH_SIZE = 10000
+
+# Query kind, match id or player name, and the points of an At query
+ParsedQuery = Tuple[str, str, Optional[int]]
+Answer = Union[str, TennisCalculatorException]
+
 
 class QueryProcessor:
     """processes tennis match queries"""
 
-    def __init__(self, match_processor: MatchProcessor) -> None:
-        """initializes query processor"""
+    def __init__(
+        self,
+        match_processor: MatchProcessor,
+        cache_entries: int = DEFAULT_RESULT_ENTRIES,
+        result_cache: Optional[ResultCache] = None,
+    ) -> None:
+        """initializes query processor, caching up to cache_entries answers
+
+        A result_cache shared with processors of earlier loads of the same
+        store keeps its counts, and its entries are dropped as stale.
+        """
         self.match_processor = match_processor
+        self.result_cache = (
+            result_cache if result_cache is not None else ResultCache(cache_entries)
+        )
 
     def handle_query(self, query: str) -> str:
-        """processes query and returns result"""
+        """processes query and returns result
+
+        The tournament's read lock is held while the query is answered, so
+        points recorded on other threads are never seen half applied.
+        """
+        return self.handle_parsed_query(self._parse_query(query))
+
+    def handle_parsed_query(self, parsed: ParsedQuery) -> str:
+        """answers an already parsed query under the tournament's read lock"""
+        with self.match_processor.tournament.lock.reading:
+            return self._answer_query(parsed)
+
+    def answer_queries(self, queries: Sequence[str]) -> List[Answer]:
+        """answers a batch of queries, each distinct one only once
+
+        Every distinct query text is parsed once, and every distinct match
+        or player is looked up once, grouped by kind, during a single hold
+        of the read lock.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            The result of each query in order, or the exception it raised
+        """
+        parsed: Dict[str, Union[ParsedQuery, TennisCalculatorException]] = {}
+        for query in queries:
+            if query not in parsed:
+                try:
+                    parsed[query] = self._parse_query(query)
+                except TennisCalculatorException as exception:
+                    parsed[query] = exception
+        answers: Dict[ParsedQuery, Answer] = {}
+        lookups = sorted(
+            {key for key in parsed.values() if isinstance(key, tuple)},
+            key=lambda key: key[0],
+        )
+        with self.match_processor.tournament.lock.reading:
+            for key in lookups:
+                try:
+                    answers[key] = self._answer_query(key)
+                except TennisCalculatorException as exception:
+                    answers[key] = exception
+        results: List[Answer] = []
+        for query in queries:
+            key = parsed[query]
+            results.append(answers[key] if isinstance(key, tuple) else key)
+        return results
+
+    def handle_queries(
+        self, queries: Iterable[str], output: TextIO, stop_on_error: bool = False
+    ) -> int:
+        """answers queries in batches and writes one result per query
+
+        Queries are answered BATCH_SIZE at a time with answer_queries, and
+        the results of each batch are written with a single write and then
+        flushed, so a reader on a pipe sees each batch as it completes.
+        Failed queries are written as ``Error: <message>``.
+
+        Args:
+            queries: Query texts
+            output: Stream the results are written to
+            stop_on_error: If True, stops after writing the first error
+
+        Returns:
+            Number of queries that failed
+        """
+        failures = 0
+        queries = iter(queries)
+        while True:
+            batch = list(islice(queries, BATCH_SIZE))
+            if not batch:
+                return failures
+            lines = []
+            for result in self.answer_queries(batch):
+                if isinstance(result, TennisCalculatorException):
+                    failures += 1
+                    lines.append(f"Error: {result}")
+                    if stop_on_error:
+                        break
+                else:
+                    lines.append(result)
+            output.write("\n".join(lines) + "\n")
+            output.flush()
+            if failures and stop_on_error:
+                return failures
+
+    def _parse_query(self, query: str) -> ParsedQuery:
+        """reads the kind and subject of a query"""
         parts = query.strip().split()
+        if len(parts) == 2 and parts[0].lower() == "stats":
+            if parts[1].lower() != "cache":
+                raise InvalidQueryException("Unknown stats query")
+            return "stats", "cache", None
         if len(parts) < 3:
             raise InvalidQueryException("Invalid query format")
 
@@ -26,17 +145,61 @@ class QueryProcessor:
         if query_type == "score":
             if parts[1].lower() != "match":
                 raise InvalidQueryException("Invalid score query format")
-            return self._handle_score_query(parts[2])
+            if len(parts) > 3 and parts[3].lower() == "at":
+                if len(parts) != 5 or not parts[4].isdigit():
+                    raise InvalidQueryException("Invalid score query format")
+                return "score", parts[2], int(parts[4])
+            return "score", parts[2], None
         elif query_type == "games":
             if parts[1].lower() != "player":
                 raise InvalidQueryException("Invalid games query format")
-            return self._handle_games_query(" ".join(parts[2:]))
+            return "games", " ".join(parts[2:]), None
         else:
             raise InvalidQueryException("Unknown query type")
 
+    def _answer_query(self, parsed: ParsedQuery) -> str:
+        """answers a parsed query, from the result cache while still current"""
+        query_type, subject, _ = parsed
+        if query_type == "stats":
+            return self.result_cache.describe()
+        tournament = self.match_processor.tournament
+        if query_type == "games":
+            version = tournament.generation, tournament.player_version(subject)
+        else:
+            version = tournament.generation, tournament.match_version(subject)
+        answer = self.result_cache.get(parsed, version)
+        if answer is None:
+            answer = self._compute_answer(parsed)
+            self.result_cache.put(parsed, version, answer)
+        return answer
+
+    def _compute_answer(self, parsed: ParsedQuery) -> str:
+        """dispatches a parsed query to its handler"""
+        query_type, subject, points = parsed
+        if query_type == "games":
+            return self._handle_games_query(subject)
+        if points is not None:
+            return self._handle_score_at_query(subject, points)
+        return self._handle_score_query(subject)
+
     def _handle_score_query(self, match_id: str) -> str:
-        """handles score query"""
+        """handles score query, reading compacted results without a rebuild"""
+        tournament = self.match_processor.tournament
+        if match_id not in tournament.matches and match_id in tournament.compacted:
+            player_one, player_two = tournament.compacted.get_players(match_id)
+            sets_one, sets_two = tournament.compacted.sets_score(match_id)
+            if sets_one > sets_two:
+                return self._format_result(player_one, player_two, sets_one, sets_two)
+            return self._format_result(player_two, player_one, sets_two, sets_one)
+        return self._format_score(self.match_processor.get_match(match_id))
+
+    def _handle_score_at_query(self, match_id: str, points: int) -> str:
+        """handles score query for the score after a number of points"""
         match = self.match_processor.get_match(match_id)
+        return self._format_score(score_at(match, points))
+
+    def _format_score(self, match: Match) -> str:
+        """formats a match result, or the score of a match in progress"""
         if not match.winner:
             return match.score_display()
 
@@ -52,7 +215,13 @@ class QueryProcessor:
             else match.sets_score.player_one
         )
 
-        return f"{match.winner} defeated {loser}\n{winner_sets} sets to {loser_sets}"
+        return self._format_result(match.winner, loser, winner_sets, loser_sets)
+
+    def _format_result(
+        self, winner: str, loser: str, winner_sets: int, loser_sets: int
+    ) -> str:
+        """formats the result of a completed match"""
+        return f"{winner} defeated {loser}\n{winner_sets} sets to {loser_sets}"
 
     def _handle_games_query(self, player_name: str) -> str:
         """handles games query"""
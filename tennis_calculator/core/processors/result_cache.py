@@ -0,0 +1,84 @@
+"""caches query answers until the match or player they read changes
+
+Each answer is stored with the version of the match or player it was
+computed from, as counted by Tournament.match_version and
+Tournament.player_version, and the Tournament.generation it was read from.
+A lookup with another version drops the entry instead of returning it, so
+recording a point only invalidates answers about that match and its
+players, and answers from an earlier load of the store are never returned.
+The cache keeps the most recently used entries up to a size limit.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+DEFAULT_RESULT_ENTRIES = 100_000
+
+
+class ResultCache:
+    """maps normalized queries to versioned answers, evicting the least used
+
+    Queries run on several threads under the tournament's read lock, so the
+    entries are guarded by a lock of their own.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_RESULT_ENTRIES) -> None:
+        """initializes an empty cache"""
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Hashable, Tuple[Hashable, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """counts cached entries"""
+        return len(self.entries)
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[str]:
+        """returns the answer cached for a query, None if missing or stale
+
+        Args:
+            key: Normalized query
+            version: Current version of the match or player the query reads
+
+        Returns:
+            Cached answer, or None if it must be recomputed
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry[0] == version:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self.entries[key]
+                self.invalidations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, version: Hashable, answer: str) -> None:
+        """caches the answer of a query computed at a version"""
+        with self._lock:
+            self.entries[key] = (version, answer)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """drops every entry, keeping the counts"""
+        with self._lock:
+            self.entries.clear()
+
+    def describe(self) -> str:
+        """formats the hit and miss counts as one line of text"""
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return (
+            f"result cache: {self.hits} hits, {self.misses} misses "
+            f"({hit_rate:.1%} hit rate), {self.invalidations} invalidations, "
+            f"{self.evictions} evictions, {len(self.entries)} entries"
+        )
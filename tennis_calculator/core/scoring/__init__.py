@@ -0,0 +1,34 @@
+"""Tennis calculator scoring engines."""
+
+from tennis_calculator.core.scoring.bulk import (
+    MatchSummary,
+    summarize_match,
+    summarize_matches,
+    summarize_point_values,
+)
+from tennis_calculator.core.scoring.cache import (
+    DEFAULT_CACHE_PATH,
+    ScoreCache,
+)
+from tennis_calculator.core.scoring.table import (
+    SCORING_TABLE,
+    ScoreState,
+    ScoringTable,
+    TableScorer,
+)
+from tennis_calculator.core.scoring.timeline import score_at
+
+
+__all__ = [
+    "DEFAULT_CACHE_PATH",
+    "MatchSummary",
+    "SCORING_TABLE",
+    "ScoreCache",
+    "ScoreState",
+    "ScoringTable",
+    "TableScorer",
+    "score_at",
+    "summarize_match",
+    "summarize_matches",
+    "summarize_point_values",
+]
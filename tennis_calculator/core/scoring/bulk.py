@@ -0,0 +1,236 @@
+"""bulk scoring of point sequences into final match summaries
+
+The table scorer already avoids Game and Set objects; this module wraps it
+in a small summary that answers the usual result questions directly and
+only builds a full Match when one is requested.
+
+Points come in one of two encodings, each with its own entry point:
+summarize_match takes player numbers, PLAYER_ONE or PLAYER_TWO, as held by
+MatchData, and summarize_point_values takes point values as written in
+input files, POINT_VALUE_PLAYER_ONE or POINT_VALUE_PLAYER_TWO.
+"""
+
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from tennis_calculator.core.rules import (
+    PLAYER_ONE,
+    PLAYER_TWO,
+    POINT_VALUE_PLAYER_ONE,
+    POINT_VALUE_PLAYER_TWO,
+)
+from tennis_calculator.core.exceptions import (
+    InvalidMatchFormatException,
+    InvalidPlayerNumberException,
+    PlayerNotFoundException,
+)
+from tennis_calculator.core.models.history import PointHistory
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.scoring.table import TableScorer, player_bytes
+
+if TYPE_CHECKING:
+    from tennis_calculator.core.parsers.match_parser import MatchData
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def _buffer_translation() -> bytes:
+    """maps point values, as ASCII digits or raw bytes, to player numbers"""
+    table = bytearray(256)  # anything else maps to 0, which is invalid
+    for value, player_number in (
+        (POINT_VALUE_PLAYER_ONE, PLAYER_ONE),
+        (POINT_VALUE_PLAYER_TWO, PLAYER_TWO),
+    ):
+        table[value] = player_number
+        table[ord(str(value))] = player_number
+    return bytes(table)
+
+
+BUFFER_TRANSLATION = _buffer_translation()
+
+
+def buffer_to_players(buffer: Buffer) -> bytes:
+    """converts a buffer of point values into player numbers
+
+    Args:
+        buffer: One byte per point, each the input file point value either
+            as an ASCII digit or as a raw byte
+
+    Returns:
+        Bytes holding PLAYER_ONE or PLAYER_TWO for every point
+
+    Raises:
+        InvalidMatchFormatException: If a byte is not a point value
+    """
+    players = bytes(buffer).translate(BUFFER_TRANSLATION)
+    invalid = players.find(0)
+    if invalid != -1:
+        raise InvalidMatchFormatException(
+            f"Invalid point value {bytes(buffer)[invalid:invalid + 1]!r} at "
+            f"point {invalid}. Must be {POINT_VALUE_PLAYER_ONE} or "
+            f"{POINT_VALUE_PLAYER_TWO}"
+        )
+    return players
+
+
+def point_players(points: Iterable[int]) -> bytes:
+    """validates player numbers and packs them into bytes
+
+    Args:
+        points: PLAYER_ONE or PLAYER_TWO for every point, in any iterable
+            of ints including bytes
+
+    Returns:
+        Bytes holding PLAYER_ONE or PLAYER_TWO for every point
+
+    Raises:
+        InvalidMatchFormatException: If a point is neither player
+    """
+    try:
+        return player_bytes(points)
+    except InvalidPlayerNumberException as exception:
+        raise InvalidMatchFormatException(
+            f"{exception}. Points must be player numbers {PLAYER_ONE} or {PLAYER_TWO}"
+        ) from exception
+
+
+class MatchSummary:
+    """final scores of a match computed without Game or Set objects"""
+
+    def __init__(
+        self, match_id: str, player_one: str, player_two: str, scorer: TableScorer
+    ) -> None:
+        """initializes summary from a scorer that has consumed the points"""
+        self.match_id = match_id
+        self.player_one = player_one
+        self.player_two = player_two
+        self._scorer = scorer
+        self._match: Optional[Match] = None
+
+    @property
+    def completed_sets(self) -> List[Tuple[int, int]]:
+        """games of each completed set, player one first"""
+        return self._scorer.completed_sets
+
+    @property
+    def current_set_games(self) -> Optional[Tuple[int, int]]:
+        """games of the set in progress, None once the match is completed"""
+        state = self._scorer.score_state
+        if state.is_completed:
+            return None
+        return state.games_one, state.games_two
+
+    @property
+    def sets_score(self) -> Tuple[int, int]:
+        """sets won by player one and player two"""
+        state = self._scorer.score_state
+        return state.sets_one, state.sets_two
+
+    @property
+    def winner(self) -> Optional[str]:
+        """winner of the match, None while in progress"""
+        if not self._scorer.is_completed:
+            return None
+        sets_one, sets_two = self.sets_score
+        return self.player_one if sets_one > sets_two else self.player_two
+
+    @property
+    def points_played(self) -> int:
+        """number of points that counted towards the result"""
+        return self._scorer.points_played
+
+    def is_completed(self) -> bool:
+        """checks if match has a winner"""
+        return self._scorer.is_completed
+
+    def games_summary(self, player_name: str) -> Tuple[int, int]:
+        """returns games won and lost for a player"""
+        if player_name not in (self.player_one, self.player_two):
+            raise PlayerNotFoundException(f"Player {player_name} not found in match")
+
+        games_one = sum(games for games, _ in self.completed_sets)
+        games_two = sum(games for _, games in self.completed_sets)
+        current = self.current_set_games
+        if current:
+            games_one += current[0]
+            games_two += current[1]
+        if player_name == self.player_one:
+            return games_one, games_two
+        return games_two, games_one
+
+    def to_match(self) -> Match:
+        """builds, once, the full Match object for this summary"""
+        if self._match is None:
+            self._match = self._scorer.to_match(
+                self.match_id, self.player_one, self.player_two
+            )
+        return self._match
+
+
+def summarize_match(
+    match_id: str, player_one: str, player_two: str, points: Iterable[int]
+) -> MatchSummary:
+    """scores a whole sequence of player numbers into a match summary
+
+    Args:
+        match_id: Match identifier
+        player_one: Name of the first player
+        player_two: Name of the second player
+        points: PLAYER_ONE or PLAYER_TWO for every point, as accepted by
+            ``point_players``
+
+    Returns:
+        Summary of the match; points after completion are ignored
+
+    Raises:
+        InvalidMatchFormatException: If a point is neither player
+    """
+    return summarize_players(match_id, player_one, player_two, point_players(points))
+
+
+def summarize_point_values(
+    match_id: str, player_one: str, player_two: str, values: Buffer
+) -> MatchSummary:
+    """scores a whole buffer of input file point values into a match summary
+
+    Args:
+        match_id: Match identifier
+        player_one: Name of the first player
+        player_two: Name of the second player
+        values: One point value per byte, as accepted by ``buffer_to_players``
+
+    Returns:
+        Summary of the match; points after completion are ignored
+
+    Raises:
+        InvalidMatchFormatException: If a byte is not a point value
+    """
+    return summarize_players(
+        match_id, player_one, player_two, buffer_to_players(values)
+    )
+
+
+def summarize_players(
+    match_id: str, player_one: str, player_two: str, players: bytes
+) -> MatchSummary:
+    """scores player numbers, as returned by point_players, into a summary"""
+    scorer = TableScorer(history=PointHistory())
+    scorer.record_points(players)
+    return MatchSummary(match_id, player_one, player_two, scorer)
+
+
+def summarize_matches(matches: Iterable["MatchData"]) -> Iterator[MatchSummary]:
+    """scores parsed matches one after another into summaries"""
+    for match_data in matches:
+        yield summarize_match(
+            match_data.match_id,
+            match_data.player_one,
+            match_data.player_two,
+            match_data.points,
+        )
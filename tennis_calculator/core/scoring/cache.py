@@ -0,0 +1,162 @@
+"""persistent cache of scored point sequences
+
+A match's score depends only on its points, so the table scorer state
+reached by a block's points is stored under a BLAKE2b digest of the raw
+point buffer, together with the checkpoints of the block's point history.
+When an unchanged block is read again the state is restored instead of
+replaying its points. The cache keeps the most recently used
+entries up to a size limit and is saved to disk between runs.
+"""
+
+import hashlib
+import os
+import pickle
+import struct
+from collections import OrderedDict
+from typing import Union
+from tennis_calculator.core.models.history import PointHistory
+from tennis_calculator.core.scoring.bulk import buffer_to_players
+from tennis_calculator.core.scoring.table import TableScorer
+
+DEFAULT_CACHE_PATH = ".score_cache"
+DEFAULT_CACHE_ENTRIES = 1_000_000
+
+# Bumped whenever scoring or the packed layout changes, discarding old caches
+CACHE_VERSION = 2
+DIGEST_SIZE = 16
+# table state, points in current game, points played, completed sets
+SCORER_HEADER = struct.Struct("<IHIB")
+# games won by each side, points of each side in the deciding game
+SET_ENTRY = struct.Struct("<BBHH")
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def pack_scorer(scorer: TableScorer) -> bytes:
+    """packs the state of a table scorer and its history checkpoints"""
+    header = SCORER_HEADER.pack(
+        scorer.state,
+        scorer.game_points,
+        scorer.points_played,
+        len(scorer.completed_sets),
+    )
+    sets = b"".join(
+        SET_ENTRY.pack(*games, *final_points)
+        for games, final_points in zip(scorer.completed_sets, scorer.final_game_points)
+    )
+    checkpoints = scorer.history.checkpoints if scorer.history is not None else b""
+    return header + sets + checkpoints
+
+
+def unpack_scorer(packed: bytes, players: bytes) -> TableScorer:
+    """restores a table scorer packed with pack_scorer
+
+    Args:
+        packed: Output of pack_scorer
+        players: Player numbers the scorer consumed, restoring its history
+
+    Returns:
+        Table scorer with its point history
+    """
+    state, game_points, points_played, set_count = SCORER_HEADER.unpack_from(packed)
+    checkpoints_start = SCORER_HEADER.size + set_count * SET_ENTRY.size
+    sets = list(SET_ENTRY.iter_unpack(packed[SCORER_HEADER.size : checkpoints_start]))
+    history = PointHistory()
+    history.extend(players[:points_played])
+    history.checkpoints = bytearray(packed[checkpoints_start:])
+    return TableScorer.from_state(
+        state,
+        game_points,
+        points_played,
+        [(games_one, games_two) for games_one, games_two, _, _ in sets],
+        [(points_one, points_two) for _, _, points_one, points_two in sets],
+        history=history,
+    )
+
+
+class ScoreCache:
+    """maps digests of point buffers to scored state, evicting the least used"""
+
+    def __init__(
+        self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_CACHE_ENTRIES
+    ) -> None:
+        """initializes cache, loading the entries saved at path"""
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    def __len__(self) -> int:
+        """counts cached entries"""
+        return len(self.entries)
+
+    @staticmethod
+    def digest(points: Buffer) -> bytes:
+        """hashes a raw point buffer to its cache key"""
+        return hashlib.blake2b(points, digest_size=DIGEST_SIZE).digest()
+
+    def score(self, points: Buffer) -> TableScorer:
+        """returns the scorer for a raw point buffer, scoring it on a miss
+
+        Args:
+            points: Point values as accepted by buffer_to_players
+
+        Returns:
+            Table scorer that has consumed the points, with their history
+        """
+        key = self.digest(points)
+        packed = self.entries.get(key)
+        if packed is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return unpack_scorer(packed, buffer_to_players(points))
+        self.misses += 1
+        scorer = TableScorer(history=PointHistory())
+        scorer.record_points(buffer_to_players(points))
+        self.entries[key] = pack_scorer(scorer)
+        self._evict()
+        return scorer
+
+    def save(self) -> None:
+        """writes the entries, least recently used first, replacing the file"""
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "wb") as f:
+            pickle.dump(
+                (CACHE_VERSION, list(self.entries.items())),
+                f,
+                pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(temporary_path, self.path)
+
+    def describe(self) -> str:
+        """formats the hit and miss counts as one line of text"""
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return (
+            f"score cache: {self.hits} hits, {self.misses} misses "
+            f"({hit_rate:.1%} hit rate), {self.evictions} evictions, "
+            f"{len(self.entries)} entries"
+        )
+
+    def _load(self) -> None:
+        """reads saved entries, ignoring a missing or outdated cache file"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            try:
+                version, entries = pickle.load(f)
+            except (pickle.UnpicklingError, EOFError, ValueError, TypeError):
+                return
+        if version != CACHE_VERSION:
+            return
+        self.entries = OrderedDict(entries)
+        self._evict()
+
+    def _evict(self) -> None:
+        """drops least recently used entries beyond the size limit"""
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
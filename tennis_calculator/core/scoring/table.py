@@ -0,0 +1,441 @@
+"""table-driven match scoring built from the constants in rules.py
+
+Every reachable (sets, games, points) position of a match is enumerated once
+at import time and numbered. Scoring a point is then a single lookup into a
+flat transition list indexed by ``state * 3 + player_number``; slot 0 of each
+state is an unused no-op so player numbers can be used as offsets directly.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from tennis_calculator.core.rules import (
+    PLAYER_ONE,
+    PLAYER_TWO,
+    POINTS_TO_WIN_GAME,
+    POINTS_LEAD_TO_WIN,
+    POINTS_TO_WIN_TIEBREAK,
+    GAMES_TO_WIN_SET,
+    GAMES_FOR_TIEBREAK,
+    SETS_TO_WIN_MATCH,
+)
+from tennis_calculator.core.exceptions import InvalidPlayerNumberException
+from tennis_calculator.core.models.game import Game
+from tennis_calculator.core.models.history import (
+    CHECKPOINT_INTERVAL,
+    CheckpointValues,
+    PointHistory,
+)
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.models.set import Set, TiebreakGame
+
+# Transition events, ordered by the largest unit the point completed
+EVENT_POINT = 0
+EVENT_GAME = 1
+EVENT_SET = 2
+EVENT_MATCH = 3
+EVENT_COMPLETED = 4  # point arrived after match completion and is ignored
+
+SLOTS_PER_STATE = 3
+PLAYER_NUMBERS = bytes((PLAYER_ONE, PLAYER_TWO))
+
+
+class ScoreState(NamedTuple):
+    """decoded match position between two points
+
+    Game points are collapsed once both players reach deuce territory, so
+    ``points_one``/``points_two`` are only the raw counts before deuce.
+    """
+
+    sets_one: int
+    sets_two: int
+    games_one: int
+    games_two: int
+    points_one: int
+    points_two: int
+    is_tiebreak: bool
+
+    @property
+    def is_completed(self) -> bool:
+        """checks if state is a finished match"""
+        return max(self.sets_one, self.sets_two) >= SETS_TO_WIN_MATCH
+
+
+def _game_target(is_tiebreak: bool) -> int:
+    """returns points needed to win a game"""
+    return POINTS_TO_WIN_TIEBREAK if is_tiebreak else POINTS_TO_WIN_GAME
+
+
+def _collapse_points(
+    points_one: int, points_two: int, is_tiebreak: bool
+) -> Tuple[int, int]:
+    """folds equivalent deuce positions onto the smallest representative"""
+    floor = _game_target(is_tiebreak) - 1
+    shift = min(points_one, points_two) - floor
+    if shift > 0:
+        return points_one - shift, points_two - shift
+    return points_one, points_two
+
+
+def _advance(state: ScoreState, player_number: int) -> Tuple[ScoreState, int]:
+    """reference transition mirroring Game, Set and Match record_point"""
+    if state.is_completed:
+        return state, EVENT_COMPLETED
+
+    sets_one, sets_two, games_one, games_two, points_one, points_two, tiebreak = state
+    if player_number == PLAYER_ONE:
+        points_one += 1
+    else:
+        points_two += 1
+
+    if not (
+        max(points_one, points_two) >= _game_target(tiebreak)
+        and abs(points_one - points_two) >= POINTS_LEAD_TO_WIN
+    ):
+        points_one, points_two = _collapse_points(points_one, points_two, tiebreak)
+        return state._replace(points_one=points_one, points_two=points_two), EVENT_POINT
+
+    if player_number == PLAYER_ONE:
+        games_one += 1
+    else:
+        games_two += 1
+
+    if not (
+        tiebreak or games_one >= GAMES_TO_WIN_SET or games_two >= GAMES_TO_WIN_SET
+    ):
+        next_tiebreak = (
+            games_one == GAMES_FOR_TIEBREAK and games_two == GAMES_FOR_TIEBREAK
+        )
+        return (
+            ScoreState(sets_one, sets_two, games_one, games_two, 0, 0, next_tiebreak),
+            EVENT_GAME,
+        )
+
+    if player_number == PLAYER_ONE:
+        sets_one += 1
+    else:
+        sets_two += 1
+    next_state = ScoreState(sets_one, sets_two, 0, 0, 0, 0, False)
+    return next_state, EVENT_MATCH if next_state.is_completed else EVENT_SET
+
+
+class ScoringTable:
+    """enumerates every reachable match state and its transitions"""
+
+    def __init__(self) -> None:
+        """builds the transition table breadth first from the initial state"""
+        initial = ScoreState(0, 0, 0, 0, 0, 0, False)
+        self.states: List[ScoreState] = [initial]
+        self.next_state: List[int] = []
+        self.events: List[int] = []
+        # games of the finished set for transitions that complete a set
+        self.set_games_one: List[int] = []
+        self.set_games_two: List[int] = []
+
+        index: Dict[ScoreState, int] = {initial: 0}
+        position = 0
+        while position < len(self.states):
+            state = self.states[position]
+            self._append_transition(position, EVENT_POINT, state, state)
+            for player_number in (PLAYER_ONE, PLAYER_TWO):
+                next_state, event = _advance(state, player_number)
+                if next_state not in index:
+                    index[next_state] = len(self.states)
+                    self.states.append(next_state)
+                self._append_transition(index[next_state], event, state, next_state)
+            position += 1
+
+        self.initial = 0
+        self.index = index
+
+    def _append_transition(
+        self, target: int, event: int, state: ScoreState, next_state: ScoreState
+    ) -> None:
+        """stores one transition slot"""
+        self.next_state.append(target)
+        self.events.append(event)
+        if event in (EVENT_SET, EVENT_MATCH):
+            won_by_one = next_state.sets_one > state.sets_one
+            self.set_games_one.append(state.games_one + won_by_one)
+            self.set_games_two.append(state.games_two + (not won_by_one))
+        else:
+            self.set_games_one.append(0)
+            self.set_games_two.append(0)
+
+
+SCORING_TABLE = ScoringTable()
+
+
+def raw_game_points(state: ScoreState, game_points: int) -> Tuple[int, int]:
+    """expands collapsed game points using the number of points in the game"""
+    extra = (game_points - state.points_one - state.points_two) // 2
+    return state.points_one + extra, state.points_two + extra
+
+
+class TableScorer:
+    """scores a match with integer table lookups instead of model objects
+
+    Only the table state, the number of points in the current game and the
+    final score of each completed set are kept, so a full Match can be
+    rebuilt with ``to_match`` once scoring is done. Given a PointHistory,
+    the scorer also records the accepted points and their checkpoints in it
+    and hands it on to the rebuilt Match.
+    """
+
+    def __init__(
+        self,
+        table: ScoringTable = SCORING_TABLE,
+        history: Optional[PointHistory] = None,
+    ) -> None:
+        """initializes scorer at the start of a match"""
+        self.table = table
+        self.state = table.initial
+        self.game_points = 0
+        self.points_played = 0
+        self.completed_sets: List[Tuple[int, int]] = []
+        self.final_game_points: List[Tuple[int, int]] = []
+        self.history = history
+
+    @classmethod
+    def from_state(
+        cls,
+        state: int,
+        game_points: int,
+        points_played: int,
+        completed_sets: List[Tuple[int, int]],
+        final_game_points: List[Tuple[int, int]],
+        table: ScoringTable = SCORING_TABLE,
+        history: Optional[PointHistory] = None,
+    ) -> "TableScorer":
+        """restores a scorer from previously captured state"""
+        scorer = cls.__new__(cls)
+        scorer.table = table
+        scorer.state = state
+        scorer.game_points = game_points
+        scorer.points_played = points_played
+        scorer.completed_sets = completed_sets
+        scorer.final_game_points = final_game_points
+        scorer.history = history
+        return scorer
+
+    @classmethod
+    def from_checkpoint(
+        cls,
+        values: CheckpointValues,
+        points_played: int,
+        completed_sets: List[Tuple[int, int]],
+        final_game_points: List[Tuple[int, int]],
+        table: ScoringTable = SCORING_TABLE,
+    ) -> "TableScorer":
+        """restores a scorer from the values of Match.checkpoint_values"""
+        sets_one, sets_two, games_one, games_two, points_one, points_two = values
+        is_tiebreak = games_one == games_two == GAMES_FOR_TIEBREAK
+        state = ScoreState(
+            sets_one,
+            sets_two,
+            games_one,
+            games_two,
+            *_collapse_points(points_one, points_two, is_tiebreak),
+            is_tiebreak,
+        )
+        return cls.from_state(
+            table.index[state],
+            points_one + points_two,
+            points_played,
+            completed_sets,
+            final_game_points,
+            table,
+        )
+
+    @property
+    def score_state(self) -> ScoreState:
+        """returns decoded current state"""
+        return self.table.states[self.state]
+
+    @property
+    def is_completed(self) -> bool:
+        """checks if match has a winner"""
+        return self.score_state.is_completed
+
+    def record_point(self, player_number: int) -> bool:
+        """records one point, returning False once the match is completed"""
+        return self.record_points((player_number,)) == 1
+
+    def record_points(self, points: Iterable[int]) -> int:
+        """records player numbers until the match completes
+
+        Args:
+            points: Player numbers, each PLAYER_ONE or PLAYER_TWO
+
+        Returns:
+            Number of points accepted before the match completed
+
+        Raises:
+            InvalidPlayerNumberException: If any point is another number;
+                no point is recorded then
+        """
+        points = player_bytes(points)
+        history = self.history
+        if history is None:
+            return self._record_points(points)
+        marks: List[Tuple[int, int]] = []
+        first_mark = CHECKPOINT_INTERVAL - len(history) % CHECKPOINT_INTERVAL
+        accepted = self._record_points(points, first_mark, marks)
+        history.extend(points[:accepted])
+        states = self.table.states
+        for state, game_points in marks:
+            decoded = states[state]
+            points_one, points_two = raw_game_points(decoded, game_points)
+            history.add_checkpoint(
+                decoded.sets_one,
+                decoded.sets_two,
+                decoded.games_one,
+                decoded.games_two,
+                points_one,
+                points_two,
+            )
+        return accepted
+
+    def _record_points(
+        self,
+        points: Iterable[int],
+        mark: int = -1,
+        marks: Optional[List[Tuple[int, int]]] = None,
+    ) -> int:
+        """runs points through the transition table
+
+        Args:
+            points: Player numbers
+            mark: Number of accepted points at which to take the first
+                checkpoint, negative for none
+            marks: Receives the state and game points at every checkpoint
+
+        Returns:
+            Number of points accepted before the match completed
+        """
+        next_state = self.table.next_state
+        events = self.table.events
+        state = self.state
+        game_points = self.game_points
+        accepted = 0
+        for point in points:
+            index = state * SLOTS_PER_STATE + point
+            event = events[index]
+            if event:
+                if event == EVENT_COMPLETED:
+                    break
+                if event != EVENT_GAME:
+                    self._complete_set(state, index, point, game_points)
+                game_points = 0
+            else:
+                game_points += 1
+            state = next_state[index]
+            accepted += 1
+            if accepted == mark:
+                marks.append((state, game_points))
+                mark += CHECKPOINT_INTERVAL
+
+        self.state = state
+        self.game_points = game_points
+        self.points_played += accepted
+        return accepted
+
+    def _complete_set(
+        self, state: int, index: int, player_number: int, game_points: int
+    ) -> None:
+        """stores final set score and the points of its deciding game"""
+        table = self.table
+        self.completed_sets.append(
+            (table.set_games_one[index], table.set_games_two[index])
+        )
+        points_one, points_two = raw_game_points(table.states[state], game_points)
+        if player_number == PLAYER_ONE:
+            points_one += 1
+        else:
+            points_two += 1
+        self.final_game_points.append((points_one, points_two))
+
+    def to_match(self, match_id: str, player_one: str, player_two: str) -> Match:
+        """builds the Match object equivalent to the scored points"""
+        match = Match(match_id, player_one, player_two)
+        match.history = self.history
+        for games, final_points in zip(self.completed_sets, self.final_game_points):
+            add_completed_set(match, games, final_points)
+
+        state = self.score_state
+        if state.is_completed:
+            match._complete_match(
+                player_one if state.sets_one > state.sets_two else player_two
+            )
+            return match
+
+        current_set = build_set(
+            player_one, player_two, state.games_one, state.games_two
+        )
+        current_set.is_tiebreak = state.is_tiebreak
+        current_set.current_game = build_game(
+            player_one,
+            player_two,
+            raw_game_points(state, self.game_points),
+            state.is_tiebreak,
+        )
+        match.current_set = current_set
+        return match
+
+
+def player_bytes(points: Iterable[int]) -> bytes:
+    """packs player numbers into bytes, rejecting anything else
+
+    Any other value would index the wrong slot of the transition table.
+    """
+    if not isinstance(points, (bytes, bytearray, memoryview, list, tuple)):
+        points = tuple(points)
+    try:
+        packed = bytes(points)
+    except (TypeError, ValueError):
+        packed = None
+    if packed is None or packed.translate(None, PLAYER_NUMBERS):
+        invalid = next(
+            point
+            for point in points
+            if not isinstance(point, int) or point not in (PLAYER_ONE, PLAYER_TWO)
+        )
+        raise InvalidPlayerNumberException(f"Invalid player number: {invalid}")
+    return packed
+
+
+def add_completed_set(
+    match: Match, games: Tuple[int, int], final_points: Tuple[int, int]
+) -> None:
+    """appends a finished set to a match being rebuilt, without completing it"""
+    games_one, games_two = games
+    set_obj = build_set(match.player_one, match.player_two, games_one, games_two)
+    set_obj.current_game = build_game(
+        match.player_one, match.player_two, final_points, set_obj.is_tiebreak
+    )
+    set_obj.winner = match.player_one if games_one > games_two else match.player_two
+    match.completed_sets.append(set_obj)
+    match.sets_score.add_point(games_one > games_two)
+
+
+def build_set(
+    player_one: str, player_two: str, games_one: int, games_two: int
+) -> Set:
+    """creates a set with the given games score"""
+    set_obj = Set(player_one, player_two)
+    set_obj.games.player_one = games_one
+    set_obj.games.player_two = games_two
+    set_obj.is_tiebreak = (
+        games_one + games_two > 2 * GAMES_FOR_TIEBREAK
+        and min(games_one, games_two) == GAMES_FOR_TIEBREAK
+    )
+    return set_obj
+
+
+def build_game(
+    player_one: str, player_two: str, points: Tuple[int, int], is_tiebreak: bool
+) -> Game:
+    """creates a game with the given raw points, deciding its winner"""
+    game = (TiebreakGame if is_tiebreak else Game)(player_one, player_two)
+    game.points.player_one, game.points.player_two = points
+    if game._has_winner():
+        game.winner = player_one if points[0] > points[1] else player_two
+    return game
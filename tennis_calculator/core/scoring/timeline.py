@@ -0,0 +1,55 @@
+"""random access to the score of a match after any of its points
+
+The score after point n is rebuilt from the last checkpoint of the match's
+point history at or before n, replaying at most CHECKPOINT_INTERVAL points,
+so a lookup costs the same early or late in a long match.
+"""
+
+from tennis_calculator.core.exceptions import PointNotFoundException
+from tennis_calculator.core.models.history import CHECKPOINT_INTERVAL
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.scoring.table import TableScorer
+
+
+def score_at(match: Match, points: int) -> Match:
+    """rebuilds a match as it stood after its first points
+
+    Args:
+        match: Match with a recorded point history
+        points: Number of points played, from 0 up to the points recorded
+
+    Returns:
+        New Match object holding the score after those points
+
+    Raises:
+        PointNotFoundException: If the match has no point history or fewer
+            points than asked for
+    """
+    history = match.history
+    if history is None:
+        raise PointNotFoundException(
+            f"Points of match {match.match_id} were not recorded"
+        )
+    if not 0 <= points <= len(history):
+        raise PointNotFoundException(
+            f"Match {match.match_id} has {len(history)} points, not {points}"
+        )
+
+    interval = min(points // CHECKPOINT_INTERVAL, history.checkpoint_count())
+    start = interval * CHECKPOINT_INTERVAL
+    if interval:
+        values = history.checkpoint(interval - 1)
+        completed = match.completed_sets[: values[0] + values[1]]
+        scorer = TableScorer.from_checkpoint(
+            values,
+            start,
+            [(s.games.player_one, s.games.player_two) for s in completed],
+            [
+                (s.current_game.points.player_one, s.current_game.points.player_two)
+                for s in completed
+            ],
+        )
+    else:
+        scorer = TableScorer()
+    scorer.record_points(history.points(start, points))
+    return scorer.to_match(match.match_id, match.player_one, match.player_two)
@@ -0,0 +1,257 @@
+"""lockstep batch scoring of many matches with optional NumPy support
+
+All matches advance one point per step through the shared scoring table,
+so each step is a handful of array gathers over the matches still playing.
+Without NumPy, ``score_batch`` scores each match with the pure-Python table
+scorer instead and returns identical summaries.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+from tennis_calculator.core.rules import PLAYER_ONE, PLAYER_TWO, SETS_TO_WIN_MATCH
+from tennis_calculator.core.exceptions import TennisCalculatorException
+from tennis_calculator.core.models.history import CHECKPOINT_INTERVAL, PointHistory
+from tennis_calculator.core.parsers.match_parser import MatchData
+from tennis_calculator.core.scoring.bulk import (
+    MatchSummary,
+    point_players,
+    summarize_players,
+)
+from tennis_calculator.core.scoring.table import (
+    SCORING_TABLE,
+    SLOTS_PER_STATE,
+    EVENT_POINT,
+    EVENT_SET,
+    EVENT_MATCH,
+    EVENT_COMPLETED,
+    TableScorer,
+    raw_game_points,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+MAX_SETS = 2 * SETS_TO_WIN_MATCH - 1
+
+
+def score_batch(
+    matches: Sequence[MatchData], use_numpy: Optional[bool] = None
+) -> List[MatchSummary]:
+    """scores many matches at once
+
+    Args:
+        matches: Parsed matches; points are player numbers, see point_players
+        use_numpy: Force the NumPy (True) or pure-Python (False) backend;
+            by default NumPy is used when installed
+
+    Returns:
+        One summary per match, in input order
+
+    Raises:
+        InvalidMatchFormatException: If a point is neither player, with
+            either backend
+        TennisCalculatorException: If NumPy is requested but not installed
+    """
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+    if use_numpy and not HAS_NUMPY:
+        raise TennisCalculatorException("NumPy is not installed")
+    encoded = [point_players(match.points) for match in matches]
+    if not use_numpy:
+        return [
+            summarize_players(m.match_id, m.player_one, m.player_two, players)
+            for m, players in zip(matches, encoded)
+        ]
+    return _score_batch_numpy(matches, encoded)
+
+
+def player_games(summaries: Sequence[MatchSummary]) -> Dict[str, Tuple[int, int]]:
+    """totals games won and lost per player over scored matches"""
+    totals: Dict[str, Tuple[int, int]] = {}
+    for summary in summaries:
+        for player in (summary.player_one, summary.player_two):
+            won, lost = summary.games_summary(player)
+            total_won, total_lost = totals.get(player, (0, 0))
+            totals[player] = (total_won + won, total_lost + lost)
+    return totals
+
+
+class _TableArrays:
+    """the scoring table as NumPy arrays, with per-transition update terms
+
+    States are stored premultiplied by SLOTS_PER_STATE so a transition index
+    is one addition, and the game point counter update is folded into a
+    multiply-add so no step needs conditional selects.
+    """
+
+    def __init__(self) -> None:
+        table = SCORING_TABLE
+        events = np.array(table.events, dtype=np.int8)
+        self.next_slot = np.array(table.next_state, dtype=np.intp) * SLOTS_PER_STATE
+        self.set_end = (events == EVENT_SET) | (events == EVENT_MATCH)
+        self.accepted = (events != EVENT_COMPLETED).astype(np.int32)
+        self.keep_points = ((events == EVENT_POINT) | ~self.accepted.astype(bool))
+        self.keep_points = self.keep_points.astype(np.int32)
+        self.add_point = (events == EVENT_POINT).astype(np.int32)
+        self.set_games_one = np.array(table.set_games_one, dtype=np.int16)
+        self.set_games_two = np.array(table.set_games_two, dtype=np.int16)
+        self.points_one = np.array([s.points_one for s in table.states], np.int32)
+        self.points_two = np.array([s.points_two for s in table.states], np.int32)
+        self.sets_played = np.array(
+            [s.sets_one + s.sets_two for s in table.states], dtype=np.int16
+        )
+
+
+_ARRAYS: Optional[_TableArrays] = None
+
+
+def _table_arrays() -> _TableArrays:
+    """builds the table arrays on first use"""
+    global _ARRAYS
+    if _ARRAYS is None:
+        _ARRAYS = _TableArrays()
+    return _ARRAYS
+
+
+def _score_batch_numpy(
+    matches: Sequence[MatchData], encoded: Sequence[bytes]
+) -> List[MatchSummary]:
+    """advances all matches in lockstep, longest first
+
+    Each step gathers its points straight from the joined point buffer, so
+    memory stays proportional to the points given rather than to the
+    longest match times the batch size. Stepping stops once every match
+    still holding points is completed, so points after the end of a very
+    long block are never visited.
+
+    Args:
+        matches: Parsed matches
+        encoded: Validated player numbers of each match, from point_players
+    """
+    arrays = _table_arrays()
+    count = len(matches)
+    lengths = np.array([len(points) for points in encoded], dtype=np.int64)
+    flat = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    # Sorting longest first keeps the matches still playing at step t in a
+    # prefix, so each step works on contiguous slices instead of masks.
+    order = np.argsort(-lengths, kind="stable")
+    sorted_lengths = lengths[order]
+    steps = int(sorted_lengths[0]) if count else 0
+    sorted_starts = (np.cumsum(lengths) - lengths)[order]
+    ends_at = sorted_lengths.tolist()
+    size = count
+
+    slot = np.zeros(count, dtype=np.intp)
+    game_points = np.zeros(count, dtype=np.int32)
+    played = np.zeros(count, dtype=np.int32)
+    set_games = np.zeros((count, MAX_SETS, 2), dtype=np.int16)
+    final_points = np.zeros((count, MAX_SETS, 2), dtype=np.int32)
+    # State and game points of the matches still playing every interval
+    checkpoints: List[Tuple[List[int], List[int]]] = []
+
+    for step in range(steps):
+        while ends_at[size - 1] <= step:
+            size -= 1
+        column = flat[sorted_starts[:size] + step]
+        index = slot[:size] + column
+        points = game_points[:size]
+
+        ends = np.flatnonzero(arrays.set_end[index])
+        if ends.size:
+            _record_sets(
+                arrays,
+                ends,
+                index[ends],
+                column[ends],
+                points[ends],
+                set_games,
+                final_points,
+            )
+
+        accepted = arrays.accepted[index]
+        if not accepted.any():
+            break
+        points *= arrays.keep_points[index]
+        points += arrays.add_point[index]
+        played[:size] += accepted
+        slot[:size] = arrays.next_slot[index]
+        if (step + 1) % CHECKPOINT_INTERVAL == 0:
+            checkpoints.append(
+                ((slot[:size] // SLOTS_PER_STATE).tolist(), points.tolist())
+            )
+
+    state = slot // SLOTS_PER_STATE
+    # Flat int lists keep container allocations to the tuples being returned
+    summaries: List[Optional[MatchSummary]] = [None] * count
+    flat_games = set_games.ravel().tolist()
+    flat_points = final_points.ravel().tolist()
+    rows = zip(
+        order.tolist(),
+        state.tolist(),
+        game_points.tolist(),
+        played.tolist(),
+        arrays.sets_played[state].tolist(),
+    )
+    for position, (match_index, final, points, accepted, sets) in enumerate(rows):
+        base = position * MAX_SETS * 2
+        ends = range(base, base + 2 * sets, 2)
+        match = matches[match_index]
+        scorer = TableScorer.from_state(
+            final,
+            points,
+            accepted,
+            [(flat_games[end], flat_games[end + 1]) for end in ends],
+            [(flat_points[end], flat_points[end + 1]) for end in ends],
+            history=_history(encoded[match_index][:accepted], checkpoints, position),
+        )
+        summaries[match_index] = MatchSummary(
+            match.match_id, match.player_one, match.player_two, scorer
+        )
+    return summaries
+
+
+def _history(
+    players: bytes, checkpoints: List[Tuple[List[int], List[int]]], position: int
+) -> PointHistory:
+    """builds the point history of the match in sorted position"""
+    history = PointHistory()
+    history.extend(players)
+    states = SCORING_TABLE.states
+    for interval in checkpoints[: len(players) // CHECKPOINT_INTERVAL]:
+        state = states[interval[0][position]]
+        points_one, points_two = raw_game_points(state, interval[1][position])
+        history.add_checkpoint(
+            state.sets_one,
+            state.sets_two,
+            state.games_one,
+            state.games_two,
+            points_one,
+            points_two,
+        )
+    return history
+
+
+def _record_sets(
+    arrays: _TableArrays,
+    rows: "np.ndarray",
+    index: "np.ndarray",
+    column: "np.ndarray",
+    points: "np.ndarray",
+    set_games: "np.ndarray",
+    final_points: "np.ndarray",
+) -> None:
+    """stores set scores and deciding game points for sets ending this step"""
+    previous = index // SLOTS_PER_STATE
+    set_number = arrays.sets_played[previous]
+    set_games[rows, set_number, 0] = arrays.set_games_one[index]
+    set_games[rows, set_number, 1] = arrays.set_games_two[index]
+
+    base_one = arrays.points_one[previous]
+    base_two = arrays.points_two[previous]
+    extra = (points - base_one - base_two) // 2
+    final_points[rows, set_number, 0] = base_one + extra + (column == PLAYER_ONE)
+    final_points[rows, set_number, 1] = base_two + extra + (column == PLAYER_TWO)
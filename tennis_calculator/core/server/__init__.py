@@ -0,0 +1,31 @@
+"""Long-running servers that answer tournament queries."""
+
+from tennis_calculator.core.server.feed import (
+    DEFAULT_FEED_PATH,
+    FeedClient,
+    ScoreFeed,
+)
+from tennis_calculator.core.server.http_api import (
+    DEFAULT_HTTP_HOST,
+    DEFAULT_HTTP_PORT,
+    HttpQueryServer,
+    run_http_server,
+)
+from tennis_calculator.core.server.unix_socket import (
+    DEFAULT_SOCKET_PATH,
+    QueryClient,
+    QueryServer,
+)
+
+__all__ = [
+    "DEFAULT_FEED_PATH",
+    "DEFAULT_HTTP_HOST",
+    "DEFAULT_HTTP_PORT",
+    "DEFAULT_SOCKET_PATH",
+    "FeedClient",
+    "HttpQueryServer",
+    "QueryClient",
+    "QueryServer",
+    "ScoreFeed",
+    "run_http_server",
+]
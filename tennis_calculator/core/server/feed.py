@@ -0,0 +1,292 @@
+"""handles pushing live score changes to subscribers over a unix domain socket
+
+Clients send ``Subscribe Match <id>`` or ``Subscribe Player <name>`` lines,
+at any time, and receive one line per score change of the matches they
+follow: ``SCORE <id> <score>`` while a match is played and ``FINAL <id>
+<score>`` once it is won. Invalid commands are answered with ``ERR
+<message>``.
+
+Each score change is formatted once and handed to every interested
+subscriber. A subscriber buffers at most one pending line per match, so a
+client that reads slower than points arrive skips intermediate scores and
+only receives the latest. The buffer also holds at most BUFFER_LIMIT
+matches; beyond that the oldest pending line is dropped. Senders write at
+most once per FLUSH_INTERVAL, and publishing never waits on a client
+socket.
+"""
+
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from tennis_calculator.core.exceptions import (
+    InvalidQueryException,
+    MatchNotFoundException,
+    TennisCalculatorException,
+)
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.models.tournament import Tournament
+
+DEFAULT_FEED_PATH = ".tournament_feed.sock"
+ENCODING = "utf-8"
+# Matches with a pending score per subscriber before the oldest is dropped
+BUFFER_LIMIT = 256
+# Seconds a sender waits after each write, letting newer scores replace
+# pending ones instead of waking it for every point
+FLUSH_INTERVAL = 0.05
+
+FeedEvent = Tuple[str, str, str]
+
+
+def encode_event(match: Match) -> bytes:
+    """encodes the current score of a match as an event line"""
+    kind = "FINAL" if match.winner else "SCORE"
+    return f"{kind} {match.match_id} {match.score_display()}\n".encode(ENCODING)
+
+
+def parse_subscription(command: str) -> Tuple[str, str]:
+    """reads the kind, match or player, and the id or name of a subscription"""
+    parts = command.split(None, 2)
+    if len(parts) != 3 or parts[0].lower() != "subscribe":
+        raise InvalidQueryException("Invalid subscription format")
+    kind = parts[1].lower()
+    if kind not in ("match", "player"):
+        raise InvalidQueryException("Subscriptions are to a Match or a Player")
+    return kind, parts[2].strip()
+
+
+class Subscriber:
+    """buffers the latest pending score of each followed match for one client"""
+
+    def __init__(self, limit: int = BUFFER_LIMIT) -> None:
+        """initializes an empty buffer"""
+        self.limit = limit
+        self.pending: "OrderedDict[str, bytes]" = OrderedDict()
+        self.dropped = 0
+        self.closed = False
+        self._ready = threading.Condition()
+
+    def offer(self, match_id: str, line: bytes) -> None:
+        """queues a score line, replacing a pending one for the same match"""
+        with self._ready:
+            if match_id in self.pending:
+                self.dropped += 1
+            elif len(self.pending) >= self.limit:
+                self.pending.popitem(last=False)
+                self.dropped += 1
+            elif not self.pending:
+                # The sender only waits while nothing is pending
+                self._ready.notify()
+            self.pending[match_id] = line
+
+    def take(self) -> List[bytes]:
+        """waits for pending lines and removes them, empty once closed"""
+        with self._ready:
+            while not self.pending and not self.closed:
+                self._ready.wait()
+            lines = list(self.pending.values())
+            self.pending.clear()
+            return lines
+
+    def close(self) -> None:
+        """wakes the sender so it can stop"""
+        with self._ready:
+            self.closed = True
+            self._ready.notify()
+
+
+class FeedRequestHandler(socketserver.StreamRequestHandler):
+    """reads the subscriptions of one client while its sender pushes scores"""
+
+    def handle(self) -> None:
+        """applies subscription lines until the client disconnects"""
+        subscriber = Subscriber(self.server.buffer_limit)
+        sender = threading.Thread(target=self._send, args=(subscriber,), daemon=True)
+        sender.start()
+        try:
+            for raw_command in self.rfile:
+                command = raw_command.decode(ENCODING, errors="replace").strip()
+                if not command:
+                    continue
+                try:
+                    self.server.subscribe(subscriber, *parse_subscription(command))
+                except TennisCalculatorException as exception:
+                    error = f"ERR {' '.join(str(exception).split())}\n"
+                    subscriber.offer("", error.encode(ENCODING))
+        finally:
+            self.server.unsubscribe(subscriber)
+            subscriber.close()
+            sender.join()
+
+    def _send(self, subscriber: Subscriber) -> None:
+        """writes buffered lines to the client until it goes away"""
+        try:
+            while True:
+                lines = subscriber.take()
+                if not lines:
+                    return
+                self.wfile.write(b"".join(lines))
+                time.sleep(self.server.flush_interval)
+        except OSError:
+            subscriber.close()
+
+
+class ScoreFeed(socketserver.ThreadingUnixStreamServer):
+    """publishes score changes of a tournament's matches to subscribers"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: str,
+        tournament: Tournament,
+        buffer_limit: int = BUFFER_LIMIT,
+        flush_interval: float = FLUSH_INTERVAL,
+    ) -> None:
+        """binds the socket and listens to the tournament's score changes"""
+        self.socket_path = socket_path
+        self.tournament = tournament
+        self.buffer_limit = buffer_limit
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._match_subscribers: Dict[str, Set[Subscriber]] = {}
+        self._player_subscribers: Dict[str, Set[Subscriber]] = {}
+        self._remove_stale_socket()
+        super().__init__(socket_path, FeedRequestHandler)
+        tournament.add_score_listener(self.publish)
+
+    def publish(self, match: Match) -> None:
+        """formats a changed score once and offers it to its subscribers"""
+        if (
+            match.match_id not in self._match_subscribers
+            and match.player_one not in self._player_subscribers
+            and match.player_two not in self._player_subscribers
+        ):
+            return
+        with self._lock:
+            subscribers = self._subscribers_of(match)
+            if not subscribers:
+                return
+            line = encode_event(match)
+            for subscriber in subscribers:
+                subscriber.offer(match.match_id, line)
+
+    def subscribe(self, subscriber: Subscriber, kind: str, key: str) -> None:
+        """follows a match id or a player, sending a known match's score now
+
+        The match is looked up like any query, so compacted matches and
+        matches not yet read from the store are sent too. The tournament's
+        read lock is held throughout, so no change is published between the
+        score sent and the subscription. The lookup comes before the feed's
+        own lock, since reading a stored match publishes its score.
+        """
+        index = self._match_subscribers if kind == "match" else self._player_subscribers
+        with self.tournament.lock.reading:
+            match: Optional[Match] = None
+            if kind == "match":
+                try:
+                    match = self.tournament.get_match(key)
+                except MatchNotFoundException:
+                    pass
+            with self._lock:
+                index.setdefault(key, set()).add(subscriber)
+                if match is not None:
+                    subscriber.offer(key, encode_event(match))
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """stops sending scores to a subscriber"""
+        with self._lock:
+            for index in (self._match_subscribers, self._player_subscribers):
+                for key in [key for key, found in index.items() if subscriber in found]:
+                    index[key].discard(subscriber)
+                    if not index[key]:
+                        del index[key]
+
+    def server_close(self) -> None:
+        """stops listening to the tournament, closes the socket and removes it"""
+        self.tournament.remove_score_listener(self.publish)
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def _subscribers_of(self, match: Match) -> Set[Subscriber]:
+        """collects the subscribers of a match and of both its players"""
+        subscribers: Set[Subscriber] = set()
+        for index, key in (
+            (self._match_subscribers, match.match_id),
+            (self._player_subscribers, match.player_one),
+            (self._player_subscribers, match.player_two),
+        ):
+            found = index.get(key)
+            if found:
+                subscribers |= found
+        return subscribers
+
+    def _remove_stale_socket(self) -> None:
+        if not os.path.exists(self.socket_path):
+            return
+        client = FeedClient.connect(self.socket_path)
+        if client is not None:
+            client.close()
+            raise TennisCalculatorException(
+                f"Score feed already running on {self.socket_path}"
+            )
+        os.unlink(self.socket_path)
+
+
+class FeedClient:
+    """subscribes to a running score feed and reads its events"""
+
+    def __init__(self, connection: socket.socket) -> None:
+        """wraps a connected socket"""
+        self.connection = connection
+        self._reader = connection.makefile("rb")
+
+    @classmethod
+    def connect(cls, socket_path: str) -> Optional["FeedClient"]:
+        """connects to the feed, returning None if none is listening"""
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            connection.close()
+            return None
+        return cls(connection)
+
+    def subscribe_match(self, match_id: str) -> None:
+        """follows the score of one match"""
+        self._send(f"Subscribe Match {match_id}")
+
+    def subscribe_player(self, player_name: str) -> None:
+        """follows the scores of every match of a player"""
+        self._send(f"Subscribe Player {player_name}")
+
+    def events(self) -> Iterator[FeedEvent]:
+        """yields (kind, match id, score) for each event until the feed stops"""
+        for raw_line in self._reader:
+            line = raw_line.decode(ENCODING).rstrip("\n")
+            kind, _, detail = line.partition(" ")
+            if kind == "ERR":
+                raise TennisCalculatorException(detail)
+            match_id, _, score = detail.partition(" ")
+            yield kind, match_id, score
+
+    def close(self) -> None:
+        """closes the connection"""
+        self._reader.close()
+        self.connection.close()
+
+    def __enter__(self) -> "FeedClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _send(self, command: str) -> None:
+        if "\n" in command:
+            raise TennisCalculatorException("Subscription must be a single line")
+        self.connection.sendall(f"{command}\n".encode(ENCODING))
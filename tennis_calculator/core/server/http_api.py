@@ -0,0 +1,329 @@
+"""handles answering queries over HTTP with JSON replies
+
+The server runs on asyncio and only uses the standard library. It serves
+
+``GET /matches/{id}/score``
+    ``{"match_id": ..., "result": ...}``, the same text as ``Score Match``.
+    ``?at=<points>`` scores the match after that many points.
+``GET /players/{name}/games``
+    ``{"player": ..., "won": ..., "lost": ...}``
+``POST /query``
+    a JSON list of query strings, answered with a list holding either
+    ``{"result": ...}`` or ``{"error": ...}`` for each query, in order.
+
+Connections are kept alive unless the client asks otherwise, and pipelined
+requests are answered in the order they were sent. Failed requests are
+answered with ``{"error": ...}`` and a 4xx or 5xx status.
+
+When the store changes, it is loaded again on an executor thread while
+requests are still answered from the previous state, which is swapped out
+once the load finishes.
+"""
+
+import asyncio
+import json
+from http import HTTPStatus
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from tennis_calculator.core.exceptions import (
+    InvalidQueryException,
+    MatchNotFoundException,
+    PlayerNotFoundException,
+    PointNotFoundException,
+    TennisCalculatorException,
+)
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.processors.query_processor import QueryProcessor
+from tennis_calculator.core.processors.result_cache import ResultCache
+from tennis_calculator.core.storage.base import TournamentStore
+
+DEFAULT_HTTP_HOST = "127.0.0.1"
+DEFAULT_HTTP_PORT = 8080
+ENCODING = "utf-8"
+# Seconds an idle keep-alive connection is held open
+KEEP_ALIVE_TIMEOUT = 15.0
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+
+_NOT_FOUND = (MatchNotFoundException, PlayerNotFoundException, PointNotFoundException)
+
+Response = Tuple[HTTPStatus, object]
+
+
+class HttpError(TennisCalculatorException):
+    """Raised when a request cannot be answered."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def encode_response(status: HTTPStatus, payload: object, keep_alive: bool) -> bytes:
+    """encodes a JSON response with its status line and headers"""
+    body = json.dumps(payload).encode(ENCODING)
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+class HttpQueryServer:
+    """keeps the tournament in memory and serves queries against it over HTTP"""
+
+    def __init__(
+        self,
+        store: TournamentStore,
+        host: str = DEFAULT_HTTP_HOST,
+        port: int = DEFAULT_HTTP_PORT,
+    ) -> None:
+        """loads the tournament state, the socket is bound by start"""
+        self.store = store
+        self.host = host
+        self.port = port
+        self._state_version: Optional[int] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.StreamWriter] = set()
+        # Set once close has seen every open connection finish
+        self._closed: Optional[asyncio.Event] = None
+        self._reload: Optional["asyncio.Future[None]"] = None
+        # Shared by the processors of every load, see QueryServer
+        self.result_cache = ResultCache()
+        self.query_processor = QueryProcessor(
+            MatchProcessor(), result_cache=self.result_cache
+        )
+        self.reload_if_changed()
+
+    async def start(self) -> None:
+        """binds the socket, a port of 0 is replaced by the one bound"""
+        self._server = await asyncio.start_server(
+            self._serve_connection, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """serves requests until cancelled"""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """stops accepting connections and closes the open ones"""
+        if self._server is not None:
+            self._server.close()
+        if self._reload is not None:
+            self._reload.cancel()
+        if self._connections:
+            self._closed = asyncio.Event()
+            for writer in list(self._connections):
+                writer.close()
+            await self._closed.wait()
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    def reload_if_changed(self) -> QueryProcessor:
+        """reloads the store if it changed since it was last read, blocking"""
+        version = self.store.version()
+        if version != self._state_version:
+            self.query_processor = QueryProcessor(
+                self.store.load(), result_cache=self.result_cache
+            )
+            self._state_version = version
+        return self.query_processor
+
+    def refresh(self) -> None:
+        """starts reloading the store in the background if it changed
+
+        Must be called on the event loop. A reload that failed is reported
+        by raising its exception, and the next call tries again.
+        """
+        reload = self._reload
+        if reload is not None:
+            if not reload.done():
+                return
+            self._reload = None
+            reload.result()
+        version = self.store.version()
+        if version != self._state_version:
+            self._reload = asyncio.ensure_future(self._load(version))
+
+    async def _load(self, version: Optional[int]) -> None:
+        """loads the store on an executor thread and swaps in the new state"""
+        loop = asyncio.get_running_loop()
+        match_processor = await loop.run_in_executor(None, self.store.load)
+        self.query_processor = QueryProcessor(
+            match_processor, result_cache=self.result_cache
+        )
+        self._state_version = version
+
+    def route(self, method: str, target: str, body: bytes) -> Response:
+        """answers one request, returning its status and JSON payload
+
+        Args:
+            method: Request method
+            target: Request target, the path and query string
+            body: Request body
+
+        Returns:
+            Tuple of the response status and the payload to encode
+
+        Raises:
+            HttpError: If the request is not valid for any endpoint
+            TennisCalculatorException: If the query fails
+        """
+        url = urlsplit(target)
+        parts = url.path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "matches" and parts[2] == "score":
+            self._require(method, "GET")
+            return HTTPStatus.OK, self._match_score(unquote(parts[1]), url.query)
+        if len(parts) == 3 and parts[0] == "players" and parts[2] == "games":
+            self._require(method, "GET")
+            return HTTPStatus.OK, self._player_games(unquote(parts[1]))
+        if parts == ["query"]:
+            self._require(method, "POST")
+            return HTTPStatus.OK, self._batch_query(body)
+        raise HttpError(HTTPStatus.NOT_FOUND, f"No endpoint for {url.path}")
+
+    def answer(self, method: str, target: str, body: bytes) -> Response:
+        """answers one request, reporting failures as error payloads"""
+        try:
+            self.refresh()
+            return self.route(method, target, body)
+        except HttpError as exception:
+            return exception.status, {"error": str(exception)}
+        except _NOT_FOUND as exception:
+            return HTTPStatus.NOT_FOUND, {"error": str(exception)}
+        except TennisCalculatorException as exception:
+            return HTTPStatus.BAD_REQUEST, {"error": str(exception)}
+        except Exception as exception:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {
+                "error": f"An unexpected error occurred: {exception}"
+            }
+
+    def _match_score(self, match_id: str, query_string: str) -> Dict[str, str]:
+        points = None
+        at = parse_qs(query_string).get("at")
+        if at:
+            if not at[-1].isdecimal():
+                raise InvalidQueryException("at must be a number of points")
+            points = int(at[-1])
+        return {
+            "match_id": match_id,
+            "result": self.query_processor.handle_parsed_query(
+                ("score", match_id, points)
+            ),
+        }
+
+    def _player_games(self, player_name: str) -> Dict[str, object]:
+        won, lost = self.query_processor.handle_parsed_query(
+            ("games", player_name, None)
+        ).split()
+        return {"player": player_name, "won": int(won), "lost": int(lost)}
+
+    def _batch_query(self, body: bytes) -> List[Dict[str, str]]:
+        try:
+            queries = json.loads(body.decode(ENCODING))
+        except ValueError as exception:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {exception}")
+        if not isinstance(queries, list) or not all(
+            isinstance(query, str) for query in queries
+        ):
+            raise InvalidQueryException("Body must be a JSON list of queries")
+        results = []
+        for result in self.query_processor.answer_queries(queries):
+            if isinstance(result, TennisCalculatorException):
+                results.append({"error": str(result)})
+            else:
+                results.append({"result": result})
+        return results
+
+    @staticmethod
+    def _require(method: str, allowed: str) -> None:
+        if method != allowed:
+            raise HttpError(
+                HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not allowed, use {allowed}"
+            )
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """answers requests from one client until either side closes"""
+        self._connections.add(writer)
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT
+                    )
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(
+                        encode_response(
+                            HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                            {"error": "Request head too large"},
+                            False,
+                        )
+                    )
+                    break
+                try:
+                    method, target, keep_alive, length = _parse_head(head)
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = self.answer(method, target, body)
+                except HttpError as exception:
+                    keep_alive = False
+                    status, payload = exception.status, {"error": str(exception)}
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            if self._closed is not None and not self._connections:
+                self._closed.set()
+            writer.close()
+
+
+def _parse_head(head: bytes) -> Tuple[str, str, bool, int]:
+    """reads the method, target, keep-alive and body length of a request"""
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid request line")
+    if version not in ("HTTP/1.0", "HTTP/1.1"):
+        raise HttpError(
+            HTTPStatus.HTTP_VERSION_NOT_SUPPORTED, f"{version} is not supported"
+        )
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HttpError(HTTPStatus.LENGTH_REQUIRED, "Chunked bodies are not supported")
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if not 0 <= length <= MAX_BODY_BYTES:
+        raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.1":
+        keep_alive = connection != "close"
+    else:
+        keep_alive = connection == "keep-alive"
+    return method, target, keep_alive, length
+
+
+def run_http_server(
+    store: TournamentStore, host: str = DEFAULT_HTTP_HOST, port: int = DEFAULT_HTTP_PORT
+) -> None:
+    """serves HTTP queries until interrupted"""
+    asyncio.run(HttpQueryServer(store, host, port).serve_forever())
@@ -0,0 +1,153 @@
+"""handles answering queries over a unix domain socket
+
+The protocol is line based. Clients send one query per line and the server
+replies with either ``OK <n>`` followed by the ``n`` lines of the result or
+``ERR <message>``. A connection may carry any number of queries.
+"""
+
+import os
+import socket
+import socketserver
+import threading
+from typing import List, Optional
+
+from tennis_calculator.core.exceptions import TennisCalculatorException
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.processors.query_processor import QueryProcessor
+from tennis_calculator.core.processors.result_cache import ResultCache
+from tennis_calculator.core.storage.base import TournamentStore
+
+DEFAULT_SOCKET_PATH = ".tournament.sock"
+ENCODING = "utf-8"
+
+
+def encode_result(result: str) -> bytes:
+    """encodes a successful reply"""
+    lines = result.split("\n")
+    return "\n".join([f"OK {len(lines)}"] + lines + [""]).encode(ENCODING)
+
+
+def encode_error(message: str) -> bytes:
+    """encodes an error reply on a single line"""
+    return f"ERR {' '.join(message.split())}\n".encode(ENCODING)
+
+
+class QueryRequestHandler(socketserver.StreamRequestHandler):
+    """answers queries from one client until it disconnects"""
+
+    def handle(self) -> None:
+        """replies to each non-empty query line"""
+        for raw_query in self.rfile:
+            query = raw_query.decode(ENCODING, errors="replace").strip()
+            if query:
+                self.wfile.write(self.server.answer(query))
+
+
+class QueryServer(socketserver.ThreadingUnixStreamServer):
+    """keeps the tournament in memory and serves queries against it"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, store: TournamentStore) -> None:
+        """loads the tournament state and binds the socket"""
+        self.socket_path = socket_path
+        self.store = store
+        self._state_lock = threading.Lock()
+        self._state_version: Optional[int] = None
+        # Shared by the processors of every load, so answers that did not
+        # change stay cached and the cache counts cover the server's lifetime
+        self.result_cache = ResultCache()
+        self.query_processor = QueryProcessor(
+            MatchProcessor(), result_cache=self.result_cache
+        )
+        self.reload_if_changed()
+        self._remove_stale_socket()
+        super().__init__(socket_path, QueryRequestHandler)
+
+    def answer(self, query: str) -> bytes:
+        """answers one query, reporting failures as error replies"""
+        try:
+            result = self.reload_if_changed().handle_query(query)
+        except TennisCalculatorException as exception:
+            return encode_error(str(exception))
+        except Exception as exception:
+            return encode_error(f"An unexpected error occurred: {exception}")
+        return encode_result(result)
+
+    def reload_if_changed(self) -> QueryProcessor:
+        """reloads the store if it changed since it was last read"""
+        version = self.store.version()
+        with self._state_lock:
+            if version != self._state_version:
+                self.query_processor = QueryProcessor(
+                    self.store.load(), result_cache=self.result_cache
+                )
+                self._state_version = version
+            return self.query_processor
+
+    def server_close(self) -> None:
+        """closes the socket and removes its file"""
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def _remove_stale_socket(self) -> None:
+        if not os.path.exists(self.socket_path):
+            return
+        client = QueryClient.connect(self.socket_path)
+        if client is not None:
+            client.close()
+            raise TennisCalculatorException(
+                f"Query server already running on {self.socket_path}"
+            )
+        os.unlink(self.socket_path)
+
+
+class QueryClient:
+    """sends queries to a running query server"""
+
+    def __init__(self, connection: socket.socket) -> None:
+        """wraps a connected socket"""
+        self.connection = connection
+        self._reader = connection.makefile("rb")
+
+    @classmethod
+    def connect(cls, socket_path: str) -> Optional["QueryClient"]:
+        """connects to the server, returning None if none is listening"""
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            connection.close()
+            return None
+        return cls(connection)
+
+    def query(self, query: str) -> str:
+        """sends a query and returns the result text"""
+        if "\n" in query:
+            raise TennisCalculatorException("Query must be a single line")
+        self.connection.sendall(f"{query.strip()}\n".encode(ENCODING))
+        status, _, detail = self._read_line().partition(" ")
+        if status == "ERR":
+            raise TennisCalculatorException(detail)
+        if status != "OK":
+            raise TennisCalculatorException(f"Invalid server reply: {status}")
+        lines: List[str] = [self._read_line() for _ in range(int(detail))]
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        """closes the connection"""
+        self._reader.close()
+        self.connection.close()
+
+    def __enter__(self) -> "QueryClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _read_line(self) -> str:
+        line = self._reader.readline()
+        if not line:
+            raise TennisCalculatorException("Query server closed the connection")
+        return line.decode(ENCODING).rstrip("\n")
@@ -0,0 +1,56 @@
+"""Persistent stores for tournament state."""
+
+from typing import Optional
+
+from tennis_calculator.core.storage.base import TournamentStore, migrate
+from tennis_calculator.core.storage.indexed_store import (
+    DEFAULT_INDEXED_PATH,
+    IndexedStore,
+    IndexedTournament,
+)
+from tennis_calculator.core.storage.lazy import LazyTournament
+from tennis_calculator.core.storage.log_store import (
+    DEFAULT_LOG_PATH,
+    LogStore,
+    LogTournament,
+)
+from tennis_calculator.core.storage.pickle_store import DEFAULT_PICKLE_PATH, PickleStore
+from tennis_calculator.core.storage.sqlite_store import (
+    DEFAULT_SQLITE_PATH,
+    SqliteStore,
+    SqliteTournament,
+)
+
+# Store kinds selectable from the command line, with their default paths
+STORES = {
+    "sqlite": (SqliteStore, DEFAULT_SQLITE_PATH),
+    "pickle": (PickleStore, DEFAULT_PICKLE_PATH),
+    "log": (LogStore, DEFAULT_LOG_PATH),
+    "indexed": (IndexedStore, DEFAULT_INDEXED_PATH),
+}
+
+
+def open_store(kind: str, path: Optional[str] = None) -> TournamentStore:
+    """opens a store of the given kind at path, or at its default path"""
+    store_class, default_path = STORES[kind]
+    return store_class(path or default_path)
+
+
+__all__ = [
+    "DEFAULT_INDEXED_PATH",
+    "DEFAULT_LOG_PATH",
+    "DEFAULT_PICKLE_PATH",
+    "DEFAULT_SQLITE_PATH",
+    "IndexedStore",
+    "IndexedTournament",
+    "LazyTournament",
+    "LogStore",
+    "LogTournament",
+    "PickleStore",
+    "STORES",
+    "SqliteStore",
+    "SqliteTournament",
+    "TournamentStore",
+    "migrate",
+    "open_store",
+]
@@ -0,0 +1,64 @@
+"""handles the interface shared by tournament stores"""
+
+import os
+from typing import Optional
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+
+
+class TournamentStore:
+    """persists the tournament held by a match processor
+
+    Stores hand out a match processor from load and persist it again with
+    save. Implementations may load matches lazily and persist only the
+    matches changed since they were loaded.
+    """
+
+    def __init__(self, path: str) -> None:
+        """initializes store for a path on disk"""
+        self.path = path
+
+    def exists(self) -> bool:
+        """checks whether the store has been written"""
+        return os.path.exists(self.path)
+
+    def version(self) -> Optional[int]:
+        """returns a token that changes whenever the stored data changes"""
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def load(self) -> MatchProcessor:
+        """loads the stored tournament into a match processor"""
+        raise NotImplementedError
+
+    def save(self, match_processor: MatchProcessor) -> None:
+        """persists the match processor's tournament"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """releases resources held by the store"""
+
+    def __enter__(self) -> "TournamentStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def migrate(source: TournamentStore, target: TournamentStore) -> int:
+    """copies every match from one store into another
+
+    Args:
+        source: Store to read from
+        target: Store to write to, existing matches with the same ID are replaced
+
+    Returns:
+        Number of matches copied
+    """
+    matches = list(source.load().tournament.iter_matches())
+    match_processor = target.load()
+    for match in matches:
+        match_processor.tournament.add_match(match, overwrite=True)
+    target.save(match_processor)
+    return len(matches)
@@ -0,0 +1,387 @@
+"""handles an offset-indexed snapshot read one match at a time
+
+Layout, all integers little endian::
+
+    header          magic "TCIX", version (u8), 3 pad bytes, match count (u32),
+                    player count (u32), then the offsets (u64) of the match
+                    index, player index, player match lists and player names
+    records         per match: match id length (u16), UTF-8 match id and the
+                    pickled match
+    match index     per match, sorted by key hash: key hash (u64), record
+                    offset (u64) and length (u32), player one and player two
+                    (u32 positions in the player index), games won by player
+                    one and by player two (u32)
+    player index    per player, sorted by key hash: key hash (u64), name
+                    offset (u64) and length (u32), first entry and entry count
+                    in the player match lists (u32), games won and lost (u32)
+    player matches  match index positions (u32), grouped by player
+    player names    UTF-8 names, concatenated
+
+Key hashes are the first 8 bytes of the BLAKE2b digest of the UTF-8 id or
+name. Lookups binary search the memory-mapped index and compare the stored
+id or name to rule out collisions, so a score query reads one record and a
+games query one player entry however large the snapshot grows.
+"""
+
+import array
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from tennis_calculator.core.exceptions import TennisCalculatorException
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.storage.base import TournamentStore
+from tennis_calculator.core.storage.lazy import LazyTournament, StoredGames
+
+DEFAULT_INDEXED_PATH = ".tournament.snapshot"
+
+MAGIC = b"TCIX"
+VERSION = 1
+HEADER = struct.Struct("<4sB3xIIQQQQ")
+MATCH_ENTRY = struct.Struct("<QQIIIII")
+PLAYER_ENTRY = struct.Struct("<QQIIIII")
+RECORD_PREFIX = struct.Struct("<H")
+POSITION_TYPECODE = "I"
+
+
+def key_hash(key: str) -> int:
+    """hashes a match id or player name to its 64 bit index key"""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class SnapshotReader:
+    """reads matches and player totals from an indexed snapshot"""
+
+    def __init__(self, data) -> None:
+        """validates the header of snapshot data, e.g. an mmap"""
+        self.data = data
+        if len(data) < HEADER.size:
+            raise TennisCalculatorException("Snapshot file is truncated")
+        (
+            magic,
+            version,
+            self.match_count,
+            self.player_count,
+            self.match_index,
+            self.player_index,
+            self.player_matches,
+            self.player_names,
+        ) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise TennisCalculatorException("Not a tournament snapshot file")
+
+    @classmethod
+    def open(cls, path: str) -> "SnapshotReader":
+        """memory-maps a snapshot file"""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self) -> None:
+        """unmaps the snapshot"""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def find_match(self, match_id: str) -> Optional[int]:
+        """returns the match index position of a match id"""
+        for position in self._candidates(
+            self.match_index, self.match_count, MATCH_ENTRY, key_hash(match_id)
+        ):
+            if self.match_id(position) == match_id:
+                return position
+        return None
+
+    def find_player(self, player_name: str) -> Optional[int]:
+        """returns the player index position of a player name"""
+        for position in self._candidates(
+            self.player_index, self.player_count, PLAYER_ENTRY, key_hash(player_name)
+        ):
+            if self.player_name(position) == player_name:
+                return position
+        return None
+
+    def match_entry(self, position: int) -> Tuple[int, ...]:
+        """unpacks a match index entry"""
+        return MATCH_ENTRY.unpack_from(
+            self.data, self.match_index + position * MATCH_ENTRY.size
+        )
+
+    def player_entry(self, position: int) -> Tuple[int, ...]:
+        """unpacks a player index entry"""
+        return PLAYER_ENTRY.unpack_from(
+            self.data, self.player_index + position * PLAYER_ENTRY.size
+        )
+
+    def match_id(self, position: int) -> str:
+        """reads the match id stored at the start of a record"""
+        offset = self.match_entry(position)[1]
+        (length,) = RECORD_PREFIX.unpack_from(self.data, offset)
+        start = offset + RECORD_PREFIX.size
+        return bytes(self.data[start : start + length]).decode("utf-8")
+
+    def match_state(self, position: int) -> bytes:
+        """returns the pickled match of a record"""
+        _, offset, length = self.match_entry(position)[:3]
+        (id_length,) = RECORD_PREFIX.unpack_from(self.data, offset)
+        return self.data[offset + RECORD_PREFIX.size + id_length : offset + length]
+
+    def record(self, position: int) -> bytes:
+        """returns the raw bytes of a record"""
+        _, offset, length = self.match_entry(position)[:3]
+        return self.data[offset : offset + length]
+
+    def player_name(self, position: int) -> str:
+        """reads a player's name"""
+        _, offset, length = self.player_entry(position)[:3]
+        start = self.player_names + offset
+        return bytes(self.data[start : start + length]).decode("utf-8")
+
+    def player_totals(self, player_name: str) -> Tuple[int, int, int]:
+        """returns a player's match count and games won and lost"""
+        position = self.find_player(player_name)
+        if position is None:
+            return 0, 0, 0
+        _, _, _, _, count, won, lost = self.player_entry(position)
+        return count, won, lost
+
+    def player_match_ids(self, player_name: str) -> List[str]:
+        """lists the ids of a player's matches"""
+        position = self.find_player(player_name)
+        if position is None:
+            return []
+        first, count = self.player_entry(position)[3:5]
+        start = self.player_matches + first * 4
+        positions = array.array(POSITION_TYPECODE)
+        positions.frombytes(self.data[start : start + count * 4])
+        return sorted(self.match_id(match) for match in positions)
+
+    def stored_games(self, position: int) -> StoredGames:
+        """returns the players and games of a match"""
+        player_one, player_two, games_one, games_two = self.match_entry(position)[3:]
+        return (
+            self.player_name(player_one),
+            self.player_name(player_two),
+            games_one,
+            games_two,
+        )
+
+    def _candidates(
+        self, table: int, count: int, entry: struct.Struct, key: int
+    ) -> Iterator[int]:
+        """yields positions of the entries whose key hash equals key"""
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if entry.unpack_from(self.data, table + middle * entry.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        while (
+            low < count
+            and entry.unpack_from(self.data, table + low * entry.size)[0] == key
+        ):
+            yield low
+            low += 1
+
+
+def write_snapshot(
+    path: str, previous: Optional[SnapshotReader], matches: Sequence[Match]
+) -> None:
+    """writes a snapshot of the previous snapshot's matches replaced by matches
+
+    Unchanged records are copied byte for byte; only the given matches are
+    pickled. The file is written beside path and then renamed over it.
+    """
+    replaced = {match.match_id for match in matches}
+    # key hash, record offset and length, players, games
+    entries: List[Tuple[int, int, int, str, str, int, int]] = []
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(bytes(HEADER.size))
+        offset = HEADER.size
+        if previous is not None:
+            for position in range(previous.match_count):
+                match_id = previous.match_id(position)
+                if match_id in replaced:
+                    continue
+                record = previous.record(position)
+                f.write(record)
+                entries.append(
+                    (key_hash(match_id), offset, len(record))
+                    + previous.stored_games(position)
+                )
+                offset += len(record)
+        for match in matches:
+            encoded_id = match.match_id.encode("utf-8")
+            record = b"".join(
+                (
+                    RECORD_PREFIX.pack(len(encoded_id)),
+                    encoded_id,
+                    pickle.dumps(match, pickle.HIGHEST_PROTOCOL),
+                )
+            )
+            f.write(record)
+            entries.append(
+                (key_hash(match.match_id), offset, len(record))
+                + (match.player_one, match.player_two)
+                + match.games_score()
+            )
+            offset += len(record)
+
+        entries.sort()
+        players: Dict[str, List] = {}
+        for position, (*_, player_one, player_two, games_one, games_two) in enumerate(
+            entries
+        ):
+            for player, won, lost in (
+                (player_one, games_one, games_two),
+                (player_two, games_two, games_one),
+            ):
+                totals = players.setdefault(player, [0, 0, []])
+                totals[0] += won
+                totals[1] += lost
+                totals[2].append(position)
+        names = sorted(players, key=key_hash)
+        player_positions = {name: position for position, name in enumerate(names)}
+
+        match_index = offset
+        for key, record_offset, length, player_one, player_two, one, two in entries:
+            f.write(
+                MATCH_ENTRY.pack(
+                    key,
+                    record_offset,
+                    length,
+                    player_positions[player_one],
+                    player_positions[player_two],
+                    one,
+                    two,
+                )
+            )
+        player_index = match_index + len(entries) * MATCH_ENTRY.size
+        encoded_names = [name.encode("utf-8") for name in names]
+        match_lists = array.array(POSITION_TYPECODE)
+        name_offset = 0
+        for name, encoded_name in zip(names, encoded_names):
+            won, lost, positions = players[name]
+            f.write(
+                PLAYER_ENTRY.pack(
+                    key_hash(name),
+                    name_offset,
+                    len(encoded_name),
+                    len(match_lists),
+                    len(positions),
+                    won,
+                    lost,
+                )
+            )
+            match_lists.extend(positions)
+            name_offset += len(encoded_name)
+        player_matches = player_index + len(names) * PLAYER_ENTRY.size
+        f.write(match_lists.tobytes())
+        player_names = player_matches + len(match_lists) * match_lists.itemsize
+        f.write(b"".join(encoded_names))
+
+        f.seek(0)
+        f.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                len(entries),
+                len(names),
+                match_index,
+                player_index,
+                player_matches,
+                player_names,
+            )
+        )
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_path, path)
+
+
+class IndexedTournament(LazyTournament):
+    """tournament that reads single matches from an indexed snapshot"""
+
+    def __init__(self, reader: Optional[SnapshotReader]) -> None:
+        """initializes tournament over a snapshot, or none if not yet written"""
+        super().__init__()
+        self.reader = reader
+
+    def _stored_match(self, match_id: str) -> Optional[bytes]:
+        """reads the pickled state of a stored match"""
+        if self.reader is None:
+            return None
+        position = self.reader.find_match(match_id)
+        return None if position is None else self.reader.match_state(position)
+
+    def _stored_player_totals(self, player_name: str) -> Tuple[int, int, int]:
+        """reads a player's stored match count and games won and lost"""
+        if self.reader is None:
+            return 0, 0, 0
+        return self.reader.player_totals(player_name)
+
+    def _stored_player_ids(self, player_name: str) -> List[str]:
+        """lists the ids of a player's stored matches"""
+        if self.reader is None:
+            return []
+        return self.reader.player_match_ids(player_name)
+
+    def _stored_games(self, match_ids: Sequence[str]) -> List[StoredGames]:
+        """reads the stored players and games of matches"""
+        if self.reader is None:
+            return []
+        positions = [self.reader.find_match(match_id) for match_id in match_ids]
+        return [
+            self.reader.stored_games(position)
+            for position in positions
+            if position is not None
+        ]
+
+
+class IndexedStore(TournamentStore):
+    """stores the tournament as an offset-indexed snapshot file"""
+
+    def __init__(self, path: str = DEFAULT_INDEXED_PATH) -> None:
+        """initializes store for a snapshot path"""
+        super().__init__(path)
+        # Snapshots mapped by the latest loads, oldest first
+        self._readers: List[SnapshotReader] = []
+
+    def load(self) -> MatchProcessor:
+        """maps the snapshot without reading any match
+
+        Servers keep answering from the previous load while a new one is
+        read, so a load unmaps only the snapshots of the loads before it.
+        """
+        reader = self._open_reader()
+        while len(self._readers) > 1:
+            self._readers.pop(0).close()
+        if reader is not None:
+            self._readers.append(reader)
+        return MatchProcessor(IndexedTournament(reader))
+
+    def save(self, match_processor: MatchProcessor) -> None:
+        """rewrites the snapshot with the matches changed since the last save"""
+        matches = match_processor.tournament.pop_dirty_matches()
+        if not matches and self.exists():
+            return
+        previous = self._open_reader()
+        try:
+            write_snapshot(self.path, previous, matches)
+        finally:
+            if previous is not None:
+                previous.close()
+
+    def close(self) -> None:
+        """unmaps every snapshot the store still has mapped"""
+        for reader in self._readers:
+            reader.close()
+        self._readers = []
+
+    def _open_reader(self) -> Optional[SnapshotReader]:
+        if not self.exists():
+            return None
+        return SnapshotReader.open(self.path)
@@ -0,0 +1,159 @@
+"""handles tournaments that read stored matches on demand"""
+
+import pickle
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple
+from tennis_calculator.core.exceptions import (
+    DuplicateMatchException,
+    MatchNotFoundException,
+    PlayerNotFoundException,
+)
+from tennis_calculator.core.models.compact import SetValues
+from tennis_calculator.core.models.history import PointHistory
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.models.tournament import Tournament
+
+# player_one, player_two, games_one, games_two
+StoredGames = Tuple[str, str, int, int]
+
+
+class LazyTournament(Tournament, ABC):
+    """tournament over stored matches that are only read when queried
+
+    Only matches that have been added, changed or read are held in memory.
+    Player totals combine the stored totals with the in-memory matches, so
+    unsaved changes are visible before they are written. Subclasses supply
+    the stored data through the _stored_* methods.
+
+    Reading a stored match adds it to memory and its players to the
+    indexes while only the read side of lock is held. Every lookup that
+    reads those indexes therefore also holds the load lock, so it never
+    sees a load half applied, such as a match counted both as stored and as
+    in memory.
+    """
+
+    def __init__(self) -> None:
+        """initializes tournament with no matches read yet"""
+        super().__init__()
+        self._load_lock = threading.RLock()
+
+    def add_match(self, match: Match, overwrite: bool = False) -> None:
+        """adds match, checking stored matches for duplicates"""
+        with self.lock.writing:
+            replaced = self._replaced_players(match.match_id, overwrite)
+            super().add_match(match, overwrite)
+            self._bump_players(*replaced)
+
+    def add_completed_match(
+        self,
+        match_id: str,
+        player_one: str,
+        player_two: str,
+        sets: List[SetValues],
+        overwrite: bool = False,
+        history: Optional[PointHistory] = None,
+    ) -> None:
+        """adds completed match, checking stored matches for duplicates"""
+        with self.lock.writing:
+            replaced = self._replaced_players(match_id, overwrite)
+            super().add_completed_match(
+                match_id, player_one, player_two, sets, overwrite, history
+            )
+            self._bump_players(*replaced)
+
+    def _replaced_players(self, match_id: str, overwrite: bool) -> Tuple[str, ...]:
+        """returns the players of a stored match that is not in memory
+
+        Replacing such a match changes its players' totals without
+        unindexing anything, so callers bump their versions once the new
+        match is added.
+
+        Raises:
+            DuplicateMatchException: If the match is stored and overwrite
+                is False
+        """
+        if self._in_memory(match_id):
+            return ()
+        stored = self._stored_games([match_id])
+        if not stored:
+            return ()
+        if not overwrite:
+            raise DuplicateMatchException(f"Match {match_id} already exists")
+        player_one, player_two = stored[0][:2]
+        return player_one, player_two
+
+    def get_match(self, match_id: str) -> Match:
+        """retrieves match from memory, reading it from the store if needed"""
+        with self.lock.reading:
+            if self._in_memory(match_id):
+                return super().get_match(match_id)
+            with self._load_lock:
+                if self._in_memory(match_id):
+                    return super().get_match(match_id)
+                state = self._stored_match(match_id)
+                if state is None:
+                    raise MatchNotFoundException(f"Match {match_id} not found")
+                match = pickle.loads(state)
+                # A stored match read back unchanged does not need saving
+                # again, and leaves its players' totals and versions as they are
+                self.matches[match_id] = match
+                self._index_match(match)
+                self._dirty.pop(match_id, None)
+                return match
+
+    def get_player_games(self, player_name: str) -> Tuple[int, int]:
+        """retrieves total games won and lost for player"""
+        with self.lock.reading, self._load_lock:
+            matches, won, lost = self._stored_player_totals(player_name)
+            # Swap the stored contribution of in-memory matches for their current one
+            in_memory: List[str] = []
+            if self.matches or self.compacted:
+                in_memory = [
+                    match_id
+                    for match_id in self._stored_player_ids(player_name)
+                    if self._in_memory(match_id)
+                ]
+            for player_one, player_two, games_one, games_two in self._stored_games(
+                in_memory
+            ):
+                if player_name == player_one:
+                    matches, won, lost = matches - 1, won - games_one, lost - games_two
+                if player_name == player_two:
+                    matches, won, lost = matches - 1, won - games_two, lost - games_one
+            if player_name in self._player_games:
+                games = self._player_games[player_name]
+                matches += len(self._player_matches[player_name])
+                won, lost = won + games[0], lost + games[1]
+            if matches <= 0:
+                raise PlayerNotFoundException(f"Player {player_name} not found")
+            return won, lost
+
+    def get_player_matches(self, player_name: str) -> List[Match]:
+        """retrieves all matches for player, stored matches first"""
+        with self.lock.reading, self._load_lock:
+            match_ids = {
+                match_id: None
+                for match_id in self._stored_player_ids(player_name)
+                if not self._in_memory(match_id)
+            }
+            match_ids.update(self._player_matches.get(player_name, {}))
+            if not match_ids:
+                raise PlayerNotFoundException(f"Player {player_name} not found")
+            return [self.get_match(match_id) for match_id in match_ids]
+
+    @abstractmethod
+    def _stored_match(self, match_id: str) -> Optional[bytes]:
+        """reads the pickled state of a stored match"""
+
+    @abstractmethod
+    def _stored_player_totals(self, player_name: str) -> Tuple[int, int, int]:
+        """reads a player's stored match count and games won and lost"""
+
+    @abstractmethod
+    def _stored_player_ids(self, player_name: str) -> List[str]:
+        """lists the ids of a player's stored matches"""
+
+    @abstractmethod
+    def _stored_games(self, match_ids: Sequence[str]) -> List[StoredGames]:
+        """reads the stored players and games of matches"""
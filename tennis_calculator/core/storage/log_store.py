@@ -0,0 +1,384 @@
+"""handles storing the tournament as a snapshot plus an append-only log
+
+A save appends one record per match upsert, recorded point or undo to the
+log, so its cost depends on what changed rather than on the tournament size.
+Loading reads the last snapshot and replays the log written after it.
+Once the log outgrows the snapshot a new snapshot is written and the log
+restarts, which bounds replay to roughly the cost of reading the snapshot.
+
+Both files start with a generation number. A snapshot with generation ``n``
+contains every record of the logs before generation ``n``, so a log older
+than the snapshot is ignored on load and a crash between writing the
+snapshot and restarting the log never replays a record twice.
+
+Each log record is framed as ``<length><crc32><payload>``. A record cut
+short or failing its checksum, as left by a crash during an append, ends
+the log; loading stops there and the next save truncates it before
+appending. A store remembers how far it has found the log intact, so a
+save only checks the records appended since, by their framing alone, and
+its cost does not grow with the log. Saves hold an exclusive lock on a
+separate lock file, so readers never need one. Loading opens the log before
+the snapshot, so a concurrent compaction is seen either entirely or not at
+all.
+"""
+
+import fcntl
+import logging
+import os
+import pickle
+import struct
+import zlib
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+from tennis_calculator.core.exceptions import TennisCalculatorException
+from tennis_calculator.core.models.compact import SetValues
+from tennis_calculator.core.models.history import PointHistory
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.models.tournament import Tournament
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.storage.base import TournamentStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG_PATH = ".tournament_log"
+SNAPSHOT_FILE = "snapshot"
+LOG_FILE = "log"
+LOCK_FILE = "lock"
+
+LOG_MAGIC = b"TCWL"
+SNAPSHOT_MAGIC = b"TCSS"
+FORMAT_VERSION = 1
+# magic, format version, generation
+FILE_HEADER = struct.Struct("<4sBQ")
+# payload length, crc32 of payload
+RECORD_HEADER = struct.Struct("<II")
+
+# Logs smaller than this are never compacted, however small the snapshot
+MIN_COMPACT_LOG_BYTES = 1 << 20
+
+RECORD_MATCH = "match"
+RECORD_POINT = "point"
+RECORD_UNDO = "undo"
+
+# (RECORD_MATCH, match), (RECORD_POINT, match_id, player_number) or
+# (RECORD_UNDO, match_id, count)
+LogRecord = Union[Tuple[str, Match], Tuple[str, str, int]]
+
+
+def encode_record(record: LogRecord) -> bytes:
+    """frames a record for appending to the log"""
+    payload = pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_header(f: BinaryIO, magic: bytes) -> int:
+    """reads a file header and returns its generation"""
+    header = f.read(FILE_HEADER.size)
+    if len(header) < FILE_HEADER.size:
+        raise TennisCalculatorException(f"{f.name} is truncated")
+    file_magic, version, generation = FILE_HEADER.unpack(header)
+    if file_magic != magic or version != FORMAT_VERSION:
+        raise TennisCalculatorException(f"{f.name} is not a tournament log file")
+    return generation
+
+
+def iter_payloads(f: BinaryIO) -> Iterator[Tuple[bytes, int]]:
+    """yields each record payload and the offset just past it
+
+    Stops at the first incomplete or corrupt record.
+    """
+    while True:
+        header = f.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return
+        length, checksum = RECORD_HEADER.unpack(header)
+        payload = f.read(length)
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            return
+        yield payload, f.tell()
+
+
+def read_records(f: BinaryIO) -> Tuple[List[LogRecord], int]:
+    """reads log records up to the first incomplete or corrupt one
+
+    Returns:
+        The intact records and the offset just past the last of them
+    """
+    records: List[LogRecord] = []
+    end = f.tell()
+    for payload, end in iter_payloads(f):
+        records.append(pickle.loads(payload))
+    return records, end
+
+
+def scan_records(f: BinaryIO) -> int:
+    """checks the framing of log records without decoding them
+
+    Returns:
+        The offset just past the last intact record
+    """
+    end = f.tell()
+    for _, end in iter_payloads(f):
+        pass
+    return end
+
+
+def write_file(path: str, data: bytes) -> None:
+    """writes a file atomically, replacing any previous version"""
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_path, path)
+
+
+class LogTournament(Tournament):
+    """tournament that remembers the changes to append to the log
+
+    Points recorded through record_match_point and taken back through
+    undo_last_point are logged as point and undo events. Matches that are
+    added, or changed directly on the match object, are logged as a full
+    upsert of their state at save time.
+    """
+
+    def __init__(self) -> None:
+        """initializes tournament with no pending changes"""
+        super().__init__()
+        self.pending: List[LogRecord] = []
+        self.upserts: Dict[str, None] = {}
+        # Replayed log records that could not be applied
+        self.skipped_records = 0
+        self._recording_point = False
+
+    def add_match(self, match: Match, overwrite: bool = False) -> None:
+        """adds match and logs it as an upsert"""
+        with self.lock.writing:
+            super().add_match(match, overwrite)
+            self.upserts[match.match_id] = None
+
+    def add_completed_match(
+        self,
+        match_id: str,
+        player_one: str,
+        player_two: str,
+        sets: List[SetValues],
+        overwrite: bool = False,
+        history: Optional[PointHistory] = None,
+    ) -> None:
+        """adds completed match and logs it as an upsert"""
+        with self.lock.writing:
+            super().add_completed_match(
+                match_id, player_one, player_two, sets, overwrite, history
+            )
+            self.upserts[match_id] = None
+
+    def record_match_point(self, match_id: str, player_number: int) -> None:
+        """records point and logs it as a point event"""
+        with self.lock.writing:
+            self._recording_point = True
+            try:
+                super().record_match_point(match_id, player_number)
+            finally:
+                self._recording_point = False
+            self.pending.append((RECORD_POINT, match_id, player_number))
+
+    def undo_last_point(self, match_id: str, count: int = 1) -> None:
+        """takes back points and logs them as an undo event"""
+        with self.lock.writing:
+            self._recording_point = True
+            try:
+                super().undo_last_point(match_id, count)
+            finally:
+                self._recording_point = False
+            self.pending.append((RECORD_UNDO, match_id, count))
+
+    def _update_games(self, match: Match) -> None:
+        """applies a score change, logging changes made outside this class"""
+        super()._update_games(match)
+        if not self._recording_point and self.matches.get(match.match_id) is match:
+            self.upserts[match.match_id] = None
+
+    def pop_log_records(self) -> List[LogRecord]:
+        """returns the records for changes since the last call
+
+        Point events for matches that are upserted in the same batch are
+        dropped, since the upsert already carries their final state.
+        """
+        with self.lock.writing:
+            records: List[LogRecord] = [
+                record for record in self.pending if record[1] not in self.upserts
+            ]
+            records.extend(
+                (RECORD_MATCH, self.get_match(match_id)) for match_id in self.upserts
+            )
+            self.pending = []
+            self.upserts = {}
+            self.pop_dirty_matches()
+            return records
+
+    def replay(self, records: List[LogRecord]) -> None:
+        """applies logged records without logging them again
+
+        A point or undo record that no longer applies is skipped with a
+        warning and counted in skipped_records.
+        """
+        for record in records:
+            if record[0] == RECORD_MATCH:
+                Tournament.add_match(self, record[1], overwrite=True)
+                continue
+            try:
+                if record[0] == RECORD_UNDO:
+                    Tournament.undo_last_point(self, record[1], record[2])
+                else:
+                    Tournament.record_match_point(self, record[1], record[2])
+            except TennisCalculatorException as error:
+                # A writer that loaded before another process replaced the
+                # match may log points that no longer apply
+                self.skipped_records += 1
+                logger.warning(
+                    "Skipped %s record for match %s: %s", record[0], record[1], error
+                )
+        self.upserts = {}
+        self.pop_dirty_matches()
+
+
+class LogStore(TournamentStore):
+    """stores the tournament in a directory holding a snapshot and a log"""
+
+    def __init__(self, path: str = DEFAULT_LOG_PATH) -> None:
+        """opens or creates the store directory"""
+        super().__init__(path)
+        self.snapshot_path = os.path.join(path, SNAPSHOT_FILE)
+        self.log_path = os.path.join(path, LOG_FILE)
+        self.lock_path = os.path.join(path, LOCK_FILE)
+        # Bytes of torn log tail discarded by the last save
+        self.recovered_bytes = 0
+        # Log inode and generation, and the offset up to which it is intact
+        self._verified: Optional[Tuple[Tuple[int, int], int]] = None
+        os.makedirs(path, exist_ok=True)
+        if not os.path.exists(self.log_path):
+            write_file(self.log_path, self._log_header(self._snapshot_generation()))
+
+    def version(self) -> Optional[int]:
+        """returns the log's modification time, which every save changes"""
+        try:
+            return os.stat(self.log_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def load(self) -> MatchProcessor:
+        """reads the snapshot and replays the log written after it"""
+        tournament = LogTournament()
+        with open(self.log_path, "rb") as log:
+            generation = -1
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, "rb") as f:
+                    generation = read_header(f, SNAPSHOT_MAGIC)
+                    matches = pickle.load(f)
+                tournament.replay([(RECORD_MATCH, match) for match in matches])
+            if read_header(log, LOG_MAGIC) >= generation:
+                tournament.replay(read_records(log)[0])
+        return MatchProcessor(tournament)
+
+    def save(self, match_processor: MatchProcessor) -> None:
+        """appends the changes since the last save, compacting if needed"""
+        tournament = match_processor.tournament
+        if not isinstance(tournament, LogTournament):
+            raise TennisCalculatorException(
+                "Tournament was not loaded from a log store"
+            )
+        records = tournament.pop_log_records()
+        with open(self.lock_path, "wb") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            # Opened under the lock, as compaction replaces the log file
+            with open(self.log_path, "r+b") as f:
+                self.recovered_bytes = self._recover(f)
+                if records:
+                    f.write(b"".join(encode_record(record) for record in records))
+                    f.flush()
+                    os.fsync(f.fileno())
+                log_size = f.tell()
+                self._verified = self._log_identity(f), log_size
+            if self._should_compact(log_size):
+                self._compact()
+
+    def compact(self) -> None:
+        """writes a snapshot of the stored tournament and starts an empty log"""
+        with open(self.lock_path, "wb") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._compact()
+
+    def _compact(self) -> None:
+        """compacts the log, the caller holding the lock
+
+        The snapshot is built from the files rather than from the caller's
+        tournament, which may not include records saved by other processes.
+        """
+        generation = self._log_generation() + 1
+        matches = list(self.load().tournament.iter_matches())
+        write_file(
+            self.snapshot_path,
+            FILE_HEADER.pack(SNAPSHOT_MAGIC, FORMAT_VERSION, generation)
+            + pickle.dumps(matches, pickle.HIGHEST_PROTOCOL),
+        )
+        write_file(self.log_path, self._log_header(generation))
+
+    def _should_compact(self, log_size: int) -> bool:
+        """checks whether replaying the log costs more than the snapshot"""
+        log_bytes = log_size - FILE_HEADER.size
+        snapshot_bytes = (
+            os.path.getsize(self.snapshot_path)
+            if os.path.exists(self.snapshot_path)
+            else 0
+        )
+        return log_bytes > max(MIN_COMPACT_LOG_BYTES, snapshot_bytes)
+
+    def _recover(self, f: BinaryIO) -> int:
+        """truncates a torn or corrupt tail, leaving f at the end of the log
+
+        Records before the offset this store last found intact are skipped,
+        unless the log has since been compacted or shrunk.
+
+        Returns:
+            Number of bytes discarded
+        """
+        size = f.seek(0, os.SEEK_END)
+        f.seek(0)
+        read_header(f, LOG_MAGIC)
+        if self._verified is not None:
+            identity, offset = self._verified
+            if identity == self._log_identity(f) and offset <= size:
+                f.seek(offset)
+        end = scan_records(f)
+        if end < size:
+            f.truncate(end)
+            f.seek(end)
+            os.fsync(f.fileno())
+        return size - end
+
+    @staticmethod
+    def _log_identity(f: BinaryIO) -> Tuple[int, int]:
+        """identifies an open log by its inode and header generation
+
+        Compaction replaces the log with a file of a newer generation, so a
+        reused inode number is still told apart.
+        """
+        position = f.tell()
+        f.seek(0)
+        generation = read_header(f, LOG_MAGIC)
+        f.seek(position)
+        return os.fstat(f.fileno()).st_ino, generation
+
+    def _snapshot_generation(self) -> int:
+        if not os.path.exists(self.snapshot_path):
+            return 0
+        with open(self.snapshot_path, "rb") as f:
+            return read_header(f, SNAPSHOT_MAGIC)
+
+    def _log_generation(self) -> int:
+        with open(self.log_path, "rb") as f:
+            return read_header(f, LOG_MAGIC)
+
+    @staticmethod
+    def _log_header(generation: int) -> bytes:
+        return FILE_HEADER.pack(LOG_MAGIC, FORMAT_VERSION, generation)
@@ -0,0 +1,26 @@
+"""handles storing the whole match processor as one pickle"""
+
+import os
+import pickle
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.storage.base import TournamentStore
+
+DEFAULT_PICKLE_PATH = ".tournament_data"
+
+
+class PickleStore(TournamentStore):
+    """reads and rewrites the full tournament on every load and save"""
+
+    def load(self) -> MatchProcessor:
+        """unpickles the match processor, or creates an empty one"""
+        if not os.path.exists(self.path):
+            return MatchProcessor()
+        with open(self.path, "rb") as f:
+            return pickle.load(f)
+
+    def save(self, match_processor: MatchProcessor) -> None:
+        """pickles the whole match processor, compacting completed matches"""
+        match_processor.tournament.pop_dirty_matches()
+        match_processor.tournament.compact()
+        with open(self.path, "wb") as f:
+            pickle.dump(match_processor, f)
@@ -0,0 +1,220 @@
+"""handles storing matches and player totals in a sqlite database
+
+Each match is stored as its own row, with its set scores and its share of
+the per-player game totals alongside. Queries read single rows instead of
+the whole tournament and saves upsert only the matches a run touched.
+"""
+
+import pickle
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.storage.base import TournamentStore
+from tennis_calculator.core.storage.lazy import LazyTournament, StoredGames
+
+DEFAULT_SQLITE_PATH = ".tournament.db"
+
+# Keeps IN (...) lists below sqlite's default host parameter limit
+QUERY_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    match_id TEXT PRIMARY KEY,
+    player_one TEXT NOT NULL,
+    player_two TEXT NOT NULL,
+    games_one INTEGER NOT NULL,
+    games_two INTEGER NOT NULL,
+    winner TEXT,
+    state BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matches_player_one ON matches (player_one);
+CREATE INDEX IF NOT EXISTS matches_player_two ON matches (player_two);
+CREATE TABLE IF NOT EXISTS set_scores (
+    match_id TEXT NOT NULL,
+    set_number INTEGER NOT NULL,
+    games_one INTEGER NOT NULL,
+    games_two INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    PRIMARY KEY (match_id, set_number)
+);
+CREATE TABLE IF NOT EXISTS players (
+    player TEXT PRIMARY KEY,
+    matches INTEGER NOT NULL,
+    games_won INTEGER NOT NULL,
+    games_lost INTEGER NOT NULL
+);
+"""
+
+
+def set_score_rows(match: Match) -> List[Tuple[str, int, int, int, int]]:
+    """lists a match's set scores as set_scores rows"""
+    sets = [(set_obj, 1) for set_obj in match.completed_sets]
+    if match.current_set is not None:
+        sets.append((match.current_set, 0))
+    return [
+        (
+            match.match_id,
+            number,
+            set_obj.games.player_one,
+            set_obj.games.player_two,
+            completed,
+        )
+        for number, (set_obj, completed) in enumerate(sets, 1)
+    ]
+
+
+class SqliteTournament(LazyTournament):
+    """tournament that reads matches and player totals from sqlite on demand"""
+
+    def __init__(self, connection: sqlite3.Connection, lock: threading.Lock) -> None:
+        """initializes tournament over an open database"""
+        super().__init__()
+        self.connection = connection
+        self.connection_lock = lock
+
+    def _stored_match(self, match_id: str) -> Optional[bytes]:
+        """reads the pickled state of a stored match"""
+        with self.connection_lock:
+            row = self.connection.execute(
+                "SELECT state FROM matches WHERE match_id = ?", (match_id,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def _stored_player_totals(self, player_name: str) -> Tuple[int, int, int]:
+        """reads a player's stored match count and games won and lost"""
+        with self.connection_lock:
+            row = self.connection.execute(
+                "SELECT matches, games_won, games_lost FROM players WHERE player = ?",
+                (player_name,),
+            ).fetchone()
+        return row if row is not None else (0, 0, 0)
+
+    def _stored_player_ids(self, player_name: str) -> List[str]:
+        """lists the ids of a player's stored matches"""
+        with self.connection_lock:
+            rows = self.connection.execute(
+                "SELECT match_id FROM matches WHERE player_one = ? "
+                "UNION SELECT match_id FROM matches WHERE player_two = ? "
+                "ORDER BY match_id",
+                (player_name, player_name),
+            ).fetchall()
+        return [match_id for (match_id,) in rows]
+
+    def _stored_games(self, match_ids: Sequence[str]) -> List[StoredGames]:
+        """reads the stored players and games of matches"""
+        return read_stored_games(self.connection, self.connection_lock, match_ids)
+
+
+def read_stored_games(
+    connection: sqlite3.Connection, lock: threading.Lock, match_ids: Sequence[str]
+) -> List[StoredGames]:
+    """reads players and games of stored matches, skipping unknown ids"""
+    rows: List[StoredGames] = []
+    for start in range(0, len(match_ids), QUERY_BATCH_SIZE):
+        batch = match_ids[start : start + QUERY_BATCH_SIZE]
+        placeholders = ", ".join("?" * len(batch))
+        with lock:
+            rows.extend(
+                connection.execute(
+                    "SELECT player_one, player_two, games_one, games_two "
+                    f"FROM matches WHERE match_id IN ({placeholders})",
+                    batch,
+                ).fetchall()
+            )
+    return rows
+
+
+class SqliteStore(TournamentStore):
+    """stores the tournament in a sqlite database, one row per match"""
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH) -> None:
+        """opens or creates the database"""
+        super().__init__(path)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock:
+            self.connection.executescript(SCHEMA)
+
+    def load(self) -> MatchProcessor:
+        """returns a match processor over a lazily loaded tournament"""
+        return MatchProcessor(SqliteTournament(self.connection, self.lock))
+
+    def save(self, match_processor: MatchProcessor) -> None:
+        """upserts the matches added or changed since the last save"""
+        matches = match_processor.tournament.pop_dirty_matches()
+        if not matches:
+            return
+        player_deltas: Dict[str, List[int]] = {}
+        for player_one, player_two, games_one, games_two in read_stored_games(
+            self.connection, self.lock, [match.match_id for match in matches]
+        ):
+            self._add_player_games(
+                player_deltas, player_one, player_two, games_one, games_two, -1
+            )
+        match_rows = []
+        set_rows = []
+        for match in matches:
+            games_one, games_two = match.games_score()
+            self._add_player_games(
+                player_deltas, match.player_one, match.player_two, games_one, games_two
+            )
+            match_rows.append(
+                (
+                    match.match_id,
+                    match.player_one,
+                    match.player_two,
+                    games_one,
+                    games_two,
+                    match.winner,
+                    pickle.dumps(match, pickle.HIGHEST_PROTOCOL),
+                )
+            )
+            set_rows.extend(set_score_rows(match))
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "DELETE FROM set_scores WHERE match_id = ?",
+                [(match.match_id,) for match in matches],
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?, ?)",
+                match_rows,
+            )
+            self.connection.executemany(
+                "INSERT INTO set_scores VALUES (?, ?, ?, ?, ?)", set_rows
+            )
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO players VALUES (?, 0, 0, 0)",
+                [(player,) for player in player_deltas],
+            )
+            self.connection.executemany(
+                "UPDATE players SET matches = matches + ?, "
+                "games_won = games_won + ?, games_lost = games_lost + ? "
+                "WHERE player = ?",
+                [(*delta, player) for player, delta in player_deltas.items()],
+            )
+            self.connection.execute("DELETE FROM players WHERE matches <= 0")
+
+    def close(self) -> None:
+        """closes the database connection"""
+        self.connection.close()
+
+    @staticmethod
+    def _add_player_games(
+        player_deltas: Dict[str, List[int]],
+        player_one: str,
+        player_two: str,
+        games_one: int,
+        games_two: int,
+        sign: int = 1,
+    ) -> None:
+        """accumulates one match's contribution to the player totals"""
+        for player, won, lost in (
+            (player_one, games_one, games_two),
+            (player_two, games_two, games_one),
+        ):
+            delta = player_deltas.setdefault(player, [0, 0, 0])
+            delta[0] += sign
+            delta[1] += sign * won
+            delta[2] += sign * lost
@@ -0,0 +1,77 @@
+"""verifies columnar storage of completed matches"""
+
+import pickle
+import random
+
+import pytest
+from tennis_calculator.core.models.compact import MIN_DEAD_ROWS, CompactMatches
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.rules import PLAYER_ONE, PLAYER_TWO
+
+
+def random_match(match_id, seed):
+    """Play a complete match with random points."""
+    rng = random.Random(seed)
+    match = Match(match_id, f"Player {seed}", "Player X")
+    while not match.winner:
+        match.record_point(PLAYER_ONE if rng.random() < 0.5 else PLAYER_TWO)
+    return match
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_rebuilt_match_is_equal(seed):
+    """verifies a stored match is rebuilt exactly"""
+    match = random_match("01", seed)
+    compacted = CompactMatches()
+    compacted.add(match)
+    rebuilt = compacted.to_match("01")
+    assert rebuilt == match
+    assert rebuilt.score_display() == compacted.score_display("01")
+    assert rebuilt.games_score() == compacted.games_score("01")
+    assert rebuilt.winner == compacted.winner("01")
+    assert rebuilt.result == compacted.sets_score("01")
+
+
+def test_players_are_interned():
+    """verifies player names are stored once"""
+    compacted = CompactMatches()
+    for number in range(5):
+        compacted.add(random_match(f"{number:02d}", 1))
+    assert compacted.players == ["Player 1", "Player X"]
+    assert len(compacted) == 5
+
+
+def test_incomplete_match_rejected():
+    """verifies only completed matches are stored"""
+    with pytest.raises(ValueError):
+        CompactMatches().add(Match("01", "A", "B"))
+
+
+def test_pickle_drops_removed_rows():
+    """verifies removed rows are not pickled"""
+    compacted = CompactMatches()
+    compacted.add(random_match("01", 1))
+    compacted.add(random_match("02", 2))
+    compacted.remove("01")
+    restored = pickle.loads(pickle.dumps(compacted))
+    assert list(restored) == ["02"]
+    assert restored.match_ids == ["02"]
+    assert restored.to_match("02") == compacted.to_match("02")
+
+
+def test_dead_rows_are_reclaimed():
+    """verifies overwritten and removed rows do not grow the columns forever"""
+    compacted = CompactMatches()
+    kept = random_match("kept", 1)
+    compacted.add(kept)
+    for number in range(4 * MIN_DEAD_ROWS):
+        compacted.add_sets("01", "A", f"B{number}", [(6, 0, 4, 0), (6, 0, 4, 0)])
+        compacted.add_sets(f"{number}", "A", "C", [(6, 0, 4, 0)])
+        compacted.remove(f"{number}")
+    assert list(compacted) == ["kept", "01"]
+    assert len(compacted.match_ids) <= 2 * MIN_DEAD_ROWS + 2
+    assert len(compacted.set_games_one) <= 2 * len(compacted.match_ids)
+    assert len(compacted.players) <= len(compacted.match_ids) + 4
+    assert compacted.to_match("kept") == kept
+    assert compacted.get_players("01") == ("A", f"B{4 * MIN_DEAD_ROWS - 1}")
+    assert compacted.score_display("01") == "6-0, 6-0"
@@ -0,0 +1,82 @@
+"""verifies point histories and their checkpoints"""
+
+import pickle
+import random
+
+import pytest
+from tennis_calculator.core.models.history import CHECKPOINT_INTERVAL, PointHistory
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.rules import PLAYER_ONE, PLAYER_TWO
+
+
+def _players(count, seed=5):
+    rng = random.Random(seed)
+    return bytes(rng.choice((PLAYER_ONE, PLAYER_TWO)) for _ in range(count))
+
+
+@pytest.mark.parametrize("split", [0, 3, 8, 13])
+def test_extend_matches_append(split):
+    """verifies bulk and single point recording store the same bits"""
+    players = _players(70)
+    appended = PointHistory()
+    for player_number in players:
+        appended.append(player_number)
+    extended = PointHistory()
+    extended.extend(players[:split])
+    extended.extend(players[split:])
+    assert extended == appended
+    assert len(extended) == 70
+
+
+def test_points_slices():
+    """verifies any range of points is read back in order"""
+    players = _players(100)
+    history = PointHistory()
+    history.extend(players)
+    for start, stop in [(0, 100), (0, 0), (5, 6), (7, 41), (64, 100)]:
+        assert history.points(start, stop) == players[start:stop]
+
+
+@pytest.mark.parametrize("length", [0, 31, 32, 40, 64])
+def test_truncate(length):
+    """verifies truncating keeps the first points and their checkpoints"""
+    players = _players(70)
+    history = PointHistory()
+    history.extend(players)
+    history.add_checkpoint(0, 0, 1, 0, 0, 0)
+    history.add_checkpoint(0, 0, 2, 0, 0, 0)
+    history.truncate(length)
+    expected = PointHistory()
+    expected.extend(players[:length])
+    assert history.points(0, length) == expected.points(0, length)
+    assert history.bits == expected.bits
+    assert history.checkpoint_count() == length // CHECKPOINT_INTERVAL
+
+
+def test_serialization_round_trip():
+    """verifies bytes and pickles restore points and checkpoints"""
+    history = PointHistory()
+    history.extend(_players(45))
+    history.add_checkpoint(1, 0, 2, 3, 4, 3)
+    restored = PointHistory.from_bytes(history.to_bytes())
+    assert restored == history
+    assert restored.checkpoint(0) == (1, 0, 2, 3, 4, 3)
+    assert pickle.loads(pickle.dumps(history)) == history
+
+
+def test_match_checkpoints_every_interval():
+    """verifies recorded points checkpoint the match score"""
+    match = Match("01", "A", "B")
+    for _ in range(CHECKPOINT_INTERVAL):
+        match.record_point(PLAYER_ONE)
+    assert len(match.history) == CHECKPOINT_INTERVAL
+    assert match.history.checkpoint_count() == 1
+    assert match.history.checkpoint(0) == (1, 0, 2, 0, 0, 0)
+
+
+def test_match_reset_clears_history():
+    """verifies reset starts a new history"""
+    match = Match("01", "A", "B")
+    match.record_point(PLAYER_TWO)
+    match.reset()
+    assert len(match.history) == 0
@@ -1,7 +1,10 @@
 """verifies match scoring functionality"""
 
+import pickle
+import random
+
 import pytest
-from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.models.match import UNDO_LIMIT, Match
 from tennis_calculator.core.rules import (
     PLAYER_ONE,
     PLAYER_TWO,
@@ -11,6 +14,7 @@ from tennis_calculator.core.rules import (
 from tennis_calculator.core.exceptions import (
     InvalidPlayerNumberException,
     MatchCompletedException,
+    PointNotFoundException,
 )
 
 
@@ -90,3 +94,88 @@ class TestMatch:
         """verifies not started match display"""
         match = Match("01", "Player One", "Player Two")
         assert match.score_display() == "0-0"
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_undo_matches_replay(self, seed):
+        """verifies undone points leave the score of a shorter replay"""
+        rng = random.Random(seed)
+        match = Match("01", "Player One", "Player Two")
+        players = []
+        while not match.winner:
+            players.append(rng.choice((PLAYER_ONE, PLAYER_TWO)))
+            match.record_point(players[-1])
+        for count in (1, 3, 20):
+            match.undo_last_point(count)
+            del players[-count:]
+            replayed = Match("01", "Player One", "Player Two")
+            for player_number in players:
+                replayed.record_point(player_number)
+            assert match == replayed
+            assert match.score_display() == replayed.score_display()
+            assert match.history == replayed.history
+
+    def test_undo_across_several_sets(self):
+        """verifies an undo spanning two completed sets reopens both"""
+        players = [PLAYER_ONE] * 24 + [PLAYER_TWO] * 24 + [PLAYER_ONE] * 20
+        match = Match("01", "Player One", "Player Two")
+        for player_number in players:
+            match.record_point(player_number)
+        match.undo_last_point(48)
+        replayed = Match("01", "Player One", "Player Two")
+        for player_number in players[:20]:
+            replayed.record_point(player_number)
+        assert match == replayed
+        assert match.score_display() == "5-0"
+        assert match.games_score() == (5, 0)
+        for player_number in players[20:]:
+            match.record_point(player_number)
+            replayed.record_point(player_number)
+        assert match == replayed
+        assert len(match.completed_sets) == 2
+
+    def test_undo_match_completion(self):
+        """verifies undoing the winning point reopens the match"""
+        match = Match("01", "Player One", "Player Two")
+        for _ in range(48):
+            match.record_point(PLAYER_ONE)
+        match.undo_last_point()
+        assert match.winner is None
+        assert match.result is None
+        assert match.score_display() == "6-0, 5-0 (40-0)"
+        match.record_point(PLAYER_TWO)
+        assert match.score_display() == "6-0, 5-0 (40-15)"
+
+    def test_undo_limit(self):
+        """verifies only the latest points can be undone"""
+        match = Match("01", "Player One", "Player Two")
+        with pytest.raises(PointNotFoundException):
+            match.undo_last_point()
+        # Alternating points stay in one deuce game
+        for number in range(UNDO_LIMIT + 10):
+            match.record_point(PLAYER_ONE if number % 2 else PLAYER_TWO)
+        with pytest.raises(PointNotFoundException):
+            match.undo_last_point(UNDO_LIMIT + 1)
+        restored = pickle.loads(pickle.dumps(match))
+        restored.undo_last_point(UNDO_LIMIT)
+        assert len(restored.history) == 10
+
+    def test_undo_log_kept_only_while_live(self):
+        """verifies undo scores are packed, dropped on completion and not pickled"""
+        match = Match("01", "Player One", "Player Two")
+        # Alternating points stay in one deuce game
+        for number in range(UNDO_LIMIT + 10):
+            match.record_point(PLAYER_ONE if number % 2 else PLAYER_TWO)
+        assert isinstance(match.undo_log, bytearray)
+        assert "undo_log" not in match.__getstate__()
+        restored = pickle.loads(pickle.dumps(match))
+        assert restored.undo_log is None
+        restored.undo_last_point(3)
+        match.undo_last_point(3)
+        assert restored == match
+        match = Match("02", "Player One", "Player Two")
+        while not match.winner:
+            match.record_point(PLAYER_ONE)
+        assert match.undo_log is None
+        # The winning point is undone by replaying the point history
+        match.undo_last_point()
+        assert match.score_display() == "6-0, 5-0 (40-0)"
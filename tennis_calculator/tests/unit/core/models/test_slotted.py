@@ -0,0 +1,54 @@
+"""verifies slotted model classes"""
+
+import pickle
+
+import pytest
+from tennis_calculator.core.models.game import Game
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.models.points import PlayerPoints
+from tennis_calculator.core.models.set import Set, TiebreakGame
+from tennis_calculator.core.rules import PLAYER_ONE, PLAYER_TWO
+
+
+@pytest.mark.parametrize(
+    "instance",
+    [
+        PlayerPoints(),
+        Game("A", "B"),
+        TiebreakGame("A", "B"),
+        Set("A", "B"),
+        Match("01", "A", "B"),
+    ],
+    ids=lambda instance: type(instance).__name__,
+)
+def test_models_have_no_instance_dict(instance):
+    """verifies models store attributes in slots only"""
+    assert not hasattr(instance, "__dict__")
+    with pytest.raises(AttributeError):
+        instance.unknown_attribute = 1
+
+
+def test_init_false_defaults_are_set():
+    """verifies defaults of non-init fields survive the slot conversion"""
+    match = Match("01", "A", "B")
+    assert match.winner is None
+    assert match.result is None
+    assert match.current_set.winner is None
+    assert match.current_set.is_tiebreak is False
+
+
+def test_pickle_round_trip():
+    """verifies the __getstate__/__setstate__ contract is kept"""
+    match = Match("01", "A", "B")
+    for point in [PLAYER_ONE] * 30 + [PLAYER_TWO] * 5:
+        match.record_point(point)
+    restored = pickle.loads(pickle.dumps(match))
+    assert restored == match
+    assert restored.score_display() == match.score_display()
+
+
+def test_setstate_accepts_dict_state():
+    """verifies state dicts written before slots still restore"""
+    points = PlayerPoints.__new__(PlayerPoints)
+    points.__setstate__({"player_one": 3, "player_two": 1})
+    assert points == PlayerPoints(3, 1)
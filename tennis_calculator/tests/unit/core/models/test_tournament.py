@@ -1,5 +1,7 @@
 """Unit tests for Tournament model."""
 
+import pickle
+
 import pytest
 from tennis_calculator.core.models.tournament import Tournament
 from tennis_calculator.core.models.match import Match
@@ -8,6 +10,7 @@ from tennis_calculator.core.exceptions import (
     MatchNotFoundException,
     PlayerNotFoundException,
     DuplicateMatchException,
+    PointNotFoundException,
 )
 
 
@@ -75,3 +78,208 @@ class TestTournament:
         won, lost = tournament.get_player_games("Player Two")
         assert won == 0
         assert lost == 1
+
+    def test_player_games_follow_recorded_points(self):
+        """Test running totals update through record_match_point."""
+        tournament = Tournament()
+        tournament.add_match(Match("01", "Player One", "Player Two"))
+        tournament.add_match(Match("02", "Player Two", "Player Three"))
+        for _ in range(4):
+            tournament.record_match_point("01", 2)
+            tournament.record_match_point("02", 1)
+        assert tournament.get_player_games("Player Two") == (2, 0)
+        assert tournament.get_player_games("Player One") == (0, 1)
+        assert tournament.get_player_games("Player Three") == (0, 1)
+
+    def test_undo_rolls_back_player_totals(self):
+        """Test undoing points rolls back games and marks the match dirty."""
+        tournament = Tournament()
+        tournament.add_match(Match("01", "Player One", "Player Two"))
+        for _ in range(8):
+            tournament.record_match_point("01", 1)
+        tournament.pop_dirty_matches()
+        tournament.undo_last_point("01", 2)
+        assert tournament.get_player_games("Player One") == (1, 0)
+        assert tournament.get_player_games("Player Two") == (0, 1)
+        assert tournament.get_match_score("01") == "1-0 (30-0)"
+        assert [match.match_id for match in tournament.pop_dirty_matches()] == ["01"]
+
+    def test_undo_on_compacted_match(self):
+        """Test undoing a compacted match changes the stored score and totals."""
+        tournament = Tournament()
+        tournament.add_match(Match("01", "Player One", "Player Two"))
+        for _ in range(48):
+            tournament.record_match_point("01", 1)
+        tournament.compact()
+        tournament.pop_dirty_matches()
+        changes = []
+        tournament.add_score_listener(lambda match: changes.append(match.match_id))
+        tournament.undo_last_point("01")
+        assert "01" in tournament.matches and "01" not in tournament.compacted
+        assert tournament.get_match_score("01") == "6-0, 5-0 (40-0)"
+        assert tournament.get_player_games("Player One") == (11, 0)
+        assert tournament.get_player_games("Player Two") == (0, 11)
+        assert changes == ["01"]
+        assert [match.match_id for match in tournament.pop_dirty_matches()] == ["01"]
+        tournament.record_match_point("01", 1)
+        assert tournament.get_player_games("Player One") == (12, 0)
+
+    def test_undo_on_compacted_match_without_history(self):
+        """Test matches compacted without their points cannot be undone."""
+        tournament = Tournament()
+        tournament.add_completed_match(
+            "01", "Player One", "Player Two", [(6, 0, 4, 0), (6, 0, 4, 0)]
+        )
+        with pytest.raises(PointNotFoundException):
+            tournament.undo_last_point("01")
+        assert tournament.get_match_score("01") == "6-0, 6-0"
+        assert tournament.get_player_games("Player One") == (12, 0)
+
+    def test_score_listeners_see_every_change(self):
+        """Test score listeners run for added matches and recorded points."""
+        tournament = Tournament()
+        changes = []
+        tournament.add_score_listener(lambda match: changes.append(match.match_id))
+        tournament.add_match(Match("01", "Player One", "Player Two"))
+        tournament.record_match_point("01", 1)
+        tournament.undo_last_point("01")
+        tournament.compact()
+        assert changes == ["01", "01", "01"]
+
+    def test_versions_count_changes(self):
+        """Test match versions change per point and player versions per game."""
+        tournament = Tournament()
+        tournament.add_match(Match("01", "Player One", "Player Two"))
+        tournament.add_match(Match("02", "Player Three", "Player Four"))
+        match_version = tournament.match_version("01")
+        player_version = tournament.player_version("Player One")
+        tournament.record_match_point("01", 1)
+        assert tournament.match_version("01") == match_version + 1
+        assert tournament.player_version("Player One") == player_version
+        for _ in range(3):
+            tournament.record_match_point("01", 1)
+        assert tournament.player_version("Player One") > player_version
+        assert tournament.player_version("Player Two") > 0
+        assert tournament.match_version("02") == 1
+        # Adding a match counts as one change for each of its players
+        assert tournament.player_version("Player Three") == 1
+        assert tournament.match_version("99") == 0
+
+    def test_overwrite_replaces_player_totals(self):
+        """Test overwriting a match removes its games and players."""
+        tournament = Tournament()
+        match = Match("01", "Player One", "Player Two")
+        for _ in range(4):
+            match.record_point(1)
+        tournament.add_match(match)
+        replacement = Match("01", "Player One", "Player Three")
+        tournament.add_match(replacement, overwrite=True)
+        assert tournament.get_player_games("Player One") == (0, 0)
+        with pytest.raises(PlayerNotFoundException):
+            tournament.get_player_games("Player Two")
+        # The replaced match no longer updates the totals
+        for _ in range(4):
+            match.record_point(1)
+        assert tournament.get_player_games("Player One") == (0, 0)
+
+    def test_player_matches_index(self):
+        """Test player to match lookup."""
+        tournament = Tournament()
+        first = Match("01", "Player One", "Player Two")
+        second = Match("02", "Player Three", "Player One")
+        tournament.add_match(first)
+        tournament.add_match(second)
+        assert tournament.get_player_matches("Player One") == [first, second]
+        assert tournament.get_player_matches("Player Three") == [second]
+        with pytest.raises(PlayerNotFoundException):
+            tournament.get_player_matches("Player Four")
+
+    def test_indexes_rebuilt_after_unpickling(self):
+        """Test indexes and listeners are restored on load."""
+        tournament = Tournament()
+        tournament.add_match(Match("01", "Player One", "Player Two"))
+        for _ in range(4):
+            tournament.record_match_point("01", 1)
+        restored = pickle.loads(pickle.dumps(tournament))
+        assert restored.get_player_games("Player One") == (1, 0)
+        for _ in range(4):
+            restored.record_match_point("01", 2)
+        assert restored.get_player_games("Player One") == (1, 1)
+
+    def test_pop_dirty_matches(self):
+        """Test added and changed matches are reported once."""
+        tournament = Tournament()
+        first = Match("01", "Player One", "Player Two")
+        second = Match("02", "Player One", "Player Three")
+        tournament.add_match(first)
+        tournament.add_match(second)
+        assert tournament.pop_dirty_matches() == [first, second]
+        assert tournament.pop_dirty_matches() == []
+        tournament.record_match_point("02", 1)
+        assert tournament.pop_dirty_matches() == [second]
+        restored = pickle.loads(pickle.dumps(tournament))
+        assert restored.pop_dirty_matches() == []
+
+    def test_compact_completed_matches(self):
+        """Test completed matches move to columnar storage."""
+        tournament = Tournament()
+        completed = Match("01", "Player One", "Player Two")
+        for _ in range(48):
+            completed.record_point(1)
+        tournament.add_match(completed)
+        tournament.add_match(Match("02", "Player One", "Player Three"))
+        tournament.record_match_point("02", 2)
+        assert tournament.compact() == 1
+        assert list(tournament.matches) == ["02"]
+        assert tournament.get_match_score("01") == "6-0, 6-0"
+        assert tournament.get_match("01") == completed
+        assert tournament.get_player_games("Player One") == (12, 0)
+        assert [m.match_id for m in tournament.get_player_matches("Player One")] == [
+            "01",
+            "02",
+        ]
+        with pytest.raises(DuplicateMatchException):
+            tournament.add_match(Match("01", "Player One", "Player Two"))
+
+        tournament.add_match(Match("01", "Player Four", "Player Two"), overwrite=True)
+        assert "01" not in tournament.compacted
+        assert tournament.get_player_games("Player One") == (0, 0)
+        assert tournament.get_player_games("Player Two") == (0, 0)
+
+    def test_compacted_pickle_round_trip(self):
+        """Test compacted matches and their totals survive pickling."""
+        tournament = Tournament()
+        match = Match("01", "Player One", "Player Two")
+        for _ in range(48):
+            match.record_point(2)
+        tournament.add_match(match)
+        tournament.compact()
+        restored = pickle.loads(pickle.dumps(tournament))
+        assert restored.get_player_games("Player Two") == (12, 0)
+        assert restored.get_match("01") == match
+        assert [m.match_id for m in restored.iter_matches()] == ["01"]
+
+    def test_unpickle_state_without_compaction(self):
+        """Test tournaments pickled as a plain match dict still load."""
+        match = Match("01", "Player One", "Player Two")
+        match.record_point(1)
+        tournament = Tournament.__new__(Tournament)
+        tournament.__setstate__({"01": match})
+        assert tournament.get_match("01") is match
+        assert len(tournament.compacted) == 0
+
+    def test_add_completed_match(self):
+        """Test completed matches can be added straight into columnar storage."""
+        tournament = Tournament()
+        tournament.add_match(Match("01", "Player One", "Player Three"))
+        tournament.add_completed_match(
+            "01", "Player One", "Player Two", [(6, 4, 4, 2), (7, 6, 7, 5)], True
+        )
+        assert "01" in tournament.compacted and "01" not in tournament.matches
+        assert tournament.get_match_score("01") == "6-4, 7-6"
+        assert tournament.get_player_games("Player Two") == (10, 13)
+        with pytest.raises(PlayerNotFoundException):
+            tournament.get_player_games("Player Three")
+        assert [m.match_id for m in tournament.pop_dirty_matches()] == ["01"]
+        with pytest.raises(DuplicateMatchException):
+            tournament.add_completed_match("01", "A", "B", [(6, 0, 4, 0)])
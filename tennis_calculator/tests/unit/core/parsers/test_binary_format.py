@@ -0,0 +1,79 @@
+"""verifies the binary point-stream format"""
+
+from pathlib import Path
+
+import pytest
+from tennis_calculator.core.parsers.binary_format import (
+    BinaryMatchReader,
+    BinaryMatchWriter,
+    convert_text_to_binary,
+    pack_points,
+    unpack_points,
+)
+from tennis_calculator.core.parsers.byte_scanner import ByteMatchScanner
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.exceptions import InvalidMatchFormatException
+
+TEST_DATA = Path(__file__).parents[3] / "test_data"
+
+
+@pytest.mark.parametrize("count", [0, 1, 7, 8, 9, 131])
+def test_pack_round_trip(count):
+    """verifies points survive packing for partial and whole bytes"""
+    points = (b"0110100" * 20)[:count]
+    packed = pack_points(points)
+    assert len(packed) == (count + 7) // 8
+    assert unpack_points(packed, count) == points
+
+
+@pytest.mark.parametrize("path", sorted(TEST_DATA.glob("*.txt")), ids=lambda p: p.stem)
+def test_converted_file_ingests_like_text(path, tmp_path):
+    """verifies binary archives keep every match and point"""
+    output = tmp_path / "matches.tcpb"
+    converted = convert_text_to_binary(str(path), str(output))
+
+    text_matches = list(ByteMatchScanner.scan_file(str(path)))
+    binary_matches = list(BinaryMatchReader.read_file(str(output)))
+    assert converted == len(text_matches)
+    assert [
+        (m.match_id, m.player_one, m.player_two, m.points) for m in binary_matches
+    ] == [(m.match_id, m.player_one, m.player_two, m.points) for m in text_matches]
+
+    from_text = MatchProcessor()
+    from_text.process_file(str(path))
+    from_binary = MatchProcessor()
+    from_binary.process_file(str(output))
+    for match_id, match in from_text.tournament.matches.items():
+        assert from_binary.get_match(match_id).score_display() == match.score_display()
+
+
+def test_archive_is_much_smaller(tmp_path):
+    """verifies bit packing shrinks point data"""
+    text = tmp_path / "matches.txt"
+    text.write_text("Match: 01\nA vs B\n" + "0\n1\n" * 8000)
+    output = tmp_path / "matches.tcpb"
+    convert_text_to_binary(str(text), str(output))
+    assert text.stat().st_size / output.stat().st_size > 14
+
+
+def test_random_access_by_index(tmp_path):
+    """verifies a single match can be decoded from the index"""
+    path = tmp_path / "matches.tcpb"
+    with BinaryMatchWriter(str(path)) as writer:
+        writer.add("01", "A", "B", b"000")
+        writer.add("02", "Ünïcode", "D", b"1")
+    reader = BinaryMatchReader(path.read_bytes())
+    assert len(reader) == 2
+    match = reader.read_match(1)
+    assert (match.match_id, match.player_one, match.points) == ("02", "Ünïcode", b"1")
+
+
+def test_invalid_archives(tmp_path):
+    """verifies foreign and truncated files are rejected"""
+    with pytest.raises(InvalidMatchFormatException, match="Not a binary"):
+        BinaryMatchReader(b"Match: 01\nA vs B\n0\n0\n")
+    path = tmp_path / "matches.tcpb"
+    with BinaryMatchWriter(str(path)) as writer:
+        writer.add("01", "A", "B", b"01" * 20)
+    with pytest.raises(InvalidMatchFormatException, match="truncated"):
+        list(BinaryMatchReader(path.read_bytes()[:-2]))
@@ -0,0 +1,102 @@
+"""verifies memory-mapped byte scanning of match input"""
+
+import io
+from pathlib import Path
+
+import pytest
+from tennis_calculator.core.parsers.byte_scanner import ByteMatchScanner
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.exceptions import InvalidMatchFormatException
+
+TEST_DATA = Path(__file__).parents[3] / "test_data"
+
+
+@pytest.mark.parametrize("path", sorted(TEST_DATA.glob("*.txt")), ids=lambda p: p.stem)
+def test_process_file_matches_text_ingest(path):
+    """verifies mmap ingest scores test data like line-based ingest"""
+    scanned = MatchProcessor()
+    scanned.process_file(str(path))
+    streamed = MatchProcessor()
+    with open(path) as f:
+        streamed.process_stream(f)
+
+    assert list(scanned.tournament.matches) == list(streamed.tournament.matches)
+    for match_id, match in streamed.tournament.matches.items():
+        assert scanned.get_match(match_id).score_display() == match.score_display()
+
+
+def test_scan_compacts_points():
+    """verifies whitespace and blank lines are dropped from point buffers"""
+    data = b"\n Match: 01 \r\nA vs B\r\n0\r\n\n 1 \n0"
+    (raw,) = ByteMatchScanner(data)
+    assert (raw.match_id, raw.player_one, raw.player_two) == ("01", "A", "B")
+    assert raw.points == b"010"
+    assert (raw.offset, raw.line) == (1, 2)
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (
+            b"Match: 01\nA vs B\n0\n0 1\n",
+            "Invalid point value: 0 1. Must be 0 or 1 (line 4, byte offset 19)",
+        ),
+        (
+            b"Match: 01\nA vs B\nMatch: 02\nC vs D\n2\n",
+            "Invalid point value: 2. Must be 0 or 1 (line 5, byte offset 34)",
+        ),
+        (
+            b"Match: 01\n\nMatch: 02\n",
+            "Match data must have at least 2 lines (line 1, byte offset 0)",
+        ),
+        (
+            b"junk\nmore\nMatch: 01\n",
+            "First line must start with 'Match: ' (line 1, byte offset 0)",
+        ),
+        (
+            b"Match: 01\nA and B\n",
+            "Second line must contain ' vs ' (line 1, byte offset 0)",
+        ),
+    ],
+)
+def test_scan_errors_report_location(data, message):
+    """verifies errors keep parser messages and add line and byte offset"""
+    with pytest.raises(InvalidMatchFormatException) as error:
+        list(ByteMatchScanner(data))
+    assert str(error.value) == message
+
+
+def test_scan_empty_file(tmp_path):
+    """verifies empty files yield no matches"""
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert list(ByteMatchScanner.scan_file(str(path))) == []
+
+
+def test_scan_file_error_before_last_match(tmp_path):
+    """verifies format errors from mapped files are not masked on unmapping"""
+    path = tmp_path / "bad.txt"
+    path.write_bytes(b"Match: 01\nA vs B\n0\n2\nMatch: 02\nC vs D\n0\n1\n")
+    with pytest.raises(InvalidMatchFormatException) as error:
+        list(ByteMatchScanner.scan_file(str(path)))
+    assert str(error.value) == (
+        "Invalid point value: 2. Must be 0 or 1 (line 4, byte offset 19)"
+    )
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64, 1 << 20])
+def test_scan_stream_matches_buffer_scan(block_size):
+    """verifies block-wise stream scans yield the same matches as one buffer"""
+    data = (TEST_DATA / "full_tournament.txt").read_bytes()
+    streamed = ByteMatchScanner.scan_stream(io.BytesIO(data), block_size)
+    assert list(streamed) == list(ByteMatchScanner(data))
+
+
+def test_scan_stream_errors_report_location():
+    """verifies errors in later blocks report their position in the stream"""
+    data = b"Match: 01\nA vs B\n0\nMatch: 02\nC vs D\n1\n2\n"
+    with pytest.raises(InvalidMatchFormatException) as error:
+        list(ByteMatchScanner.scan_stream(io.BytesIO(data), 4))
+    assert str(error.value) == (
+        "Invalid point value: 2. Must be 0 or 1 (line 7, byte offset 38)"
+    )
@@ -0,0 +1,65 @@
+"""Tests for input file discovery and decompression."""
+
+import bz2
+import gzip
+import lzma
+
+import pytest
+from tennis_calculator.core.exceptions import TennisCalculatorException
+from tennis_calculator.core.parsers.input_files import (
+    InputReport,
+    compression_opener,
+    expand_inputs,
+    open_match_input,
+)
+
+CONTENT = "Match: 01\nA vs B\n0\n1\n"
+
+COMPRESSORS = [
+    pytest.param(lambda data: data, id="plain"),
+    pytest.param(gzip.compress, id="gzip"),
+    pytest.param(bz2.compress, id="bz2"),
+    pytest.param(lzma.compress, id="xz"),
+]
+
+
+@pytest.mark.parametrize("compress", COMPRESSORS)
+def test_open_match_input_decompresses_by_content(tmp_path, compress):
+    """Compression is detected from file content, not the file name."""
+    path = tmp_path / "input"
+    path.write_bytes(compress(CONTENT.encode()))
+    with open_match_input(str(path)) as f:
+        assert f.read() == CONTENT
+
+
+def test_plain_file_has_no_opener(tmp_path):
+    """Plain text files are left to the memory-mapped scanner."""
+    path = tmp_path / "input.txt"
+    path.write_text(CONTENT)
+    assert compression_opener(str(path)) is None
+
+
+def test_expand_inputs_sorts_globs_and_keeps_pattern_order(tmp_path):
+    """Glob matches are sorted and files are listed once."""
+    for name in ["b.txt", "a.txt", "c.gz"]:
+        (tmp_path / name).write_text(CONTENT)
+    paths = expand_inputs([str(tmp_path / "c.gz"), str(tmp_path / "*.txt")])
+    assert paths == [str(tmp_path / name) for name in ["c.gz", "a.txt", "b.txt"]]
+    assert expand_inputs([str(tmp_path / "*"), str(tmp_path / "a.txt")]) == [
+        str(tmp_path / name) for name in ["a.txt", "b.txt", "c.gz"]
+    ]
+
+
+def test_expand_inputs_rejects_unmatched_pattern(tmp_path):
+    """A pattern matching nothing is an error."""
+    with pytest.raises(TennisCalculatorException, match="No input files match"):
+        expand_inputs([str(tmp_path / "*.txt")])
+
+
+def test_input_report_describe():
+    """Reports show matches and throughput."""
+    report = InputReport("day1.txt.gz", 2000, 4_000_000, 2.0)
+    assert report.megabytes_per_second == 2.0
+    assert report.describe() == (
+        "day1.txt.gz: 2000 matches, 4.0 MB in 2.00s (2.0 MB/s, 1,000 matches/s)"
+    )
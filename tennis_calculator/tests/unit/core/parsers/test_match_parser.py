@@ -61,3 +61,61 @@ def test_parse_incomplete_match():
     incomplete_data = ["Match: 01"]
     with pytest.raises(InvalidMatchFormatException):
         MatchParser.parse_match_details(incomplete_data)
+
+
+def test_stream_matches_from_iterator():
+    """verifies matches are built lazily from a line iterator"""
+    data = iter(
+        [
+            "Match: 01",
+            "Player One vs Player Two",
+            "0",
+            "",
+            "0",
+            "Match: 02",
+            "Player Three vs Player Four",
+            "1",
+        ]
+    )
+    first, second = MatchParser.stream_matches(data)
+    assert first.match_id == "01"
+    assert first.current_set.current_game.points.player_one == 2
+    assert second.match_id == "02"
+    assert second.current_set.current_game.points.player_two == 1
+
+
+def test_stream_matches_equivalent_to_create_match():
+    """verifies streamed matches score the same as create_match"""
+    data = ["Match: 01", "Player One vs Player Two"] + ["0"] * 60
+    (streamed,) = MatchParser.stream_matches(data)
+    created = MatchParser.create_match(data)
+    assert streamed.winner == created.winner == "Player One"
+    assert streamed.score_display() == created.score_display()
+
+
+def test_stream_matches_invalid_point():
+    """verifies invalid points are reported while streaming"""
+    data = ["Match: 01", "Player One vs Player Two", "0", "2"]
+    with pytest.raises(InvalidMatchFormatException, match="Invalid point value: 2"):
+        list(MatchParser.stream_matches(data))
+
+
+def test_stream_matches_missing_players_line():
+    """verifies header-only blocks are rejected while streaming"""
+    with pytest.raises(InvalidMatchFormatException, match="at least 2 lines"):
+        list(MatchParser.stream_matches(["Match: 01", "Match: 02", "A vs B"]))
+
+
+def test_stream_blocks_parses_without_scoring():
+    """verifies blocks keep every point, including those after completion"""
+    data = ["Match: 01", "A vs B"] + ["0"] * 50 + ["Match: 02", "C vs D", "", "1"]
+    first, second = MatchParser.stream_blocks(data)
+    assert (first.match_id, first.player_one, first.player_two) == ("01", "A", "B")
+    assert first.points == [1] * 50
+    assert (second.match_id, second.points) == ("02", [2])
+
+
+def test_stream_blocks_missing_players_line():
+    """verifies header-only blocks are rejected"""
+    with pytest.raises(InvalidMatchFormatException, match="at least 2 lines"):
+        list(MatchParser.stream_blocks(["Match: 01", "Match: 02", "A vs B"]))
@@ -0,0 +1,127 @@
+"""verifies scoring of points appended to followed input files"""
+
+import gzip
+from pathlib import Path
+
+import pytest
+from tennis_calculator.core.exceptions import (
+    InvalidMatchFormatException,
+    TennisCalculatorException,
+)
+from tennis_calculator.core.processors.match_follower import MatchFollower
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+
+TEST_DATA = Path(__file__).parents[3] / "test_data"
+
+
+def append(path: Path, data: bytes) -> None:
+    """appends bytes to a followed file"""
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 13, 4096])
+def test_follow_matches_batch_ingest(tmp_path, chunk_size):
+    """verifies appending a file in chunks scores it like a single read"""
+    data = (TEST_DATA / "full_tournament.txt").read_bytes()
+    path = tmp_path / "live.txt"
+    path.write_bytes(b"")
+    followed = MatchProcessor()
+    follower = MatchFollower(followed, [str(path)])
+    for start in range(0, len(data), chunk_size):
+        append(path, data[start : start + chunk_size])
+        follower.poll()
+    append(path, b"\n")
+    follower.poll()
+
+    batch = MatchProcessor()
+    batch.process_file(str(TEST_DATA / "full_tournament.txt"))
+    assert list(followed.tournament.matches) == list(batch.tournament.matches)
+    for match_id in batch.tournament.matches:
+        assert followed.tournament.get_match_score(
+            match_id
+        ) == batch.tournament.get_match_score(match_id)
+    assert followed.tournament.get_player_games(
+        "Person A"
+    ) == batch.tournament.get_player_games("Person A")
+
+
+def test_follow_updates_open_match_in_place(tmp_path):
+    """verifies appended points are recorded on the live match object"""
+    path = tmp_path / "live.txt"
+    path.write_bytes(b"Match: 01\nA vs B\n0\n0\n")
+    match_processor = MatchProcessor()
+    follower = MatchFollower(match_processor, [str(path)])
+    assert follower.poll() == 4
+    match = match_processor.get_match("01")
+    assert match.score_display() == "0-0 (30-0)"
+
+    append(path, b"0\n0")
+    assert follower.poll() == 1
+    assert match_processor.tournament.get_match_score("01") == "0-0 (40-0)"
+    assert follower.poll() == 0
+    append(path, b"\n1\n")
+    follower.poll()
+    assert match_processor.get_match("01") is match
+    assert follower.open_matches() == [match]
+    assert match.score_display() == "1-0 (0-15)"
+    assert match_processor.tournament.get_player_games("B") == (0, 1)
+
+
+def test_follow_ignores_points_after_completion(tmp_path):
+    """verifies points after the match is won are skipped like in batch ingest"""
+    path = tmp_path / "live.txt"
+    path.write_bytes(b"Match: 01\nA vs B\n" + b"0\n" * 48)
+    match_processor = MatchProcessor()
+    follower = MatchFollower(match_processor, [str(path)])
+    follower.poll()
+    append(path, b"1\n1\n")
+    follower.poll()
+    assert match_processor.get_match("01").winner == "A"
+    assert match_processor.tournament.get_player_games("A") == (12, 0)
+
+
+def test_follow_restarts_truncated_file(tmp_path):
+    """verifies a truncated or replaced file is read again from the start"""
+    path = tmp_path / "live.txt"
+    path.write_bytes(b"Match: 01\nA vs B\n0\n0\n0\n")
+    match_processor = MatchProcessor()
+    follower = MatchFollower(match_processor, [str(path)])
+    follower.poll()
+    path.write_bytes(b"Match: 01\nA vs B\n1\n")
+    follower.poll()
+    assert match_processor.tournament.get_match_score("01") == "0-0 (0-15)"
+
+
+def test_follow_errors_report_location(tmp_path):
+    """verifies invalid lines report the file and line number"""
+    path = tmp_path / "live.txt"
+    path.write_bytes(b"Match: 01\nA vs B\n0\n")
+    follower = MatchFollower(MatchProcessor(), [str(path)])
+    follower.poll()
+    append(path, b"\n2\n")
+    with pytest.raises(InvalidMatchFormatException) as error:
+        follower.poll()
+    assert str(error.value) == (
+        f"Invalid point value: 2. Must be 0 or 1 ({path}, line 5)"
+    )
+
+
+def test_follow_rejects_compressed_input(tmp_path):
+    """verifies only plain text files can be followed"""
+    path = tmp_path / "live.txt.gz"
+    path.write_bytes(gzip.compress(b"Match: 01\nA vs B\n"))
+    with pytest.raises(TennisCalculatorException):
+        MatchFollower(MatchProcessor(), [str(path)])
+
+
+def test_follow_append_continues_known_match(tmp_path):
+    """verifies append mode resumes a stored match and counts dropped points"""
+    match_processor = MatchProcessor()
+    match_processor.process_matches(["Match: 01", "A vs B"] + ["0"] * 44)
+    path = tmp_path / "live.txt"
+    path.write_bytes(b"Match: 01\nA vs B\n" + b"0\n" * 6)
+    follower = MatchFollower(match_processor, [str(path)], append=True)
+    follower.poll()
+    assert match_processor.get_match("01").winner == "A"
+    assert match_processor.discarded_points == 2
@@ -1,7 +1,18 @@
 """verifies match processing functionality"""
 
+import gzip
+import lzma
+import os
+import pickle
+from pathlib import Path
+
 import pytest
-from tennis_calculator.core.exceptions import InvalidMatchFormatException
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.scoring.cache import ScoreCache
+from tennis_calculator.core.exceptions import (
+    InvalidMatchDataException,
+    InvalidMatchFormatException,
+)
 
 
 def test_process_matches(match_processor, sample_match_data):
@@ -35,3 +46,179 @@ def test_invalid_match_data(match_processor):
     invalid_data = ["Invalid Match"]
     with pytest.raises(InvalidMatchFormatException):
         match_processor.process_matches(invalid_data)
+
+
+def test_process_stream_from_generator(match_processor):
+    """verifies matches are processed from a lazy line source"""
+    lines = (line for line in ["Match: 01", "Player One vs Player Two", "0", "1"])
+    assert match_processor.process_stream(lines) == 1
+    assert match_processor.get_match("01").score_display() == "0-0 (15-15)"
+
+
+def _match_block(match_id, players, points):
+    return [f"Match: {match_id}", players] + [str(point) for point in points]
+
+
+def test_process_parallel_matches_sequential(match_processor):
+    """verifies parallel ingest merges chunks in input order"""
+    data = []
+    for number in range(12):
+        players = f"P{number} vs Q{number}"
+        data += _match_block(f"{number:02d}", players, [0, 1] * number)
+    data += _match_block("03", "Late vs Entry", [0] * 4)  # overwrites match 03
+
+    assert match_processor.process_parallel(data, workers=2, chunk_lines=10) == 13
+    sequential = MatchProcessor()
+    sequential.process_matches(data)
+    assert list(match_processor.tournament.matches) == list(
+        sequential.tournament.matches
+    )
+    assert match_processor.get_match("03").player_one == "Late"
+    for match_id, match in sequential.tournament.matches.items():
+        assert match_processor.get_match(match_id).score_display() == (
+            match.score_display()
+        )
+
+
+def test_process_parallel_keeps_matches_before_error(match_processor):
+    """verifies matches before an invalid block are kept, then the error raised"""
+    data = _match_block("01", "A vs B", [0]) + _match_block("02", "C vs D", [0, 5])
+    with pytest.raises(InvalidMatchFormatException):
+        match_processor.process_parallel(data, workers=2, chunk_lines=100)
+    assert match_processor.get_match("01").player_one == "A"
+
+
+def _write_inputs(tmp_path):
+    """writes a plain, a gzip and an xz input whose last file repeats match 01"""
+    plain = tmp_path / "day1.txt"
+    plain.write_text("\n".join(_match_block("01", "A vs B", [0] * 4)) + "\n")
+    gzipped = tmp_path / "day2.txt.gz"
+    with gzip.open(gzipped, "wt") as f:
+        f.write("\n".join(_match_block("02", "A vs C", [1] * 8)) + "\n")
+    xz = tmp_path / "day3.txt.xz"
+    with lzma.open(xz, "wt") as f:
+        f.write("\n".join(_match_block("01", "D vs B", [0, 1, 1])) + "\n")
+    return [str(plain), str(gzipped), str(xz)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_inputs_reads_compressed_files_in_order(
+    match_processor, tmp_path, workers
+):
+    """verifies several plain and compressed files are merged in input order"""
+    paths = _write_inputs(tmp_path)
+    reports = match_processor.process_inputs(paths, workers)
+    assert [report.path for report in reports] == paths
+    assert [report.matches for report in reports] == [1, 1, 1]
+    assert reports[1].size == os.path.getsize(paths[1])
+    assert match_processor.get_match("01").player_one == "D"
+    assert match_processor.tournament.get_player_games("A") == (0, 2)
+
+
+def test_process_inputs_keeps_files_before_error(match_processor, tmp_path):
+    """verifies files before an invalid one are kept, then the error raised"""
+    paths = _write_inputs(tmp_path)
+    broken = tmp_path / "broken.txt.gz"
+    with gzip.open(broken, "wt") as f:
+        f.write("Match: 09\nE vs F\n7\n")
+    with pytest.raises(InvalidMatchFormatException):
+        match_processor.process_inputs(paths[:2] + [str(broken)], workers=2)
+    assert match_processor.get_match("02").player_one == "A"
+
+
+def test_append_continues_existing_match(match_processor):
+    """verifies a repeated block continues the match instead of replacing it"""
+    match_processor.process_matches(_match_block("01", "A vs B", [0] * 3))
+    match = match_processor.get_match("01")
+    match_processor.process_matches(
+        _match_block("01", "A vs B", [0, 1]) + _match_block("02", "C vs D", [1]),
+        append=True,
+    )
+    assert match_processor.get_match("01") is match
+    assert match.score_display() == "1-0 (0-15)"
+    assert match_processor.get_match("02").score_display() == "0-0 (0-15)"
+    assert match_processor.tournament.get_player_games("A") == (1, 0)
+    assert match_processor.discarded_points == 0
+
+
+def test_append_matches_single_block(match_processor):
+    """verifies appending a match in pieces scores it like one block"""
+    points = [0, 1, 1, 0, 0] * 30
+    for start in range(0, len(points), 7):
+        match_processor.process_matches(
+            _match_block("01", "A vs B", points[start : start + 7]), append=True
+        )
+    whole = MatchProcessor()
+    whole.process_matches(_match_block("01", "A vs B", points))
+    assert match_processor.get_match("01").score_display() == (
+        whole.get_match("01").score_display()
+    )
+    # The match is won before the last pieces arrive
+    assert match_processor.discarded_points == 34
+
+
+def test_append_discards_points_after_completion(match_processor):
+    """verifies points for a completed match are counted instead of raising"""
+    match_processor.process_matches(
+        _match_block("01", "A vs B", [0] * 47), append=True
+    )
+    assert match_processor.append_match("01", "A", "B", [1, 2, 2]) == 2
+    assert match_processor.append_match("02", "C", "D", [2] * 50) == 2
+    assert match_processor.discarded_points == 4
+    assert match_processor.get_match("01").winner == "A"
+    assert match_processor.tournament.get_player_games("B") == (0, 12)
+
+
+def test_append_rejects_different_players(match_processor):
+    """verifies a block naming other players for a known match id is rejected"""
+    match_processor.process_matches(_match_block("01", "A vs B", [0]))
+    with pytest.raises(InvalidMatchDataException, match="Match 01 is A vs B"):
+        match_processor.process_matches(
+            _match_block("01", "B vs A", [0]), append=True
+        )
+    assert match_processor.get_match("01").score_display() == "0-0 (15-0)"
+
+
+def test_process_inputs_append_reports_discarded(match_processor, tmp_path):
+    """verifies append mode continues matches across files and reports drops"""
+    first = tmp_path / "day1.txt"
+    first.write_text("\n".join(_match_block("01", "A vs B", [0] * 40)) + "\n")
+    second = tmp_path / "day2.txt.gz"
+    with gzip.open(second, "wt") as f:
+        f.write("\n".join(_match_block("01", "A vs B", [0] * 10)) + "\n")
+    reports = match_processor.process_inputs(
+        [str(first), str(second)], workers=2, append=True
+    )
+    assert [report.discarded for report in reports] == [0, 2]
+    assert "2 points after match completion" in reports[1].describe()
+    assert match_processor.get_match("01").winner == "A"
+
+
+def test_process_file_with_cache_matches_uncached(tmp_path):
+    """verifies cached ingest gives the same scores, warm or cold"""
+    path = str(Path(__file__).parents[3] / "test_data" / "full_tournament.txt")
+    uncached = MatchProcessor()
+    uncached.process_file(path)
+    cache = ScoreCache(str(tmp_path / "cache"))
+    for expected_hits in (0, 2):
+        cached = MatchProcessor(score_cache=cache)
+        assert cached.process_file(path) == 2
+        assert cache.hits == expected_hits
+        for match_id in uncached.tournament.matches:
+            assert cached.tournament.get_match_score(
+                match_id
+            ) == uncached.tournament.get_match_score(match_id)
+            assert cached.get_match(match_id) == uncached.get_match(match_id)
+        assert cached.tournament.get_player_games(
+            "Person A"
+        ) == uncached.tournament.get_player_games("Person A")
+
+
+def test_pickled_processor_drops_cache(tmp_path):
+    """verifies the cache and run counters are not pickled with the tournament"""
+    processor = MatchProcessor(score_cache=ScoreCache(str(tmp_path / "cache")))
+    processor.process_matches(_match_block("01", "A vs B", [0]))
+    processor.discarded_points = 3
+    restored = pickle.loads(pickle.dumps(processor))
+    assert restored.score_cache is None and restored.discarded_points == 0
+    assert restored.get_match("01").score_display() == "0-0 (15-0)"
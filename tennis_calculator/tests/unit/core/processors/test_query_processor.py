@@ -1,10 +1,15 @@
 """verifies query processing functionality"""
 
+import io
+
 import pytest
+from unittest.mock import Mock, patch
+from tennis_calculator.core.models.match import Match
 from tennis_calculator.core.exceptions import (
     InvalidQueryException,
     MatchNotFoundException,
     PlayerNotFoundException,
+    PointNotFoundException,
 )
 
 
@@ -39,3 +44,101 @@ def test_games_player_not_found(query_processor):
     """Test games player not found."""
     with pytest.raises(PlayerNotFoundException):
         query_processor.handle_query("Games Player Invalid")
+
+
+def test_score_match_at_query(query_processor, tournament_with_match):
+    """verifies the score after a number of points"""
+    assert query_processor.handle_query("Score Match 01 At 0") == "0-0"
+    assert query_processor.handle_query("Score Match 01 At 6") == "1-0 (30-0)"
+    assert query_processor.handle_query("score match 01 at 28") == "6-0, 1-0"
+    assert query_processor.handle_query("Score Match 01 At 48") == (
+        "Player Alpha defeated Player Beta\n2 sets to 0"
+    )
+
+
+@pytest.mark.parametrize(
+    "query", ["Score Match 01 At", "Score Match 01 At x", "Score Match 01 At 1 2"]
+)
+def test_score_match_at_invalid(query_processor, tournament_with_match, query):
+    """verifies malformed point numbers are rejected"""
+    with pytest.raises(InvalidQueryException):
+        query_processor.handle_query(query)
+
+
+def test_score_match_at_beyond_match(query_processor, tournament_with_match):
+    """verifies points that were not played are reported"""
+    with pytest.raises(PointNotFoundException):
+        query_processor.handle_query("Score Match 01 At 49")
+
+
+def test_answer_queries_in_order(query_processor, tournament_with_match):
+    """verifies batch answers follow the queries and failures are returned"""
+    results = query_processor.answer_queries(
+        ["Games Player Player Alpha", "Score Match 99", "Score Match 01 At 6"]
+    )
+    assert results[0] == "12 0"
+    assert isinstance(results[1], MatchNotFoundException)
+    assert results[2] == "1-0 (30-0)"
+
+
+def test_answer_queries_looks_up_once(query_processor, tournament_with_match):
+    """verifies repeated queries are parsed and answered only once"""
+    queries = ["Score Match 01", "score match 01", "Games Player Player Beta"] * 3
+    with patch.object(
+        query_processor, "_answer_query", wraps=query_processor._answer_query
+    ) as answer, patch.object(
+        query_processor, "_parse_query", wraps=query_processor._parse_query
+    ) as parse:
+        results = query_processor.answer_queries(queries)
+    assert answer.call_count == 2
+    assert parse.call_count == 3
+    assert results == [query_processor.handle_query(query) for query in queries]
+
+
+def test_handle_queries_writes_results(query_processor, tournament_with_match):
+    """verifies results and errors are written one per query"""
+    output = io.StringIO()
+    queries = ["Games Player Player Beta", "Bad", "Score Match 01 At 0"]
+    with patch("tennis_calculator.core.processors.query_processor.BATCH_SIZE", 2):
+        failures = query_processor.handle_queries(queries, output)
+    assert failures == 1
+    assert output.getvalue() == "0 12\nError: Invalid query format\n0-0\n"
+
+
+def test_handle_queries_stop_on_error(query_processor, tournament_with_match):
+    """verifies queries after the first failure are not written"""
+    output = io.StringIO()
+    queries = ["Games Player Player Beta", "Score Match 99", "Score Match 01 At 0"]
+    assert query_processor.handle_queries(queries, output, stop_on_error=True) == 1
+    assert output.getvalue() == "0 12\nError: Match 99 not found\n"
+
+
+def test_handle_queries_flushes_each_batch(query_processor, tournament_with_match):
+    """verifies each batch is written and flushed once"""
+    output = Mock(spec=io.StringIO)
+    queries = ["Score Match 01"] * 5
+    with patch("tennis_calculator.core.processors.query_processor.BATCH_SIZE", 2):
+        query_processor.handle_queries(queries, output)
+    assert output.write.call_count == 3
+    assert output.flush.call_count == 3
+
+
+def test_cached_answers_follow_changes(query_processor, tournament_with_match):
+    """verifies recording a point only invalidates answers that read it"""
+    tournament_with_match.add_match(Match("02", "Player Gamma", "Player Delta"))
+    queries = ["Score Match 01", "Score Match 02", "Games Player Player Gamma"]
+    for query in queries:
+        query_processor.handle_query(query)
+    tournament_with_match.record_match_point("02", 1)
+    assert query_processor.handle_query("Score Match 02") == "0-0 (15-0)"
+    assert query_processor.handle_query("Score Match 01").startswith("Player Alpha")
+    assert query_processor.handle_query("Games Player Player Gamma") == "0 0"
+    cache = query_processor.result_cache
+    assert (cache.hits, cache.misses, cache.invalidations) == (2, 4, 1)
+    assert query_processor.handle_query("stats cache") == cache.describe()
+
+
+def test_stats_query_invalid(query_processor):
+    """verifies only cache stats can be queried"""
+    with pytest.raises(InvalidQueryException):
+        query_processor.handle_query("Stats Memory")
@@ -0,0 +1,29 @@
+"""verifies the versioned query result cache"""
+
+from tennis_calculator.core.processors.result_cache import ResultCache
+
+
+def test_stale_versions_are_dropped():
+    """verifies an answer is only returned for the version it was computed at"""
+    cache = ResultCache()
+    cache.put("key", 1, "answer")
+    assert cache.get("key", 1) == "answer"
+    assert cache.get("key", 2) is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses, cache.invalidations) == (1, 1, 1)
+
+
+def test_least_recently_used_are_evicted():
+    """verifies the size bound drops the entry used longest ago"""
+    cache = ResultCache(max_entries=2)
+    cache.put("one", 0, "1")
+    cache.put("two", 0, "2")
+    cache.get("one", 0)
+    cache.put("three", 0, "3")
+    assert cache.get("two", 0) is None
+    assert cache.get("one", 0) == "1"
+    assert cache.evictions == 1
+    assert cache.describe() == (
+        "result cache: 2 hits, 1 misses (66.7% hit rate), 0 invalidations, "
+        "1 evictions, 2 entries"
+    )
@@ -0,0 +1,126 @@
+"""verifies bulk summaries are equivalent to the object models"""
+
+from pathlib import Path
+
+import pytest
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.parsers.match_parser import MatchData, MatchParser
+from tennis_calculator.core.exceptions import (
+    InvalidMatchFormatException,
+    PlayerNotFoundException,
+)
+from tennis_calculator.core.rules import PLAYER_ONE
+from tennis_calculator.core.scoring.bulk import (
+    summarize_match,
+    summarize_matches,
+    summarize_point_values,
+)
+
+TEST_DATA = Path(__file__).parents[3] / "test_data"
+
+
+def _blocks(path):
+    """splits an input file into per-match line lists"""
+    blocks = []
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if line.startswith("Match:"):
+            blocks.append([line])
+        elif line:
+            blocks[-1].append(line)
+    return blocks
+
+
+def _model_match(lines):
+    """scores a block one point at a time through Match.record_point"""
+    match = Match(*MatchParser.parse_match_details(lines))
+    for point in MatchParser.parse_points(lines):
+        if match.winner:
+            break
+        match.record_point(point)
+    return match
+
+
+CASES = [
+    pytest.param(lines, id=f"{path.stem}-{lines[0][7:]}")
+    for path in sorted(TEST_DATA.glob("*.txt"))
+    for lines in _blocks(path)
+]
+
+
+@pytest.mark.parametrize("lines", CASES)
+def test_summary_matches_models(lines):
+    """verifies every match in the test data files"""
+    expected = _model_match(lines)
+    match_id, player_one, player_two = MatchParser.parse_match_details(lines)
+    summary = summarize_match(
+        match_id, player_one, player_two, MatchParser.parse_points(lines)
+    )
+
+    assert summary.winner == expected.winner
+    assert summary.sets_score == (
+        expected.sets_score.player_one,
+        expected.sets_score.player_two,
+    )
+    assert summary.completed_sets == [
+        (s.games.player_one, s.games.player_two) for s in expected.completed_sets
+    ]
+    for player in (player_one, player_two):
+        assert summary.games_summary(player) == expected.games_summary(player)
+    assert summary.to_match().score_display() == expected.score_display()
+
+
+@pytest.mark.parametrize("lines", CASES)
+def test_buffer_summary_matches_sequence(lines):
+    """verifies ASCII point buffers score like player number sequences"""
+    details = MatchParser.parse_match_details(lines)
+    buffer = "".join(lines[2:]).encode()
+    from_buffer = summarize_point_values(*details, buffer)
+    from_sequence = summarize_match(*details, MatchParser.parse_points(lines))
+    assert from_buffer.completed_sets == from_sequence.completed_sets
+    assert from_buffer.current_set_games == from_sequence.current_set_games
+    assert from_buffer.points_played == from_sequence.points_played
+
+
+def test_match_is_built_lazily_once():
+    """verifies the full Match is only built on request and cached"""
+    summary = summarize_point_values("01", "A", "B", b"\x00" * 48)
+    assert summary._match is None
+    assert summary.to_match() is summary.to_match()
+    assert summary.to_match().winner == "A"
+
+
+def test_invalid_buffer_value():
+    """verifies buffers with non point values are rejected"""
+    with pytest.raises(InvalidMatchFormatException, match="at point 2"):
+        summarize_point_values("01", "A", "B", b"012")
+
+
+def test_bytes_are_player_numbers():
+    """verifies summarize_match reads bytes like any other int sequence"""
+    from_bytes = summarize_match("01", "A", "B", bytes([PLAYER_ONE]) * 4)
+    assert from_bytes.games_summary("A") == (1, 0)
+    with pytest.raises(InvalidMatchFormatException):
+        summarize_match("01", "A", "B", b"0000")
+
+
+@pytest.mark.parametrize("points", [[0] * 6, [1, 3, 0, 0, 0, 1]])
+def test_invalid_player_number(points):
+    """verifies sequences with other than player numbers are rejected"""
+    with pytest.raises(InvalidMatchFormatException, match="Invalid player number"):
+        summarize_match("01", "A", "B", points)
+
+
+def test_unknown_player_games():
+    """verifies games summary for a player not in the match"""
+    summary = summarize_match("01", "A", "B", [1, 2])
+    with pytest.raises(PlayerNotFoundException):
+        summary.games_summary("C")
+
+
+def test_summarize_matches_from_match_data():
+    """verifies parsed match data can be summarized in bulk"""
+    data = [MatchData("01", "A", "B", [1] * 48), MatchData("02", "C", "D", [2] * 4)]
+    first, second = summarize_matches(data)
+    assert first.winner == "A"
+    assert second.games_summary("D") == (1, 0)
@@ -0,0 +1,73 @@
+"""verifies the persistent cache of scored point sequences"""
+
+import pickle
+
+import pytest
+from tennis_calculator.core.models.history import PointHistory
+from tennis_calculator.core.scoring.bulk import buffer_to_players
+from tennis_calculator.core.scoring.cache import (
+    ScoreCache,
+    pack_scorer,
+    unpack_scorer,
+)
+from tennis_calculator.core.scoring.table import TableScorer
+
+COMPLETED = b"0" * 24 + b"0101010111" + b"1" * 20 + b"0" * 30
+IN_PROGRESS = b"0" * 24 + b"011"
+
+
+@pytest.mark.parametrize("points", [b"", IN_PROGRESS, COMPLETED])
+def test_pack_round_trip(points):
+    """verifies packed scorers restore the same state, history and match"""
+    scorer = TableScorer(history=PointHistory())
+    scorer.record_points(buffer_to_players(points))
+    restored = unpack_scorer(pack_scorer(scorer), buffer_to_players(points))
+    assert restored.state == scorer.state
+    assert restored.points_played == scorer.points_played
+    assert restored.history == scorer.history
+    assert restored.to_match("01", "A", "B") == scorer.to_match("01", "A", "B")
+
+
+def test_score_counts_hits_and_misses(tmp_path):
+    """verifies repeated point buffers are served from the cache"""
+    cache = ScoreCache(str(tmp_path / "cache"))
+    first = cache.score(COMPLETED)
+    again = cache.score(COMPLETED)
+    assert first.to_match("01", "A", "B") == again.to_match("01", "A", "B")
+    cache.score(IN_PROGRESS)
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+    assert cache.describe() == (
+        "score cache: 1 hits, 2 misses (33.3% hit rate), 0 evictions, 2 entries"
+    )
+
+
+def test_least_recently_used_evicted(tmp_path):
+    """verifies the size limit drops the entry used longest ago"""
+    cache = ScoreCache(str(tmp_path / "cache"), max_entries=2)
+    cache.score(b"0")
+    cache.score(b"1")
+    cache.score(b"0")
+    cache.score(b"00")
+    assert cache.evictions == 1
+    assert list(cache.entries) == [cache.digest(b"0"), cache.digest(b"00")]
+
+
+def test_save_and_reload(tmp_path):
+    """verifies entries persist in recency order and respect a smaller limit"""
+    path = str(tmp_path / "cache")
+    cache = ScoreCache(path)
+    for points in (b"0", b"1", b"00"):
+        cache.score(points)
+    cache.save()
+    reloaded = ScoreCache(path, max_entries=2)
+    assert list(reloaded.entries) == [cache.digest(b"1"), cache.digest(b"00")]
+    reloaded.score(b"00")
+    assert (reloaded.hits, reloaded.misses) == (1, 0)
+
+
+@pytest.mark.parametrize("content", [b"not a pickle", pickle.dumps((0, []))])
+def test_unreadable_or_outdated_cache_ignored(tmp_path, content):
+    """verifies a corrupt or old cache file starts an empty cache"""
+    path = tmp_path / "cache"
+    path.write_bytes(content)
+    assert len(ScoreCache(str(path))) == 0
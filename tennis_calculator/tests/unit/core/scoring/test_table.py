@@ -0,0 +1,107 @@
+"""verifies table-driven scoring against the object models"""
+
+import random
+
+import pytest
+from tennis_calculator.core.models.history import PointHistory
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.rules import PLAYER_ONE, PLAYER_TWO
+from tennis_calculator.core.exceptions import (
+    InvalidPlayerNumberException,
+    MatchCompletedException,
+)
+from tennis_calculator.core.scoring.table import (
+    SCORING_TABLE,
+    EVENT_COMPLETED,
+    TableScorer,
+)
+
+
+def _model_match(points):
+    """scores points through Match.record_point"""
+    match = Match("01", "Player One", "Player Two")
+    for point in points:
+        try:
+            match.record_point(point)
+        except MatchCompletedException:
+            break
+    return match
+
+
+def _random_points(seed, count):
+    rng = random.Random(seed)
+    bias = rng.uniform(0.3, 0.7)
+    return [PLAYER_ONE if rng.random() < bias else PLAYER_TWO for _ in range(count)]
+
+
+def _assert_equivalent(expected, actual):
+    assert actual.score_display() == expected.score_display()
+    assert actual.winner == expected.winner
+    assert actual.result == expected.result
+    assert actual.sets_score == expected.sets_score
+    for player in (expected.player_one, expected.player_two):
+        assert actual.games_summary(player) == expected.games_summary(player)
+    assert [s.games for s in actual.completed_sets] == [
+        s.games for s in expected.completed_sets
+    ]
+    assert [s.current_game.points for s in actual.completed_sets] == [
+        s.current_game.points for s in expected.completed_sets
+    ]
+    if expected.current_set:
+        assert actual.current_set.games == expected.current_set.games
+        assert actual.current_set.current_game.points == (
+            expected.current_set.current_game.points
+        )
+        assert actual.current_set.current_game.winner is None
+    else:
+        assert actual.current_set is None
+
+
+def test_table_is_small_and_closed():
+    """verifies every transition targets a known state"""
+    assert len(SCORING_TABLE.states) < 5000
+    assert max(SCORING_TABLE.next_state) < len(SCORING_TABLE.states)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_random_prefixes_match_models(seed):
+    """verifies random point sequences, including partial matches"""
+    points = _random_points(seed, random.Random(seed).randint(0, 250))
+    scorer = TableScorer()
+    scorer.record_points(points)
+    _assert_equivalent(
+        _model_match(points), scorer.to_match("01", "Player One", "Player Two")
+    )
+
+
+def test_long_deuce_game():
+    """verifies collapsed deuce states expand to raw point counts"""
+    points = [PLAYER_ONE, PLAYER_TWO] * 20 + [PLAYER_ONE]
+    scorer = TableScorer()
+    scorer.record_points(points)
+    match = scorer.to_match("01", "Player One", "Player Two")
+    assert match.current_set.current_game.points.player_one == 21
+    assert match.score_display() == "0-0 (Advantage Player One)"
+    _assert_equivalent(_model_match(points), match)
+
+
+def test_points_after_completion_are_ignored():
+    """verifies scorer stops once the match has a winner"""
+    scorer = TableScorer()
+    assert scorer.record_points([PLAYER_ONE] * 60) == 48
+    assert scorer.is_completed
+    assert not scorer.record_point(PLAYER_TWO)
+    assert SCORING_TABLE.events[scorer.state * 3 + PLAYER_TWO] == EVENT_COMPLETED
+    assert scorer.to_match("01", "A", "B").score_display() == "6-0, 6-0"
+
+
+@pytest.mark.parametrize("points", [[0] * 6, [1, 3, 1], [1, -1], b"\x01\x00"])
+def test_invalid_player_numbers_rejected(points):
+    """verifies points other than player one or two record nothing"""
+    scorer = TableScorer(history=PointHistory())
+    with pytest.raises(InvalidPlayerNumberException):
+        scorer.record_points(points)
+    with pytest.raises(InvalidPlayerNumberException):
+        scorer.record_point(0)
+    assert scorer.points_played == 0
+    assert len(scorer.history) == 0
@@ -0,0 +1,122 @@
+"""verifies scores rebuilt from point history checkpoints"""
+
+import random
+
+import pytest
+from tennis_calculator.core.exceptions import PointNotFoundException
+from tennis_calculator.core.models.history import CHECKPOINT_INTERVAL
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.models.tournament import Tournament
+from tennis_calculator.core.parsers.match_parser import MatchData
+from tennis_calculator.core.rules import PLAYER_ONE, PLAYER_TWO
+from tennis_calculator.core.scoring.bulk import summarize_match
+from tennis_calculator.core.scoring.cache import ScoreCache
+from tennis_calculator.core.scoring.table import TableScorer
+from tennis_calculator.core.scoring.timeline import score_at
+from tennis_calculator.core.scoring.vectorized import HAS_NUMPY, score_batch
+
+
+def _players(seed, count=260):
+    rng = random.Random(seed)
+    bias = rng.uniform(0.3, 0.7)
+    return bytes(
+        PLAYER_ONE if rng.random() < bias else PLAYER_TWO for _ in range(count)
+    )
+
+
+def _replayed(players, points):
+    match = Match("01", "A", "B")
+    for player_number in players[:points]:
+        if match.winner:
+            break
+        match.record_point(player_number)
+    return match
+
+
+def _assert_timeline(match, players):
+    for points in range(len(match.history) + 1):
+        expected = _replayed(players, points)
+        actual = score_at(match, points)
+        assert actual == expected
+        assert actual.score_display() == expected.score_display()
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4])
+def test_score_at_matches_replay(seed):
+    """verifies every point of a scored match against a full replay"""
+    players = _players(seed)
+    match = summarize_match("01", "A", "B", list(players)).to_match()
+    intervals = len(match.history) // CHECKPOINT_INTERVAL
+    assert match.history.checkpoint_count() == intervals
+    _assert_timeline(match, players)
+
+
+def test_score_at_live_match():
+    """verifies points recorded on the match object are checkpointed"""
+    players = _players(6)
+    match = _replayed(players, len(players))
+    _assert_timeline(match, players)
+
+
+def test_score_at_deuce_checkpoint():
+    """verifies a checkpoint in a long deuce game keeps the raw points"""
+    players = bytes([PLAYER_ONE, PLAYER_TWO]) * 20 + bytes([PLAYER_TWO] * 60)
+    match = summarize_match("01", "A", "B", list(players)).to_match()
+    assert match.history.checkpoint(0) == (0, 0, 0, 0, 16, 16)
+    _assert_timeline(match, players)
+
+
+def test_score_at_compacted_and_cached(tmp_path):
+    """verifies histories survive compaction and the score cache"""
+    players = _players(7)
+    tournament = Tournament()
+    tournament.add_match(summarize_match("01", "A", "B", list(players)).to_match())
+    tournament.compact()
+    _assert_timeline(tournament.get_match("01"), players)
+
+    cache = ScoreCache(str(tmp_path / "cache"))
+    raw = bytes(player_number - 1 for player_number in players)
+    cache.score(raw)
+    scorer = cache.score(raw)
+    assert cache.hits == 1
+    _assert_timeline(scorer.to_match("01", "A", "B"), players)
+
+
+@pytest.mark.skipif(
+    not HAS_NUMPY, reason="NumPy is not installed, its backend is untested"
+)
+def test_score_at_vectorized():
+    """verifies the NumPy backend records the same history"""
+    matches = [
+        MatchData(f"{seed}", "A", "B", list(_players(seed))) for seed in range(8)
+    ]
+    for data, summary in zip(matches, score_batch(matches, use_numpy=True)):
+        match = summary.to_match()
+        expected = summarize_match("01", "A", "B", data.points).to_match()
+        assert match.history == expected.history
+
+
+def test_score_at_rejects_unknown_points():
+    """verifies points beyond the history and missing histories"""
+    match = summarize_match("01", "A", "B", [PLAYER_ONE] * 10).to_match()
+    with pytest.raises(PointNotFoundException):
+        score_at(match, 11)
+    match = TableScorer().to_match("02", "A", "B")
+    with pytest.raises(PointNotFoundException):
+        score_at(match, 0)
+
+
+def test_checkpoint_interval_bounds_replay(monkeypatch):
+    """verifies at most one interval of points is replayed"""
+    match = summarize_match("01", "A", "B", list(_players(8))).to_match()
+    replayed = []
+    original = TableScorer._record_points
+
+    def counting(self, points):
+        points = list(points)
+        replayed.append(len(points))
+        return original(self, points)
+
+    monkeypatch.setattr(TableScorer, "_record_points", counting)
+    score_at(match, len(match.history) - 1)
+    assert max(replayed) < CHECKPOINT_INTERVAL
@@ -0,0 +1,118 @@
+"""verifies batch scoring backends agree with the table scorer"""
+
+import random
+import tracemalloc
+
+import pytest
+from tennis_calculator.core.parsers.match_parser import MatchData
+from tennis_calculator.core.rules import PLAYER_ONE, PLAYER_TWO
+from tennis_calculator.core.exceptions import (
+    InvalidMatchFormatException,
+    TennisCalculatorException,
+)
+from tennis_calculator.core.scoring import vectorized
+from tennis_calculator.core.scoring.vectorized import (
+    HAS_NUMPY,
+    player_games,
+    score_batch,
+)
+
+requires_numpy = pytest.mark.skipif(
+    not HAS_NUMPY, reason="NumPy is not installed, its backend is untested"
+)
+
+
+def _random_matches(count, seed=3):
+    rng = random.Random(seed)
+    matches = []
+    for number in range(count):
+        bias = rng.uniform(0.2, 0.8)
+        points = [
+            PLAYER_ONE if rng.random() < bias else PLAYER_TWO
+            for _ in range(rng.randint(0, 260))
+        ]
+        matches.append(MatchData(f"{number:03d}", "A", f"P{number % 5}", points))
+    return matches
+
+
+def _state(summary):
+    scorer = summary._scorer
+    return (
+        scorer.state,
+        scorer.game_points,
+        scorer.points_played,
+        scorer.completed_sets,
+        scorer.final_game_points,
+    )
+
+
+@requires_numpy
+def test_numpy_backend_matches_python_backend():
+    """verifies lockstep scoring of ragged matches"""
+    matches = _random_matches(300)
+    matches.append(MatchData("buffer", "A", "B", bytes([1, 2, 1, 1]) * 40))
+    expected = score_batch(matches, use_numpy=False)
+    actual = score_batch(matches, use_numpy=True)
+    assert [_state(s) for s in actual] == [_state(s) for s in expected]
+    assert [s.to_match().score_display() for s in actual] == [
+        s.to_match().score_display() for s in expected
+    ]
+
+
+@pytest.mark.parametrize(
+    "use_numpy", [False, pytest.param(True, marks=requires_numpy)]
+)
+@pytest.mark.parametrize("points", [[1, 3, 0, 0, 0, 1], [0] * 6, b"012"])
+def test_backends_reject_invalid_points(use_numpy, points):
+    """verifies both backends raise the same exception for invalid points"""
+    with pytest.raises(InvalidMatchFormatException):
+        score_batch([MatchData("01", "A", "B", points)], use_numpy=use_numpy)
+
+
+@requires_numpy
+def test_points_after_completion_cost_no_memory():
+    """verifies a very long block does not size the batch's working arrays"""
+    long_block = [PLAYER_ONE] * 48 + [PLAYER_TWO] * 1_000_000
+    matches = [MatchData("01", "A", "B", long_block)] + _random_matches(20)
+    expected = score_batch(matches[1:], use_numpy=False)
+    tracemalloc.start()
+    try:
+        actual = score_batch(matches, use_numpy=True)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert actual[0].winner == "A"
+    assert [_state(s) for s in actual[1:]] == [_state(s) for s in expected]
+    # A dense points matrix would take 21 bytes per point of the long block
+    assert peak < 8 * len(long_block)
+
+
+def test_empty_batch():
+    """verifies an empty batch scores to nothing"""
+    assert score_batch([]) == []
+
+
+def test_fallback_without_numpy(monkeypatch):
+    """verifies the pure-Python path is used when NumPy is missing"""
+    monkeypatch.setattr(vectorized, "HAS_NUMPY", False)
+    (summary,) = score_batch([MatchData("01", "A", "B", [PLAYER_ONE] * 48)])
+    assert summary.winner == "A"
+    with pytest.raises(TennisCalculatorException):
+        score_batch([], use_numpy=True)
+
+
+def test_player_games_totals():
+    """verifies per-player totals across matches"""
+    summaries = score_batch(
+        [
+            MatchData("01", "A", "B", [PLAYER_ONE] * 8),
+            MatchData("02", "B", "C", [PLAYER_TWO] * 4),
+        ]
+    )
+    assert player_games(summaries) == {"A": (2, 0), "B": (0, 3), "C": (1, 0)}
+
+
+def test_process_batch_feeds_tournament(match_processor):
+    """verifies batch results are added to the tournament"""
+    match_processor.process_batch(_random_matches(20))
+    assert len(match_processor.tournament.matches) == 20
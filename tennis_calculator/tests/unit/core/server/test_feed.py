@@ -0,0 +1,142 @@
+"""verifies the live score feed and its subscribers"""
+
+import threading
+
+import pytest
+from tennis_calculator.core.exceptions import TennisCalculatorException
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.models.tournament import Tournament
+from tennis_calculator.core.server.feed import FeedClient, ScoreFeed, Subscriber
+from tennis_calculator.core.storage import SqliteStore
+
+
+@pytest.fixture
+def feed(tmp_path):
+    """Run a score feed for a tournament in a background thread."""
+    tournament = Tournament()
+    tournament.add_match(Match("01", "Player One", "Player Two"))
+    feed = ScoreFeed(str(tmp_path / "feed"), tournament)
+    thread = threading.Thread(target=feed.serve_forever, daemon=True)
+    thread.start()
+    yield feed
+    feed.shutdown()
+    feed.server_close()
+    thread.join()
+
+
+def test_subscriber_keeps_latest_score_per_match():
+    """Test a slow subscriber skips intermediate scores of a match."""
+    subscriber = Subscriber(limit=2)
+    subscriber.offer("01", b"a")
+    subscriber.offer("02", b"b")
+    subscriber.offer("01", b"c")
+    assert subscriber.take() == [b"c", b"b"]
+    subscriber.offer("03", b"d")
+    subscriber.offer("04", b"e")
+    subscriber.offer("05", b"f")
+    assert subscriber.take() == [b"e", b"f"]
+    assert subscriber.dropped == 2
+
+
+def test_subscriber_take_after_close():
+    """Test taking from a closed, empty subscriber returns nothing."""
+    subscriber = Subscriber()
+    subscriber.close()
+    assert subscriber.take() == []
+
+
+def test_refuses_second_feed(feed, monkeypatch):
+    """Test a live feed socket is not replaced and the probe is closed."""
+    closed = []
+    close = FeedClient.close
+    monkeypatch.setattr(
+        FeedClient, "close", lambda client: (closed.append(client), close(client))
+    )
+    with pytest.raises(TennisCalculatorException, match="already running"):
+        ScoreFeed(feed.socket_path, Tournament())
+    assert len(closed) == 1
+
+
+def test_fan_out_to_match_and_player(feed):
+    """Test each subscriber receives the scores of what it follows."""
+    with FeedClient.connect(feed.socket_path) as by_match, FeedClient.connect(
+        feed.socket_path
+    ) as by_player:
+        by_match.subscribe_match("01")
+        by_match_events = by_match.events()
+        assert next(by_match_events) == ("SCORE", "01", "0-0")
+        by_player.subscribe_player("Player Three")
+        by_player.subscribe_match("01")
+        by_player_events = by_player.events()
+        assert next(by_player_events) == ("SCORE", "01", "0-0")
+
+        feed.tournament.add_match(Match("02", "Player Three", "Player Four"))
+        assert next(by_player_events) == ("SCORE", "02", "0-0")
+        feed.tournament.record_match_point("01", 1)
+        assert next(by_match_events) == ("SCORE", "01", "0-0 (15-0)")
+        assert next(by_player_events) == ("SCORE", "01", "0-0 (15-0)")
+
+
+def test_final_score(feed):
+    """Test the winning point is published as a final score."""
+    with FeedClient.connect(feed.socket_path) as client:
+        client.subscribe_match("01")
+        events = client.events()
+        next(events)
+        for _ in range(48):
+            feed.tournament.record_match_point("01", 2)
+        kinds = set()
+        while "FINAL" not in kinds:
+            kind, _, score = next(events)
+            kinds.add(kind)
+        assert score == "0-6, 0-6"
+
+
+def test_initial_score_of_compacted_and_stored_matches(tmp_path):
+    """Test matches not held as objects still get their score on subscribe."""
+    store = SqliteStore(str(tmp_path / "tournament.db"))
+    match_processor = store.load()
+    match_processor.process_matches(["Match: 01", "A vs B", "0"])
+    store.save(match_processor)
+    tournament = store.load().tournament
+    tournament.add_match(Match("02", "C", "D"))
+    for _ in range(48):
+        tournament.record_match_point("02", 1)
+    tournament.compact()
+    feed = ScoreFeed(str(tmp_path / "feed"), tournament)
+    thread = threading.Thread(target=feed.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with FeedClient.connect(feed.socket_path) as client:
+            client.subscribe_match("01")
+            client.subscribe_match("02")
+            events = client.events()
+            assert {next(events), next(events)} == {
+                ("SCORE", "01", "0-0 (15-0)"),
+                ("FINAL", "02", "6-0, 6-0"),
+            }
+    finally:
+        feed.shutdown()
+        feed.server_close()
+        thread.join()
+        store.close()
+
+
+def test_invalid_subscription(feed):
+    """Test invalid subscriptions are reported to the client."""
+    with FeedClient.connect(feed.socket_path) as client:
+        client.connection.sendall(b"Subscribe Court 1\n")
+        with pytest.raises(TennisCalculatorException, match="Match or a Player"):
+            next(client.events())
+
+
+def test_unsubscribed_on_disconnect(feed):
+    """Test a client's subscriptions are removed when it disconnects."""
+    with FeedClient.connect(feed.socket_path) as client:
+        client.subscribe_match("01")
+        next(client.events())
+    for _ in range(100):
+        if not feed._subscribers_of(feed.tournament.matches["01"]):
+            break
+        threading.Event().wait(0.01)
+    assert not feed._subscribers_of(feed.tournament.matches["01"])
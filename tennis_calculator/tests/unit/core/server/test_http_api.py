@@ -0,0 +1,223 @@
+"""verifies the asyncio HTTP query API"""
+
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.server.http_api import HttpQueryServer
+from tennis_calculator.core.storage.pickle_store import PickleStore
+
+MATCH_DATA = ["Match: 01", "Player One vs Player Two"] + ["0"] * 48
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Save a tournament holding one completed match."""
+    store = PickleStore(str(tmp_path / "state"))
+    match_processor = MatchProcessor()
+    match_processor.process_matches(MATCH_DATA)
+    store.save(match_processor)
+    return store
+
+
+def request(method, target, body=b"", headers=""):
+    """Encode a request."""
+    return (
+        f"{method} {target} HTTP/1.1\r\nHost: test\r\n{headers}"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode("latin-1") + body
+
+
+async def read_response(reader):
+    """Read one response, returning its status, headers and decoded body."""
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    lines = head.split("\r\n")
+    headers = dict(
+        line.lower().split(": ", 1) for line in lines[1:] if line
+    )
+    body = await reader.readexactly(int(headers["content-length"]))
+    return int(lines[0].split(" ")[1]), headers, json.loads(body)
+
+
+def exchange(store, *requests):
+    """Send requests over one connection, returning every response."""
+
+    async def run():
+        server = HttpQueryServer(store, port=0)
+        await server.start()
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(b"".join(requests))
+        responses = [await read_response(reader) for _ in requests]
+        writer.close()
+        await server.close()
+        return responses
+
+    return asyncio.run(run())
+
+
+def test_match_score(store):
+    """Test the score endpoint, including a score after some points."""
+    (status, _, body), (_, _, at) = exchange(
+        store,
+        request("GET", "/matches/01/score"),
+        request("GET", "/matches/01/score?at=28"),
+    )
+    assert status == 200
+    assert body == {
+        "match_id": "01",
+        "result": "Player One defeated Player Two\n2 sets to 0",
+    }
+    assert at["result"] == "6-0, 1-0"
+
+
+def test_player_games(store):
+    """Test the games endpoint decodes player names."""
+    ((status, headers, body),) = exchange(
+        store, request("GET", "/players/Player%20Two/games")
+    )
+    assert status == 200
+    assert headers["connection"] == "keep-alive"
+    assert body == {"player": "Player Two", "won": 0, "lost": 12}
+
+
+def test_player_games_use_result_cache(store):
+    """Test the games endpoint is answered through the query processor."""
+    server = HttpQueryServer(store, port=0)
+    for _ in range(2):
+        assert server.answer("GET", "/players/Player%20One/games", b"") == (
+            200,
+            {"player": "Player One", "won": 12, "lost": 0},
+        )
+    assert server.answer("GET", "/players/Nobody/games", b"")[0] == 404
+    assert server.result_cache.hits == 1
+
+
+def test_close_waits_for_open_connections(store):
+    """Test close returns once connections left open by clients are closed."""
+
+    async def run():
+        server = HttpQueryServer(store, port=0)
+        await server.start()
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(request("GET", "/matches/01/score"))
+        await read_response(reader)
+        await asyncio.wait_for(server.close(), 5)
+        assert await reader.read() == b""
+        writer.close()
+
+    asyncio.run(run())
+
+
+def test_batch_query(store):
+    """Test a batch answers each query in order and reports failures."""
+    queries = ["Score Match 01", "Score Match 99", "Games Player Player One"]
+    ((status, _, body),) = exchange(
+        store, request("POST", "/query", json.dumps(queries).encode())
+    )
+    assert status == 200
+    assert body == [
+        {"result": "Player One defeated Player Two\n2 sets to 0"},
+        {"error": "Match 99 not found"},
+        {"result": "12 0"},
+    ]
+
+
+@pytest.mark.parametrize(
+    "method, target, body, status",
+    [
+        ("GET", "/matches/99/score", b"", 404),
+        ("GET", "/players/Nobody/games", b"", 404),
+        ("GET", "/matches/01/score?at=x", b"", 400),
+        ("GET", "/matches/01/score?at=1000", b"", 404),
+        ("POST", "/matches/01/score", b"", 405),
+        ("POST", "/query", b"not json", 400),
+        ("POST", "/query", b'{"queries": []}', 400),
+        ("GET", "/unknown", b"", 404),
+    ],
+)
+def test_errors_keep_connection(store, method, target, body, status):
+    """Test failed requests report an error and the connection stays usable."""
+    (failed, _, error), (ok, _, _) = exchange(
+        store, request(method, target, body), request("GET", "/matches/01/score")
+    )
+    assert (failed, ok) == (status, 200)
+    assert "error" in error
+
+
+def test_connection_close(store):
+    """Test a client asking to close gets a closing response."""
+    ((_, headers, _),) = exchange(
+        store, request("GET", "/matches/01/score", headers="Connection: close\r\n")
+    )
+    assert headers["connection"] == "close"
+
+
+def test_reloads_changed_state(store):
+    """Test the server picks up newly processed matches once they are loaded."""
+
+    async def run():
+        server = HttpQueryServer(store, port=0)
+        await server.start()
+        match_processor = store.load()
+        match_processor.process_matches(
+            ["Match: 02", "Player One vs Player Three"] + ["1"] * 4
+        )
+        store.save(match_processor)
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        for _ in range(100):
+            writer.write(request("GET", "/players/Player%20Three/games"))
+            response = await read_response(reader)
+            if response[0] == 200:
+                break
+            await asyncio.sleep(0.01)
+        writer.close()
+        await server.close()
+        return response
+
+    _, _, body = asyncio.run(run())
+    assert body["won"] == 1
+
+
+def test_reload_does_not_block_requests(store, monkeypatch):
+    """Test requests are answered from the old state while a reload runs."""
+    release = threading.Event()
+    load = store.load
+
+    def slow_load():
+        release.wait(2)
+        return load()
+
+    async def run():
+        server = HttpQueryServer(store, port=0)
+        await server.start()
+        match_processor = store.load()
+        match_processor.process_matches(
+            ["Match: 02", "Player One vs Player Three"] + ["1"] * 4
+        )
+        store.save(match_processor)
+        monkeypatch.setattr(store, "load", slow_load)
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        statuses = []
+        for _ in range(2):
+            writer.write(request("GET", "/matches/02/score"))
+            statuses.append((await read_response(reader))[0])
+        release.set()
+        await server._reload
+        writer.write(request("GET", "/matches/02/score"))
+        statuses.append((await read_response(reader))[0])
+        writer.close()
+        await server.close()
+        return statuses
+
+    os.utime(store.path, ns=(0, 0))
+    assert asyncio.run(run()) == [404, 404, 200]
+
+
+def test_match_id_is_not_parsed_as_query(store):
+    """Test a match id holding query words is looked up as it is."""
+    ((status, _, body),) = exchange(store, request("GET", "/matches/01%20At%205/score"))
+    assert status == 404
+    assert body == {"error": "Match 01 At 5 not found"}
@@ -0,0 +1,119 @@
+"""verifies the unix socket query server and client"""
+
+import threading
+
+import pytest
+from tennis_calculator.core.exceptions import TennisCalculatorException
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.storage.pickle_store import PickleStore
+from tennis_calculator.core.server.unix_socket import (
+    QueryClient,
+    QueryServer,
+    encode_error,
+    encode_result,
+)
+
+MATCH_DATA = ["Match: 01", "Player One vs Player Two"] + ["0"] * 48
+
+
+def write_state(store, lines):
+    """Save a match processor holding the given match data."""
+    match_processor = MatchProcessor()
+    match_processor.process_matches(lines)
+    store.save(match_processor)
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Run a query server in a background thread."""
+    store = PickleStore(str(tmp_path / "state"))
+    write_state(store, MATCH_DATA)
+    server = QueryServer(str(tmp_path / "sock"), store)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_encode_replies():
+    """Test reply framing."""
+    assert encode_result("a\nb") == b"OK 2\na\nb\n"
+    assert encode_error("bad\nquery") == b"ERR bad query\n"
+
+
+def test_queries_share_connection(server):
+    """Test several queries over one connection."""
+    with QueryClient.connect(server.socket_path) as client:
+        assert client.query("Score Match 01") == (
+            "Player One defeated Player Two\n2 sets to 0"
+        )
+        assert client.query("Games Player Player One") == "12 0"
+        assert client.query("Games Player Player Two") == "0 12"
+
+
+def test_errors_are_reported(server):
+    """Test query errors reach the client and keep the connection open."""
+    with QueryClient.connect(server.socket_path) as client:
+        with pytest.raises(TennisCalculatorException, match="Match 99 not found"):
+            client.query("Score Match 99")
+        with pytest.raises(TennisCalculatorException, match="Invalid query format"):
+            client.query("Score")
+        assert client.query("Games Player Player One") == "12 0"
+
+
+def test_reloads_changed_state(server):
+    """Test the server picks up newly processed matches."""
+    write_state(
+        server.store,
+        ["Match: 02", "Player One vs Player Three"] + ["1"] * 4,
+    )
+    with QueryClient.connect(server.socket_path) as client:
+        assert client.query("Games Player Player Three") == "1 0"
+
+
+def test_result_cache_survives_reloads(server):
+    """Test reloads keep the result cache but never serve answers they changed."""
+    with QueryClient.connect(server.socket_path) as client:
+        assert client.query("Games Player Player One") == "12 0"
+        write_state(
+            server.store, ["Match: 01", "Player Two vs Player One"] + ["0"] * 4
+        )
+        assert client.query("Games Player Player One") == "0 1"
+        assert client.query("Games Player Player One") == "0 1"
+    cache = server.result_cache
+    assert server.query_processor.result_cache is cache
+    assert (cache.hits, cache.misses, cache.invalidations) == (1, 2, 1)
+
+
+def test_connect_without_server(tmp_path):
+    """Test connecting returns None when nothing is listening."""
+    assert QueryClient.connect(str(tmp_path / "missing")) is None
+
+
+def test_refuses_second_server(server):
+    """Test a live socket is not replaced."""
+    with pytest.raises(TennisCalculatorException, match="already running"):
+        QueryServer(server.socket_path, server.store)
+
+
+def test_refusal_closes_probe(server, monkeypatch):
+    """Test the connection probing a live socket is closed."""
+    closed = []
+    close = QueryClient.close
+    monkeypatch.setattr(
+        QueryClient, "close", lambda client: (closed.append(client), close(client))
+    )
+    with pytest.raises(TennisCalculatorException, match="already running"):
+        QueryServer(server.socket_path, server.store)
+    assert len(closed) == 1
+
+
+def test_replaces_stale_socket(tmp_path):
+    """Test a socket file left by a dead server is removed."""
+    socket_path = str(tmp_path / "sock")
+    store = PickleStore(str(tmp_path / "state"))
+    QueryServer(socket_path, store).socket.close()
+    server = QueryServer(socket_path, store)
+    server.server_close()
@@ -0,0 +1,125 @@
+"""verifies the offset-indexed snapshot store"""
+
+import pytest
+from tennis_calculator.core.exceptions import (
+    DuplicateMatchException,
+    MatchNotFoundException,
+    PlayerNotFoundException,
+    TennisCalculatorException,
+)
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.storage import IndexedStore
+from tennis_calculator.core.storage import indexed_store
+from tennis_calculator.core.storage.indexed_store import SnapshotReader
+
+
+def straight_sets(match_id, player_one, player_two):
+    """Match lines for a 6-0 6-0 win by player one."""
+    return [f"Match: {match_id}", f"{player_one} vs {player_two}"] + ["0"] * 48
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create an indexed store holding two saved matches."""
+    store = IndexedStore(str(tmp_path / "tournament.snapshot"))
+    match_processor = store.load()
+    match_processor.process_matches(
+        straight_sets("01", "Player One", "Player Two")
+        + straight_sets("02", "Player Three", "Player One")
+    )
+    store.save(match_processor)
+    yield store
+    store.close()
+
+
+def test_reads_single_records(store):
+    """Test queries read from the index without loading every match."""
+    tournament = store.load().tournament
+    assert tournament.get_player_games("Player One") == (12, 12)
+    assert tournament.matches == {}
+    assert tournament.get_match("02").winner == "Player Three"
+    assert list(tournament.matches) == ["02"]
+    with pytest.raises(MatchNotFoundException):
+        tournament.get_match("03")
+    with pytest.raises(PlayerNotFoundException):
+        tournament.get_player_games("Player Four")
+
+
+def test_player_index(store):
+    """Test the player to match index."""
+    reader = SnapshotReader.open(store.path)
+    assert reader.match_count == 2
+    assert reader.player_count == 3
+    assert reader.player_match_ids("Player One") == ["01", "02"]
+    assert reader.player_totals("Player Two") == (1, 0, 12)
+    reader.close()
+
+
+def test_overwrite_and_new_matches(store):
+    """Test a save keeps unchanged records and replaces the rest."""
+    match_processor = store.load()
+    match_processor.process_matches(
+        straight_sets("01", "Player Four", "Player Two")
+        + straight_sets("03", "Player One", "Player Four")
+    )
+    store.save(match_processor)
+    tournament = store.load().tournament
+    assert tournament.get_player_games("Player One") == (12, 12)
+    assert tournament.get_player_games("Player Four") == (12, 12)
+    assert tournament.get_player_games("Player Two") == (0, 12)
+    assert [m.match_id for m in tournament.get_player_matches("Player One")] == [
+        "02",
+        "03",
+    ]
+    with pytest.raises(DuplicateMatchException):
+        tournament.add_match(Match("02", "Player One", "Player Two"))
+
+
+def test_reloading_unmaps_older_snapshots(store):
+    """Test loads and saves keep only the latest two loads' snapshots mapped."""
+    match_processor = store.load()
+    first = match_processor.tournament.reader
+    match_processor.process_matches(straight_sets("03", "Player One", "Player Four"))
+    store.save(match_processor)
+    second = store.load().tournament.reader
+    # The previous load may still be answering queries
+    assert not first.data.closed
+    third = store.load().tournament.reader
+    assert first.data.closed
+    assert not second.data.closed and not third.data.closed
+    store.close()
+    assert second.data.closed and third.data.closed
+
+
+def test_unsaved_changes_visible(store):
+    """Test in-memory changes override the snapshot before saving."""
+    tournament = store.load().tournament
+    match = tournament.get_match("01")
+    match.reset()
+    assert tournament.get_player_games("Player One") == (0, 12)
+    assert tournament.get_player_games("Player Two") == (0, 0)
+
+
+def test_hash_collisions(store, monkeypatch):
+    """Test entries sharing a key hash are told apart by their id."""
+    monkeypatch.setattr(indexed_store, "key_hash", lambda key: 7)
+    match_processor = store.load()
+    match_processor.process_matches(
+        straight_sets("03", "Player Five", "Player Six")
+        + straight_sets("04", "Player Six", "Player Seven")
+    )
+    store.save(match_processor)
+    tournament = store.load().tournament
+    assert tournament.get_match("03").player_one == "Player Five"
+    assert tournament.get_match("04").player_one == "Player Six"
+    assert tournament.get_player_games("Player Six") == (12, 12)
+    with pytest.raises(MatchNotFoundException):
+        tournament.get_match("05")
+
+
+def test_not_a_snapshot(tmp_path):
+    """Test other files are rejected."""
+    path = tmp_path / "other"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(TennisCalculatorException, match="Not a tournament snapshot"):
+        SnapshotReader.open(str(path))
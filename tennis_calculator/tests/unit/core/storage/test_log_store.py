@@ -0,0 +1,192 @@
+"""verifies the snapshot and append-only log store"""
+
+import os
+
+import pytest
+from tennis_calculator.core.scoring.cache import ScoreCache
+from tennis_calculator.core.storage import log_store
+from tennis_calculator.core.storage.log_store import (
+    FILE_HEADER,
+    LogStore,
+    encode_record,
+    read_records,
+)
+
+
+def straight_sets(match_id, player_one, player_two):
+    """Match lines for a 6-0 6-0 win by player one."""
+    return [f"Match: {match_id}", f"{player_one} vs {player_two}"] + ["0"] * 48
+
+
+def log_records(store):
+    """Read the records currently in the log."""
+    with open(store.log_path, "rb") as f:
+        f.seek(FILE_HEADER.size)
+        return read_records(f)[0]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a log store holding one saved match."""
+    store = LogStore(str(tmp_path / "log_store"))
+    match_processor = store.load()
+    match_processor.process_matches(straight_sets("01", "Player One", "Player Two"))
+    store.save(match_processor)
+    return store
+
+
+def test_round_trip(store):
+    """Test saved matches are replayed on load."""
+    tournament = store.load().tournament
+    assert tournament.get_match("01").winner == "Player One"
+    assert tournament.get_player_games("Player Two") == (0, 12)
+    assert tournament.pop_dirty_matches() == []
+
+
+def test_save_appends_only_changes(store):
+    """Test a save writes only records for what changed."""
+    size = os.path.getsize(store.log_path)
+    match_processor = store.load()
+    store.save(match_processor)
+    assert os.path.getsize(store.log_path) == size
+
+    match_processor.process_matches(["Match: 02", "Player One vs Player Three"])
+    match_processor.tournament.record_match_point("02", 2)
+    store.save(match_processor)
+    records = log_records(store)
+    assert [record[0] for record in records] == ["match", "match"]
+
+    match_processor.tournament.record_match_point("02", 2)
+    store.save(match_processor)
+    assert log_records(store)[-1] == ("point", "02", 2)
+    assert store.load().tournament.get_match("02").score_display() == "0-0 (0-30)"
+
+
+def test_undo_is_logged(store):
+    """Test taken back points are logged as an undo event and replayed."""
+    match_processor = store.load()
+    match_processor.process_matches(["Match: 02", "Player One vs Player Three"])
+    store.save(match_processor)
+    for player_number in (1, 1, 2):
+        match_processor.tournament.record_match_point("02", player_number)
+    store.save(match_processor)
+    match_processor.tournament.undo_last_point("02", 2)
+    store.save(match_processor)
+    assert log_records(store)[-1] == ("undo", "02", 2)
+    assert store.load().get_match("02").score_display() == "0-0 (15-0)"
+
+
+def test_direct_changes_are_upserted(store):
+    """Test points recorded on the match object are logged."""
+    match_processor = store.load()
+    match_processor.process_matches(["Match: 02", "Player One vs Player Three"])
+    store.save(match_processor)
+    match_processor.get_match("02").record_point(1)
+    store.save(match_processor)
+    assert log_records(store)[-1][0] == "match"
+    assert store.load().get_match("02").score_display() == "0-0 (15-0)"
+
+
+def test_records_that_no_longer_apply_are_reported(store, caplog):
+    """Test a logged point for a completed match is skipped with a warning."""
+    with open(store.log_path, "ab") as f:
+        f.write(encode_record(("point", "01", 1)))
+    tournament = store.load().tournament
+    assert tournament.get_match("01").winner == "Player One"
+    assert tournament.skipped_records == 1
+    assert "Skipped point record for match 01" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "tail",
+    [
+        pytest.param(lambda record: record[:-3], id="torn"),
+        pytest.param(lambda record: record[:-1] + b"\x00", id="corrupt"),
+    ],
+)
+def test_recovers_damaged_tail(store, tail):
+    """Test a damaged final record is ignored and then truncated."""
+    size = os.path.getsize(store.log_path)
+    with open(store.log_path, "ab") as f:
+        f.write(tail(encode_record(("point", "01", 1))))
+    assert store.load().get_match("01").winner == "Player One"
+
+    match_processor = store.load()
+    match_processor.process_matches(straight_sets("02", "Player One", "Player Three"))
+    store.save(match_processor)
+    assert store.recovered_bytes > 0
+    assert os.path.getsize(store.log_path) > size
+    assert store.load().tournament.get_player_games("Player One") == (24, 0)
+
+
+def test_save_checks_only_new_records(store, monkeypatch):
+    """Test a save skips the records an earlier save found intact."""
+    match_processor = store.load()
+    match_processor.process_matches(["Match: 02", "Player One vs Player Three"])
+    store.save(match_processor)
+    size = os.path.getsize(store.log_path)
+    scanned_from = []
+    iter_payloads = log_store.iter_payloads
+
+    def recording_iter_payloads(f):
+        scanned_from.append(f.tell())
+        return iter_payloads(f)
+
+    monkeypatch.setattr(log_store, "iter_payloads", recording_iter_payloads)
+    match_processor.tournament.record_match_point("02", 1)
+    store.save(match_processor)
+    assert scanned_from == [size]
+    # Another store's appends are checked from where this one left off
+    other = LogStore(store.path)
+    other_processor = other.load()
+    other_processor.tournament.record_match_point("02", 1)
+    other.save(other_processor)
+    scanned_from.clear()
+    store.save(match_processor)
+    assert scanned_from[-1] > size
+    assert store.load().get_match("02").score_display() == "0-0 (30-0)"
+
+
+def test_compaction(store, monkeypatch):
+    """Test the log is folded into a snapshot once it grows."""
+    monkeypatch.setattr(log_store, "MIN_COMPACT_LOG_BYTES", 0)
+    match_processor = store.load()
+    match_processor.process_matches(["Match: 02", "Player One vs Player Three"])
+    store.save(match_processor)
+    assert os.path.exists(store.snapshot_path)
+    assert log_records(store) == []
+
+    match_processor.tournament.record_match_point("02", 1)
+    store.save(match_processor)
+    tournament = store.load().tournament
+    assert tournament.get_match("01").winner == "Player One"
+    assert tournament.get_match("02").score_display() == "0-0 (15-0)"
+
+
+def test_crash_before_log_restart(store):
+    """Test an old log left beside a newer snapshot is not replayed."""
+    match_processor = store.load()
+    match_processor.process_matches(["Match: 02", "Player One vs Player Three"])
+    store.save(match_processor)
+    match_processor.tournament.record_match_point("02", 1)
+    store.save(match_processor)
+    with open(store.log_path, "rb") as f:
+        old_log = f.read()
+    store.compact()
+    # Simulate a crash after the snapshot was written but before the new log
+    with open(store.log_path, "wb") as f:
+        f.write(old_log)
+    assert store.load().get_match("02").score_display() == "0-0 (15-0)"
+
+
+def test_cached_ingest_logged(store, tmp_path):
+    """Test completed matches added from the score cache are logged."""
+    path = tmp_path / "input.txt"
+    path.write_text("\n".join(straight_sets("02", "Player Three", "Player One")))
+    match_processor = store.load()
+    match_processor.score_cache = ScoreCache(str(tmp_path / "cache"))
+    match_processor.process_file(str(path))
+    store.save(match_processor)
+    tournament = store.load().tournament
+    assert tournament.get_match("02").winner == "Player Three"
+    assert tournament.get_player_games("Player One") == (12, 12)
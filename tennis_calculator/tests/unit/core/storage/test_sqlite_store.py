@@ -0,0 +1,216 @@
+"""verifies the sqlite tournament store"""
+
+import sqlite3
+import threading
+
+import pytest
+from tennis_calculator.core.exceptions import (
+    DuplicateMatchException,
+    MatchNotFoundException,
+    PlayerNotFoundException,
+)
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.processors.query_processor import QueryProcessor
+from tennis_calculator.core.scoring.cache import ScoreCache
+from tennis_calculator.core.storage import PickleStore, SqliteStore, migrate
+from tennis_calculator.core.storage.lazy import LazyTournament
+from tennis_calculator.core.storage.sqlite_store import SqliteTournament
+
+
+def straight_sets(match_id, player_one, player_two):
+    """Match lines for a 6-0 6-0 win by player one."""
+    return [f"Match: {match_id}", f"{player_one} vs {player_two}"] + ["0"] * 48
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a sqlite store holding two saved matches."""
+    store = SqliteStore(str(tmp_path / "tournament.db"))
+    match_processor = store.load()
+    match_processor.process_matches(
+        straight_sets("01", "Player One", "Player Two")
+        + straight_sets("02", "Player Three", "Player One")
+    )
+    store.save(match_processor)
+    yield store
+    store.close()
+
+
+def test_load_is_lazy(store):
+    """Test loading reads no matches until they are queried."""
+    tournament = store.load().tournament
+    assert isinstance(tournament, SqliteTournament)
+    assert tournament.matches == {}
+    assert tournament.get_player_games("Player One") == (12, 12)
+    assert tournament.matches == {}
+    match = tournament.get_match("01")
+    assert match.winner == "Player One"
+    assert tournament.get_match("01") is match
+    with pytest.raises(MatchNotFoundException):
+        tournament.get_match("03")
+
+
+def test_loads_wait_for_player_lookups(store):
+    """Test a match loaded during a player lookup is not counted twice."""
+    tournament = store.load().tournament
+    stored_games = tournament._stored_games
+    looking_up, loaded = threading.Event(), threading.Event()
+
+    def slow_stored_games(match_ids):
+        looking_up.set()
+        loaded.wait(0.2)
+        return stored_games(match_ids)
+
+    tournament._stored_games = slow_stored_games
+    loader = threading.Thread(
+        target=lambda: (looking_up.wait(), tournament.get_match("01"), loaded.set())
+    )
+    loader.start()
+    assert tournament.get_player_games("Player One") == (12, 12)
+    loader.join()
+    assert tournament.get_player_games("Player One") == (12, 12)
+
+
+def test_lazy_tournament_requires_stored_reads():
+    """Test a lazy tournament missing a _stored_* method cannot be created."""
+
+    class PartialTournament(LazyTournament):
+        def _stored_match(self, match_id):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialTournament()
+
+
+def test_tables(store):
+    """Test set scores and player totals are stored as rows."""
+    connection = sqlite3.connect(store.path)
+    assert connection.execute(
+        "SELECT set_number, games_one, games_two, completed FROM set_scores "
+        "WHERE match_id = '02' ORDER BY set_number"
+    ).fetchall() == [(1, 6, 0, 1), (2, 6, 0, 1)]
+    assert connection.execute(
+        "SELECT player, matches, games_won, games_lost FROM players ORDER BY player"
+    ).fetchall() == [
+        ("Player One", 2, 12, 12),
+        ("Player Three", 1, 12, 0),
+        ("Player Two", 1, 0, 12),
+    ]
+    connection.close()
+
+
+def test_overwrite_updates_totals(store):
+    """Test replacing a match moves its games to the new players."""
+    match_processor = store.load()
+    match_processor.process_matches(straight_sets("01", "Player Four", "Player Two"))
+    tournament = match_processor.tournament
+    # Unsaved changes are visible straight away
+    assert tournament.get_player_games("Player One") == (0, 12)
+    assert tournament.get_player_games("Player Four") == (12, 0)
+    store.save(match_processor)
+
+    tournament = store.load().tournament
+    assert tournament.get_player_games("Player One") == (0, 12)
+    assert tournament.get_player_games("Player Two") == (0, 12)
+    assert tournament.get_player_games("Player Four") == (12, 0)
+    assert [m.match_id for m in tournament.get_player_matches("Player One")] == [
+        "02"
+    ]
+
+
+def test_overwrite_of_unloaded_match_invalidates_answers(tmp_path):
+    """Test replacing a match that was never read drops cached answers."""
+    store = SqliteStore(str(tmp_path / "tournament.db"))
+    match_processor = store.load()
+    match_processor.process_matches(["Match: 01", "A vs B"] + ["0"] * 12)
+    store.save(match_processor)
+
+    match_processor = store.load()
+    query_processor = QueryProcessor(match_processor)
+    for _ in range(2):
+        assert query_processor.handle_query("Games Player A") == "3 0"
+    match_processor.process_matches(["Match: 01", "A vs B"])
+    assert query_processor.handle_query("Games Player A") == "0 0"
+    store.close()
+
+
+def test_removed_player_not_found(store):
+    """Test a player with no remaining matches is dropped."""
+    match_processor = store.load()
+    match_processor.process_matches(straight_sets("01", "Player One", "Player Four"))
+    with pytest.raises(PlayerNotFoundException):
+        match_processor.tournament.get_player_games("Player Two")
+    store.save(match_processor)
+    with pytest.raises(PlayerNotFoundException):
+        store.load().tournament.get_player_games("Player Two")
+
+
+def test_recorded_points_are_saved(store):
+    """Test points recorded on a loaded match are upserted."""
+    match_processor = store.load()
+    match_processor.process_matches(["Match: 03", "Player One vs Player Two", "1"])
+    for _ in range(3):
+        match_processor.tournament.record_match_point("03", 2)
+    store.save(match_processor)
+    tournament = store.load().tournament
+    assert tournament.get_match("03").score_display() == "0-1"
+    assert tournament.get_player_games("Player Two") == (1, 12)
+
+
+def test_duplicate_checks_stored_matches(store):
+    """Test duplicates are detected against stored matches."""
+    tournament = store.load().tournament
+    with pytest.raises(DuplicateMatchException):
+        tournament.add_match(Match("01", "Player One", "Player Two"))
+
+
+def test_save_without_changes_keeps_file(store):
+    """Test saving an untouched tournament writes nothing."""
+    version = store.version()
+    match_processor = store.load()
+    match_processor.tournament.get_match("01")
+    store.save(match_processor)
+    assert store.version() == version
+
+
+def test_migrate_from_pickle(tmp_path):
+    """Test matches are copied from a pickle file."""
+    legacy = PickleStore(str(tmp_path / "tournament_data"))
+    match_processor = MatchProcessor()
+    match_processor.process_matches(straight_sets("01", "Player One", "Player Two"))
+    legacy.save(match_processor)
+    with SqliteStore(str(tmp_path / "tournament.db")) as store:
+        assert migrate(legacy, store) == 1
+        tournament = store.load().tournament
+        assert tournament.get_match("01").winner == "Player One"
+        assert tournament.get_player_games("Player Two") == (0, 12)
+
+
+def test_undo_after_reload(store, tmp_path):
+    """Test points are taken back from matches loaded from either store."""
+    legacy = PickleStore(str(tmp_path / "tournament_data"))
+    match_processor = MatchProcessor()
+    match_processor.process_matches(straight_sets("01", "Player One", "Player Two"))
+    legacy.save(match_processor)
+    for loaded in (legacy.load(), store.load()):
+        tournament = loaded.tournament
+        tournament.undo_last_point("01", 4)
+        assert tournament.get_match_score("01") == "6-0, 5-0"
+        assert tournament.get_player_games("Player Two") == (0, 11)
+
+
+def test_cached_ingest_saved(store, tmp_path):
+    """Test completed matches added from the score cache are saved as rows."""
+    path = tmp_path / "input.txt"
+    path.write_text("\n".join(straight_sets("02", "Player Three", "Player Four")))
+    match_processor = store.load()
+    match_processor.score_cache = ScoreCache(str(tmp_path / "cache"))
+    with pytest.raises(DuplicateMatchException):
+        match_processor.process_file(str(path), overwrite=False)
+    match_processor.process_file(str(path))
+    store.save(match_processor)
+    tournament = store.load().tournament
+    assert tournament.get_match("02").winner == "Player Three"
+    assert tournament.get_player_games("Player Four") == (0, 12)
+    assert tournament.get_player_games("Player One") == (12, 0)
@@ -0,0 +1,128 @@
+"""verifies the reader-writer lock and queries running during ingest"""
+
+import sys
+import threading
+import time
+
+import pytest
+from tennis_calculator.core.concurrency import ReadWriteLock
+from tennis_calculator.core.models.match import Match
+from tennis_calculator.core.processors.match_processor import MatchProcessor
+from tennis_calculator.core.processors.query_processor import QueryProcessor
+
+
+def _started(target, *args):
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def _hold(side, name, events, release):
+    """holds one side of a lock until release is set"""
+    with side:
+        events.append(name)
+        release.wait(5)
+
+
+def test_readers_share_and_writers_exclude():
+    """verifies readers hold the lock together and a writer waits for them"""
+    lock = ReadWriteLock()
+    events, release_readers, release_writer = [], threading.Event(), threading.Event()
+    readers = [
+        _started(_hold, lock.reading, "read", events, release_readers)
+        for _ in range(2)
+    ]
+    time.sleep(0.05)
+    writer = _started(_hold, lock.writing, "write", events, release_writer)
+    time.sleep(0.05)
+    assert events == ["read", "read"]
+    release_readers.set()
+    for reader in readers:
+        reader.join(1)
+    release_writer.set()
+    writer.join(1)
+    assert events == ["read", "read", "write"]
+
+
+def test_waiting_writer_blocks_new_readers():
+    """verifies queries arriving after a waiting writer do not starve it"""
+    lock = ReadWriteLock()
+    events, release = [], threading.Event()
+    first = _started(_hold, lock.reading, "first read", events, release)
+    time.sleep(0.05)
+    writer = _started(_hold, lock.writing, "write", events, release)
+    time.sleep(0.05)
+    reader = _started(_hold, lock.reading, "read", events, release)
+    time.sleep(0.05)
+    assert events == ["first read"]
+    release.set()
+    for thread in (first, writer, reader):
+        thread.join(1)
+    assert events == ["first read", "write", "read"]
+
+
+def test_reentrant_sides():
+    """verifies nested holds, and that a reader cannot take the write side"""
+    lock = ReadWriteLock()
+    with lock.writing:
+        with lock.writing:
+            with lock.reading:
+                pass
+    with lock.reading:
+        with lock.reading:
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
+    with lock.writing:
+        pass
+
+
+def test_queries_never_see_half_recorded_points():
+    """verifies queries during heavy ingest see consistent matches and totals"""
+    match_processor = MatchProcessor()
+    tournament = match_processor.tournament
+    query_processor = QueryProcessor(match_processor)
+    stop = threading.Event()
+    errors = []
+
+    def ingest():
+        number = 0
+        while not stop.is_set():
+            match = Match(f"{number % 4:02d}", f"A{number % 4}", f"B{number % 4}")
+            tournament.add_match(match, overwrite=True)
+            point = 0
+            while not match.winner:
+                tournament.record_match_point(match.match_id, 1 + (point % 3 == 0))
+                point += 1
+            number += 1
+
+    def query():
+        queries = 0
+        while not stop.is_set():
+            match_id = f"{queries % 4:02d}"
+            try:
+                with tournament.lock.reading:
+                    match = tournament.get_match(match_id)
+                    sets = match.sets_score.player_one + match.sets_score.player_two
+                    assert sets == len(match.completed_sets)
+                    won, lost = tournament.get_player_games(match.player_one)
+                    assert (lost, won) == tournament.get_player_games(match.player_two)
+                    assert (won, lost) == match.games_score()
+                query_processor.handle_query(f"Score Match {match_id}")
+            except Exception as error:
+                errors.append(error)
+                return
+            queries += 1
+
+    for number in range(4):
+        tournament.add_match(Match(f"{number:02d}", f"A{number}", f"B{number}"))
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        threads = [_started(ingest)] + [_started(query) for _ in range(3)]
+        time.sleep(0.5)
+        stop.set()
+        for thread in threads:
+            thread.join(5)
+    finally:
+        sys.setswitchinterval(interval)
+    assert not errors